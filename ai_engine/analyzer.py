@@ -1,11 +1,48 @@
 import logging
-import json
-from datetime import datetime
+import functools
+import heapq
+import orjson
 import re
 import os
+from collections import Counter, deque
+
+from utils.timestamps import now_iso
+
+try:
+    import re2
+except ImportError:  # google-re2 is optional; fall back to the stdlib engine
+    re2 = None
 
 logger = logging.getLogger("honeypot.ai")
 
+THREAT_LEVEL_LABELS = ("Low", "Medium", "High", "Critical")
+
+# Web inputs (path, query and user agent together) up to this many characters
+# are memoized; longer ones are classified directly, so attacker-sized inputs
+# are never kept in the cache
+MAX_CACHED_WEB_INPUT = 2048
+
+def _lowercase_pattern(pattern):
+    """Lowercase the literal characters of a regex, leaving escape sequences intact."""
+    return re.sub(r'\\.|[^\\]+',
+                  lambda m: m.group() if m.group().startswith('\\') else m.group().lower(),
+                  pattern)
+
+def _compile_pattern(pattern):
+    """
+    Compile a case-sensitive pattern, preferring RE2's linear-time engine.
+    
+    Analyzer patterns run against attacker-controlled input, so RE2 is used when
+    installed to rule out catastrophic backtracking. Patterns RE2 cannot handle
+    fall back to the stdlib re module.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            logger.warning(f"Pattern not supported by RE2, using re: {pattern}")
+    return re.compile(pattern)
+
 class AIAnalyzer:
     """
     AI-powered analyzer for honeypot activity.
@@ -18,6 +55,8 @@ class AIAnalyzer:
         self.vectorizers = {}
         self.threat_db = {}
         self.attackers_db = {}
+        # Number of distinct attackers seen using each attack type
+        self._attack_type_counter = Counter()
         self.initialize_models()
         
     def initialize_models(self):
@@ -36,6 +75,36 @@ class AIAnalyzer:
             }
         }
         
+        # Fuse each regex category into one compiled alternation so a single scan
+        # replaces a loop of searches; group p<i> maps back to self.patterns[...][i].
+        # Compiled patterns are lowercased and matched against lowercased input,
+        # so the engine does not case-fold every character.
+        self.fused = {'ssh': {}, 'web': {}}
+        for honeypot_type, category in [('ssh', 'command_injection'), ('web', 'sql_injection'),
+                                        ('web', 'xss'), ('web', 'path_traversal')]:
+            self.fused[honeypot_type][category] = _compile_pattern(
+                '|'.join(f'(?P<p{i}>{_lowercase_pattern(pattern)})'
+                         for i, pattern in enumerate(self.patterns[honeypot_type][category]))
+            )
+        
+        # Single scan over every web category; requests matching none of them
+        # skip the per-category scans entirely
+        self._web_prefilter = _compile_pattern('|'.join(
+            f'(?:{_lowercase_pattern(pattern)})'
+            for category in ('path_traversal', 'sql_injection', 'xss')
+            for pattern in self.patterns['web'][category]
+        ))
+        
+        # Hashed lookups for the SSH checks that are plain string comparisons
+        self._common_pwds_set = frozenset(p.lower() for p in self.patterns['ssh']['common_passwords'])
+        self._common_clients = ("OpenSSH", "PuTTY", "libssh")
+        
+        self._scanner_re = _compile_pattern(r'(sqlmap|nikto|nmap|dirbuster|gobuster|wpscan|hydra)')
+        
+        # Memoize web classification for repeated (input, user agent) probes,
+        # up to MAX_CACHED_WEB_INPUT characters
+        self._classify_web = functools.lru_cache(maxsize=4096)(self._classify_web_input)
+        
         # Initialize threat rules
         self.threat_rules = {
             'critical': [
@@ -55,7 +124,21 @@ class AIAnalyzer:
             ]
         }
         
-        logger.info("Rule-based analysis patterns initialized")
+        # Baseline threat level per attack type; anything else is Low (0)
+        high_threat_attacks = [
+            "SQL Injection attempt", "Command injection attempt",
+            "Known vulnerability probe", "PHPMyAdmin attack"
+        ]
+        
+        medium_threat_attacks = [
+            "Brute force attempt", "Credential stuffing attempt",
+            "Web vulnerability scan", "WordPress vulnerability scan"
+        ]
+        
+        self._baseline_threat_levels = {attack: 1 for attack in medium_threat_attacks}  # Medium
+        self._baseline_threat_levels.update({attack: 2 for attack in high_threat_attacks})  # High
+        
+        logger.info(f"Rule-based analysis patterns initialized (regex engine: {'re2' if re2 else 're'})")
     
     def analyze_event(self, event):
         """
@@ -67,23 +150,50 @@ class AIAnalyzer:
         Returns:
             dict: Analysis results including threat level, attack classification, and recommendations
         """
+        analysis = self._analyze(event, now_iso())
+        logger.info(f"AI analysis completed for event from {analysis['source_ip']}: Threat level {analysis['threat_level_label']}")
+        return analysis
+    
+    def analyze_batch(self, events):
+        """
+        Analyze several honeypot events in one call.
+        
+        Events are analyzed in order, so attacker profiles and repeat-attack
+        escalation come out the same as with one analyze_event call per event;
+        the batch shares one timestamp and one log line.
+        
+        Args:
+            events (list): Honeypot event data
+            
+        Returns:
+            list: Analysis results, one per event, in the same order
+        """
+        timestamp = now_iso()
+        analyses = [self._analyze(event, timestamp) for event in events]
+        logger.info(f"AI analysis completed for a batch of {len(analyses)} events")
+        return analyses
+    
+    def _analyze(self, event, timestamp):
+        """Analyze one event, stamping the analysis with the given timestamp."""
         honeypot_id = event.get('honeypot_id', '')
-        honeypot_type = honeypot_id.split('-')[0] if '-' in honeypot_id else ''
+        prefix, sep, _ = honeypot_id.partition('-')
+        honeypot_type = prefix if sep else ''
+        honeypot_kind = honeypot_type.lower()
         data = event.get('data', {})
         source_ip = data.get('source_ip', '')
         attack_type = data.get('attack_type', 'Unknown')
         details = data.get('details', {})
         
         # Track attacker
-        self._update_attacker_profile(source_ip, honeypot_type, attack_type, details)
+        profile = self._update_attacker_profile(source_ip, honeypot_type, attack_type, details)
         
         # Determine baseline threat level based on attack type
         threat_level = self._get_baseline_threat_level(attack_type)
         
         # Apply AI analysis based on honeypot type
-        if honeypot_type.lower() == 'ssh':
+        if honeypot_kind == 'ssh':
             threat_level, attack_details = self._analyze_ssh_attack(details, threat_level)
-        elif honeypot_type.lower() == 'web':
+        elif honeypot_kind == 'web':
             threat_level, attack_details = self._analyze_web_attack(details, threat_level)
         else:
             attack_details = self._generic_attack_analysis(details, attack_type)
@@ -96,7 +206,7 @@ class AIAnalyzer:
         
         # Prepare full analysis
         analysis = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "source_ip": source_ip,
             "honeypot_id": honeypot_id,
             "attack_type": attack_type,
@@ -104,58 +214,41 @@ class AIAnalyzer:
             "threat_level_label": self._get_threat_level_label(threat_level),
             "attack_details": attack_details,
             "is_known_attacker": source_ip in self.attackers_db,
-            "attack_count": self.attackers_db.get(source_ip, {}).get("attack_count", 1),
+            "attack_count": profile["attack_count"],
             "recommendations": recommendations
         }
         
-        logger.info(f"AI analysis completed for event from {source_ip}: Threat level {analysis['threat_level_label']}")
-        
         return analysis
     
     def _update_attacker_profile(self, ip, honeypot_type, attack_type, details):
-        """Update the profile for an attacker IP."""
-        if ip not in self.attackers_db:
-            self.attackers_db[ip] = {
-                "first_seen": datetime.now().isoformat(),
+        """Update the profile for an attacker IP and return it."""
+        profile = self.attackers_db.get(ip)
+        if profile is None:
+            profile = self.attackers_db[ip] = {
+                "first_seen": now_iso(),
                 "attack_count": 1,
-                "honeypot_types": [honeypot_type],
-                "attack_types": [attack_type],
-                "attack_details": [details]
+                "honeypot_types": {honeypot_type},
+                "attack_types": {attack_type},
+                # Keep only the last 10 attack details to avoid memory issues
+                "attack_details": deque([details], maxlen=10)
             }
+            self._attack_type_counter[attack_type] += 1
         else:
-            profile = self.attackers_db[ip]
             profile["attack_count"] += 1
-            profile["last_seen"] = datetime.now().isoformat()
+            profile["last_seen"] = now_iso()
+            profile["honeypot_types"].add(honeypot_type)
             
-            if honeypot_type not in profile["honeypot_types"]:
-                profile["honeypot_types"].append(honeypot_type)
-                
             if attack_type not in profile["attack_types"]:
-                profile["attack_types"].append(attack_type)
+                profile["attack_types"].add(attack_type)
+                self._attack_type_counter[attack_type] += 1
             
-            # Keep only the last 10 attack details to avoid memory issues
             profile["attack_details"].append(details)
-            if len(profile["attack_details"]) > 10:
-                profile["attack_details"] = profile["attack_details"][-10:]
+        
+        return profile
     
     def _get_baseline_threat_level(self, attack_type):
         """Get baseline threat level based on attack type."""
-        high_threat_attacks = [
-            "SQL Injection attempt", "Command injection attempt",
-            "Known vulnerability probe", "PHPMyAdmin attack"
-        ]
-        
-        medium_threat_attacks = [
-            "Brute force attempt", "Credential stuffing attempt",
-            "Web vulnerability scan", "WordPress vulnerability scan"
-        ]
-        
-        if attack_type in high_threat_attacks:
-            return 2  # High
-        elif attack_type in medium_threat_attacks:
-            return 1  # Medium
-        else:
-            return 0  # Low
+        return self._baseline_threat_levels.get(attack_type, 0)  # Low by default
     
     def _analyze_ssh_attack(self, details, baseline_threat):
         """Analyze SSH attack details with pattern matching."""
@@ -165,25 +258,22 @@ class AIAnalyzer:
         password = details.get('password_attempt', '')
         client_id = details.get('client_id', '')
         
+        password_lower = password.lower()
+        
         # Check for command injection patterns
-        for pattern in self.patterns['ssh']['command_injection']:
-            if re.search(pattern, password, re.IGNORECASE):
-                attack_details["command_injection"] = True
-                baseline_threat = max(baseline_threat, 3)  # Critical
-                break
+        if self.fused['ssh']['command_injection'].search(password_lower):
+            attack_details["command_injection"] = True
+            baseline_threat = max(baseline_threat, 3)  # Critical
         
         # Check for common passwords
-        for common_pwd in self.patterns['ssh']['common_passwords']:
-            if password.lower() == common_pwd.lower():
-                attack_details["common_password"] = True
-                attack_details["password_used"] = common_pwd
-                baseline_threat = max(baseline_threat, 1)  # Medium
-                break
+        if password_lower in self._common_pwds_set:
+            attack_details["common_password"] = True
+            attack_details["password_used"] = password_lower
+            baseline_threat = max(baseline_threat, 1)  # Medium
         
         # Check for unusual SSH client
         if client_id:
-            common_clients = ["OpenSSH", "PuTTY", "libssh"]
-            if not any(client in client_id for client in common_clients):
+            if not any(client in client_id for client in self._common_clients):
                 attack_details["unusual_client"] = True
                 baseline_threat = max(baseline_threat, 1)  # Medium
         
@@ -191,49 +281,79 @@ class AIAnalyzer:
     
     def _analyze_web_attack(self, details, baseline_threat):
         """Analyze web attack details with pattern matching."""
-        attack_details = {}
-        
         # Extract features
         path = details.get('path', '')
         method = details.get('method', '')
         query_string = details.get('query_string', {})
         headers = details.get('headers', {})
         
-        # Combine relevant inputs for pattern matching
-        combined_input = path + json.dumps(query_string)
-        
-        # Check for path traversal attempts
-        for pattern in self.patterns['web']['path_traversal']:
-            if re.search(pattern, combined_input, re.IGNORECASE):
-                attack_details["path_traversal"] = True
-                attack_details["matched_pattern"] = pattern
-                baseline_threat = max(baseline_threat, 3)  # Critical
-                break
-        
-        # Check for SQL injection attempts
-        for pattern in self.patterns['web']['sql_injection']:
-            if re.search(pattern, combined_input, re.IGNORECASE):
-                attack_details["sql_injection"] = True
-                attack_details["matched_pattern"] = pattern
-                baseline_threat = max(baseline_threat, 3)  # Critical
-                break
-        
-        # Check for XSS attempts
-        for pattern in self.patterns['web']['xss']:
-            if re.search(pattern, combined_input, re.IGNORECASE):
-                attack_details["xss_attempt"] = True
-                attack_details["matched_pattern"] = pattern
-                baseline_threat = max(baseline_threat, 2)  # High
-                break
+        # Combine relevant inputs for pattern matching; orjson's C encoder replaces
+        # the pure-Python json.dumps walk on every event
+        combined_input = path + orjson.dumps(query_string, option=orjson.OPT_NON_STR_KEYS).decode()
         
-        # Check for user-agent anomalies
         user_agent = headers.get('User-Agent', '')
-        if re.search(r'(sqlmap|nikto|nmap|dirbuster|gobuster|wpscan|hydra)', user_agent, re.IGNORECASE):
-            attack_details["scanning_tool_detected"] = True
-            attack_details["user_agent"] = user_agent
-            baseline_threat = max(baseline_threat, 2)  # High
+        if len(combined_input) + len(user_agent) <= MAX_CACHED_WEB_INPUT:
+            threat_floor, findings = self._classify_web(combined_input, user_agent)
+        else:
+            threat_floor, findings = self._classify_web_input(combined_input, user_agent)
+        attack_details = dict(findings)
         
-        return baseline_threat, attack_details
+        return max(baseline_threat, threat_floor), attack_details
+    
+    def _classify_web_input(self, combined_input, user_agent):
+        """
+        Pattern-match the inputs of a web request.
+        
+        Scanners repeat the same probes many times, so initialize_models wraps
+        this in an LRU cache; results are immutable so cached entries can be
+        shared safely.
+        
+        Args:
+            combined_input (str): Request path plus serialized query string
+            user_agent (str): User-Agent header of the request
+            
+        Returns:
+            tuple: Minimum threat level and a tuple of (key, value) attack details
+        """
+        findings = []
+        threat_floor = 0
+        
+        # Compiled patterns are lowercase, so lowercase the input once
+        combined_input = combined_input.lower()
+        
+        # Only classify inputs that match at least one web pattern
+        if self._web_prefilter.search(combined_input):
+            # Check for path traversal attempts
+            match = self._match_web_pattern('path_traversal', combined_input)
+            if match:
+                findings += [("path_traversal", True), ("matched_pattern", match)]
+                threat_floor = max(threat_floor, 3)  # Critical
+            
+            # Check for SQL injection attempts
+            match = self._match_web_pattern('sql_injection', combined_input)
+            if match:
+                findings += [("sql_injection", True), ("matched_pattern", match)]
+                threat_floor = max(threat_floor, 3)  # Critical
+            
+            # Check for XSS attempts
+            match = self._match_web_pattern('xss', combined_input)
+            if match:
+                findings += [("xss_attempt", True), ("matched_pattern", match)]
+                threat_floor = max(threat_floor, 2)  # High
+        
+        # Check for user-agent anomalies
+        if self._scanner_re.search(user_agent.lower()):
+            findings += [("scanning_tool_detected", True), ("user_agent", user_agent)]
+            threat_floor = max(threat_floor, 2)  # High
+        
+        return threat_floor, tuple(findings)
+    
+    def _match_web_pattern(self, category, text):
+        """Return the source of the web pattern in a category matching text, or None."""
+        m = self.fused['web'][category].search(text)
+        if not m:
+            return None
+        return self.patterns['web'][category][int(m.lastgroup[1:])]
     
     def _generic_attack_analysis(self, details, attack_type):
         """Generic attack analysis for other honeypot types."""
@@ -242,8 +362,9 @@ class AIAnalyzer:
     
     def _adjust_for_repeated_attacks(self, ip, threat_level):
         """Adjust threat level based on repeated attacks from the same IP."""
-        if ip in self.attackers_db:
-            attack_count = self.attackers_db[ip].get("attack_count", 0)
+        profile = self.attackers_db.get(ip)
+        if profile is not None:
+            attack_count = profile.get("attack_count", 0)
             
             # Increase threat level for repeated attackers
             if attack_count > 20:
@@ -282,8 +403,7 @@ class AIAnalyzer:
     
     def _get_threat_level_label(self, level):
         """Convert numeric threat level to label."""
-        labels = ["Low", "Medium", "High", "Critical"]
-        return labels[min(level, 3)]
+        return THREAT_LEVEL_LABELS[min(level, 3)]
     
     def get_threat_intelligence(self):
         """
@@ -293,27 +413,18 @@ class AIAnalyzer:
             dict: Threat intelligence report
         """
         # Get top attackers
-        top_attackers = sorted(
+        top_attackers = heapq.nlargest(
+            10,
             self.attackers_db.items(),
-            key=lambda x: x[1].get("attack_count", 0),
-            reverse=True
-        )[:10]
+            key=lambda x: x[1].get("attack_count", 0)
+        )
         
         # Get most common attack types
-        attack_types = {}
-        for ip, data in self.attackers_db.items():
-            for attack in data.get("attack_types", []):
-                attack_types[attack] = attack_types.get(attack, 0) + 1
-        
-        top_attack_types = sorted(
-            attack_types.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:5]
+        top_attack_types = self._attack_type_counter.most_common(5)
         
         # Generate report
         report = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "total_attackers": len(self.attackers_db),
             "top_attackers": [
                 {"ip": ip, "attack_count": data.get("attack_count", 0)}
@@ -1,10 +1,14 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel
 import uvicorn
 import logging
-from datetime import datetime
-import json
+import os
+from collections import deque
+import orjson
+
+from utils.timestamps import now_iso
 
 app = FastAPI(title="AI HoneyPot System")
 
@@ -27,9 +31,16 @@ logging.basicConfig(
     ]
 )
 
+# Maximum number of alerts kept in memory; the oldest are dropped first
+MAX_ALERTS = 10000
+
 # Mock database for demonstration
 honeypot_data = {}
-alerts = []
+alerts = deque(maxlen=MAX_ALERTS)
+
+def _json_response(obj):
+    """Serialize obj with orjson, bypassing FastAPI's jsonable_encoder walk."""
+    return Response(content=orjson.dumps(obj), media_type="application/json")
 
 @app.get("/")
 async def root():
@@ -37,22 +48,50 @@ async def root():
 
 @app.get("/alerts")
 async def get_alerts():
-    return alerts
+    return _json_response(list(alerts))
 
 @app.get("/honeypots")
 async def get_honeypots():
-    return honeypot_data
+    return _json_response(honeypot_data)
 
 @app.post("/honeypot/{honeypot_id}/alert")
 async def create_alert(honeypot_id: str, alert_data: dict):
     alert = {
         "honeypot_id": honeypot_id,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso(),
         "data": alert_data
     }
     alerts.append(alert)
-    logging.info(f"New alert received: {json.dumps(alert)}")
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info(f"New alert received: {orjson.dumps(alert).decode()}")
     return alert
 
+@app.post("/honeypot/{honeypot_id}/alerts/batch")
+async def create_alert_batch(honeypot_id: str, batch_data: dict):
+    events = batch_data.get("events")
+    if not isinstance(events, list):
+        raise HTTPException(status_code=400, detail="Batch must contain an 'events' list")
+    
+    timestamp = now_iso()
+    alerts.extend(
+        {"honeypot_id": honeypot_id, "timestamp": timestamp, "data": event}
+        for event in events
+    )
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        logging.info(f"New alert batch received: {len(events)} alerts from {honeypot_id}")
+    return {"received": len(events)}
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Alerts are kept in process memory, so each extra worker would hold its own
+    # copy; multiple workers are opt-in via HONEYPOT_WORKERS
+    workers = int(os.environ.get("HONEYPOT_WORKERS", "1"))
+    
+    # loop/http "auto" use uvloop and httptools when they are installed
+    uvicorn.run(
+        "app:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="auto",
+        http="auto"
+    )
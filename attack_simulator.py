@@ -11,6 +11,7 @@ import asyncio
 import random
 import time
 import aiohttp
+import orjson
 import logging
 import argparse
 from datetime import datetime
@@ -45,15 +46,36 @@ class AttackSimulator:
     
     async def setup(self):
         """Set up the simulator."""
-        self.session = aiohttp.ClientSession()
+        # One pooled, keep-alive connector shared by every alert in a burst
+        connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=30)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            json_serialize=lambda obj: orjson.dumps(obj).decode()
+        )
     
     async def cleanup(self):
         """Clean up resources."""
         if self.session:
             await self.session.close()
     
-    async def send_alert(self, honeypot_id, attack_type, attack_details, source_ip=None):
-        """Send an alert to the API."""
+    async def send_alert(self, honeypot_id, attack_type, attack_details, source_ip=None, delay=0):
+        """
+        Send an alert to the API.
+        
+        Args:
+            honeypot_id (str): ID of the honeypot the alert is attributed to
+            attack_type (str): Type of the simulated attack
+            attack_details (dict): Details of the simulated attack
+            source_ip (str, optional): Attacker IP, random if not provided
+            delay (float, optional): Seconds to wait before sending, used to pace
+                alerts that are scheduled together with asyncio.gather
+            
+        Returns:
+            bool: True if the API accepted the alert, False otherwise
+        """
+        if delay:
+            await asyncio.sleep(delay)
+        
         if not source_ip:
             source_ip = random.choice(SOURCE_IPS)
         
@@ -95,19 +117,25 @@ class AttackSimulator:
         
         source_ip = random.choice(SOURCE_IPS)
         
+        # Draw the random selections for the whole burst at once
+        picked_usernames = random.choices(usernames, k=attempts)
+        picked_passwords = random.choices(passwords, k=attempts)
+        
+        # Schedule every attempt up front so slow responses don't delay the next one
+        alerts = []
+        delay = 0.0
         for i in range(attempts):
-            username = random.choice(usernames)
-            password = random.choice(passwords)
-            
             attack_details = {
-                "username": username,
-                "password": password,
+                "username": picked_usernames[i],
+                "password": picked_passwords[i],
                 "attempt": i+1,
                 "total_attempts": attempts
             }
             
-            await self.send_alert("ssh-honeypot-1", "SSH_BRUTE_FORCE", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            alerts.append(self.send_alert("ssh-honeypot-1", "SSH_BRUTE_FORCE", attack_details, source_ip, delay=delay))
+            delay += random.uniform(0.5, 1.5)
+        
+        await asyncio.gather(*alerts)
     
     async def simulate_ssh_command_injection(self, attempts=5):
         """Simulate SSH command injection."""
@@ -128,19 +156,26 @@ class AttackSimulator:
         
         source_ip = random.choice(SOURCE_IPS)
         
+        # Draw the random selections for the whole burst at once
+        picked_commands = random.choices(commands, k=attempts)
+        picked_usernames = random.choices(["root", "admin"], k=attempts)
+        
+        # Schedule every attempt up front so slow responses don't delay the next one
+        alerts = []
+        delay = 0.0
         for i in range(attempts):
-            command = random.choice(commands)
-            
             attack_details = {
-                "command": command,
-                "username": random.choice(["root", "admin"]),
+                "command": picked_commands[i],
+                "username": picked_usernames[i],
                 "session_id": f"SSH-{random.randint(1000, 9999)}",
                 "attempt": i+1,
                 "total_attempts": attempts
             }
             
-            await self.send_alert("ssh-honeypot-1", "COMMAND_INJECTION", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.8, 2.0))
+            alerts.append(self.send_alert("ssh-honeypot-1", "COMMAND_INJECTION", attack_details, source_ip, delay=delay))
+            delay += random.uniform(0.8, 2.0)
+        
+        await asyncio.gather(*alerts)
     
     async def simulate_sql_injection(self, attempts=8):
         """Simulate SQL injection attacks."""
@@ -162,21 +197,29 @@ class AttackSimulator:
         
         source_ip = random.choice(SOURCE_IPS)
         
+        # Draw the random selections for the whole burst at once
+        picked_payloads = random.choices(payloads, k=attempts)
+        picked_urls = random.choices(urls, k=attempts)
+        picked_methods = random.choices(["GET", "POST"], k=attempts)
+        picked_parameters = random.choices(["username", "search", "id", "query", "user_id"], k=attempts)
+        
+        # Schedule every attempt up front so slow responses don't delay the next one
+        alerts = []
+        delay = 0.0
         for i in range(attempts):
-            payload = random.choice(payloads)
-            url = random.choice(urls)
-            
             attack_details = {
-                "url": url,
-                "method": "GET" if random.random() > 0.5 else "POST",
-                "payload": payload,
-                "parameter": random.choice(["username", "search", "id", "query", "user_id"]),
+                "url": picked_urls[i],
+                "method": picked_methods[i],
+                "payload": picked_payloads[i],
+                "parameter": picked_parameters[i],
                 "attempt": i+1,
                 "total_attempts": attempts
             }
             
-            await self.send_alert("web-honeypot-1", "SQL_INJECTION", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            alerts.append(self.send_alert("web-honeypot-1", "SQL_INJECTION", attack_details, source_ip, delay=delay))
+            delay += random.uniform(0.5, 1.5)
+        
+        await asyncio.gather(*alerts)
     
     async def simulate_xss_attacks(self, attempts=6):
         """Simulate XSS attacks."""
@@ -196,21 +239,29 @@ class AttackSimulator:
         
         source_ip = random.choice(SOURCE_IPS)
         
+        # Draw the random selections for the whole burst at once
+        picked_payloads = random.choices(payloads, k=attempts)
+        picked_urls = random.choices(urls, k=attempts)
+        picked_methods = random.choices(["GET", "POST"], k=attempts)
+        picked_parameters = random.choices(["q", "comment", "message", "input", "search"], k=attempts)
+        
+        # Schedule every attempt up front so slow responses don't delay the next one
+        alerts = []
+        delay = 0.0
         for i in range(attempts):
-            payload = random.choice(payloads)
-            url = random.choice(urls)
-            
             attack_details = {
-                "url": url,
-                "method": "GET" if random.random() > 0.5 else "POST",
-                "payload": payload,
-                "parameter": random.choice(["q", "comment", "message", "input", "search"]),
+                "url": picked_urls[i],
+                "method": picked_methods[i],
+                "payload": picked_payloads[i],
+                "parameter": picked_parameters[i],
                 "attempt": i+1,
                 "total_attempts": attempts
             }
             
-            await self.send_alert("web-honeypot-1", "XSS", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.7, 1.8))
+            alerts.append(self.send_alert("web-honeypot-1", "XSS", attack_details, source_ip, delay=delay))
+            delay += random.uniform(0.7, 1.8)
+        
+        await asyncio.gather(*alerts)
     
     async def simulate_path_traversal(self, attempts=5):
         """Simulate path traversal attacks."""
@@ -230,21 +281,28 @@ class AttackSimulator:
         
         source_ip = random.choice(SOURCE_IPS)
         
+        # Draw the random selections for the whole burst at once
+        picked_payloads = random.choices(payloads, k=attempts)
+        picked_urls = random.choices(urls, k=attempts)
+        picked_parameters = random.choices(["file", "path", "document", "image", "resource"], k=attempts)
+        
+        # Schedule every attempt up front so slow responses don't delay the next one
+        alerts = []
+        delay = 0.0
         for i in range(attempts):
-            payload = random.choice(payloads)
-            url = random.choice(urls)
-            
             attack_details = {
-                "url": url,
+                "url": picked_urls[i],
                 "method": "GET",
-                "payload": payload,
-                "parameter": random.choice(["file", "path", "document", "image", "resource"]),
+                "payload": picked_payloads[i],
+                "parameter": picked_parameters[i],
                 "attempt": i+1,
                 "total_attempts": attempts
             }
             
-            await self.send_alert("web-honeypot-1", "PATH_TRAVERSAL", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.6, 1.5))
+            alerts.append(self.send_alert("web-honeypot-1", "PATH_TRAVERSAL", attack_details, source_ip, delay=delay))
+            delay += random.uniform(0.6, 1.5)
+        
+        await asyncio.gather(*alerts)
     
     async def simulate_web_scanning(self, attempts=10):
         """Simulate web vulnerability scanning."""
@@ -271,11 +329,15 @@ class AttackSimulator:
         source_ip = random.choice(SOURCE_IPS)
         user_agent = "Nmap Scripting Engine" if random.random() > 0.5 else "ZAP/2.11.0"
         
+        # Draw the random selections for the whole burst at once
+        picked_targets = random.choices(targets, k=attempts)
+        
+        # Schedule every attempt up front so slow responses don't delay the next one
+        alerts = []
+        delay = 0.0
         for i in range(attempts):
-            target = random.choice(targets)
-            
             attack_details = {
-                "url": target,
+                "url": picked_targets[i],
                 "method": "GET",
                 "user_agent": user_agent,
                 "scanner": "Vulnerability Scanner",
@@ -283,8 +345,10 @@ class AttackSimulator:
                 "total_attempts": attempts
             }
             
-            await self.send_alert("web-honeypot-1", "VULNERABILITY_SCAN", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.4, 1.0))
+            alerts.append(self.send_alert("web-honeypot-1", "VULNERABILITY_SCAN", attack_details, source_ip, delay=delay))
+            delay += random.uniform(0.4, 1.0)
+        
+        await asyncio.gather(*alerts)
     
     async def run_all_simulations(self):
         """Run all attack simulations."""
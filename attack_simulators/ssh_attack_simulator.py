@@ -7,19 +7,24 @@ It tests brute force attempts, command injection, and other SSH-based attacks.
 """
 
 import asyncio
+import os
+import sys
 import random
 import socket
 import time
 import argparse
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger("ssh_attack_simulator")
+# Run as a script from attack_simulators/, so put the project root on the path
+# for the shared utils package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logging_config import setup_logger
+
+# Console logging through the shared background queue listener
+logger = setup_logger("ssh_attack_simulator", console_only=True)
 
 # Common usernames and passwords for brute force simulation
 COMMON_USERNAMES = [
@@ -55,120 +60,268 @@ SSH_CLIENT_IDS = [
     "SSH-2.0-Kali_Penetration_Testing",
 ]
 
+# Wire-ready (already CRLF-terminated and encoded) versions of the above
+SSH_CLIENT_IDS_ENC = [f"{client_id}\r\n".encode() for client_id in SSH_CLIENT_IDS]
+COMMON_PASSWORDS_ENC = {password: f"{password}\r\n".encode() for password in COMMON_PASSWORDS}
+COMMAND_INJECTION_ENC = {pattern: f"{pattern}\r\n".encode() for pattern in COMMAND_INJECTION_PATTERNS}
+
+class ConnectionPool:
+    """
+    Keep opened SSH connections around so attempts can share them.
+    
+    A connection is only handed back to the pool if it is still open after
+    the attempt; connections the server or the attempt closed (or that
+    failed) are dropped and a fresh one is opened on the next borrow.
+    """
+    
+    def __init__(self, connect, max_connections=4):
+        """
+        Initialize the pool.
+        
+        Args:
+            connect: Coroutine function returning a (reader, writer) tuple
+            max_connections (int): Maximum number of connections open at once
+        """
+        self.connect = connect
+        self.idle = asyncio.Queue()
+        self.slots = asyncio.Semaphore(max_connections)
+    
+    @staticmethod
+    def _is_alive(reader, writer):
+        """Check whether a pooled connection can still be used."""
+        return not writer.is_closing() and not reader.at_eof()
+    
+    async def _close(self, writer):
+        """Close a connection, ignoring errors from an already reset socket."""
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+    
+    async def _acquire(self):
+        """Get a live idle connection, or open a new one."""
+        while not self.idle.empty():
+            reader, writer = self.idle.get_nowait()
+            if self._is_alive(reader, writer):
+                try:
+                    # Zero-length drain surfaces a reset socket before reuse
+                    await writer.drain()
+                    return reader, writer
+                except ConnectionResetError:
+                    pass
+            await self._close(writer)
+        return await self.connect()
+    
+    @asynccontextmanager
+    async def borrow(self):
+        """Borrow a (reader, writer) pair, returning it to the pool afterwards."""
+        async with self.slots:
+            reader, writer = await self._acquire()
+            if not reader or not writer:
+                yield None, None
+                return
+            
+            try:
+                yield reader, writer
+            except BaseException:
+                await self._close(writer)
+                raise
+            
+            if self._is_alive(reader, writer):
+                self.idle.put_nowait((reader, writer))
+            else:
+                await self._close(writer)
+    
+    async def close(self):
+        """Close all idle connections."""
+        while not self.idle.empty():
+            _, writer = self.idle.get_nowait()
+            await self._close(writer)
+
 class SSHAttackSimulator:
     """Simulate various SSH attacks against a honeypot."""
 
-    def __init__(self, target_ip='127.0.0.1', target_port=2222):
-        """Initialize the SSH attack simulator."""
+    def __init__(self, target_ip='127.0.0.1', target_port=2222, concurrency=20, pacing=0.0, seed=None,
+                 max_startups=8):
+        """
+        Initialize the SSH attack simulator.
+        
+        Args:
+            target_ip (str): IP address of the SSH honeypot
+            target_port (int): Port of the SSH honeypot
+            concurrency (int): Maximum number of attempts in flight at once
+            pacing (float): Maximum random delay in seconds before each attempt,
+                to look human-paced; 0 sends attempts as fast as possible
+            seed: Optional seed for this simulator's random generator, for
+                reproducible runs
+            max_startups (int): Maximum number of connections in the
+                unauthenticated handshake phase at once; kept below sshd's
+                default MaxStartups of 10 so the server doesn't drop them
+        """
         self.target_ip = target_ip
         self.target_port = target_port
+        self.concurrency = concurrency
+        self.pacing = pacing
+        self.max_startups = max_startups
+        self._startup_sem = None
+        self._rng = random.Random(seed)
         self.attack_count = 0
     
     async def connect(self):
         """Create a raw socket connection to the SSH server."""
+        # Shared by every simulation; created lazily inside the running loop
+        if self._startup_sem is None:
+            self._startup_sem = asyncio.Semaphore(self.max_startups)
+        
         try:
-            # Create socket
-            reader, writer = await asyncio.open_connection(
-                self.target_ip, self.target_port
-            )
-            
-            logger.info(f"Connected to {self.target_ip}:{self.target_port}")
+            # Only the handshake (connect + banner) counts against MaxStartups;
+            # established connections don't hold a startup slot
+            async with self._startup_sem:
+                # Create socket
+                reader, writer = await asyncio.open_connection(
+                    self.target_ip, self.target_port
+                )
+                
+                logger.info("Connected to %s:%s", self.target_ip, self.target_port)
+                
+                # Read SSH banner from server
+                banner = await reader.readline()
             
-            # Read SSH banner from server
-            banner = await reader.readline()
-            logger.info(f"Server banner: {banner.decode().strip()}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Server banner: %s", banner.decode().strip())
             
             return reader, writer
         except Exception as e:
             logger.error(f"Connection failed: {str(e)}")
             return None, None
     
+    async def _read_response(self, reader, timeout=1.0, until=None):
+        """
+        Read the server's next response, returning b"" if none arrives in time.
+        
+        Args:
+            reader: Stream reader of the connection
+            timeout (float): Seconds to wait for the response
+            until (bytes): If given, keep reading up to and including this
+                separator instead of returning the first chunk received
+        """
+        try:
+            if until:
+                return await asyncio.wait_for(reader.readuntil(until), timeout=timeout)
+            return await asyncio.wait_for(reader.read(1024), timeout=timeout)
+        except asyncio.TimeoutError:
+            return b""
+        except asyncio.IncompleteReadError as e:
+            # Server closed before sending the separator
+            return e.partial
+    
+    def _finish_attempt(self, writer, response):
+        """
+        Log and count a login attempt, then retire its connection.
+        
+        A rejected login ends the session (the honeypot closes it right after
+        "Access denied", before its FIN may have arrived), so the connection
+        is closed instead of going back to the pool, where the next attempt
+        would only hit EOF. An attempt the server never answered, e.g.
+        because it closed the connection first, is not counted.
+        """
+        writer.close()
+        if not response:
+            logger.warning("No response to login attempt; not counted")
+            return
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Response: %s", response.decode())
+        self.attack_count += 1
+    
     async def simulate_brute_force(self, attempts=5):
         """Simulate a brute force attack on the SSH server."""
         logger.info(f"Starting SSH brute force simulation ({attempts} attempts)")
         
-        for i in range(attempts):
-            reader, writer = await self.connect()
+        # The pool's connection limit also caps how many attempts run at once
+        pool = ConnectionPool(self.connect, max_connections=self.concurrency)
+        try:
+            # Draw every attempt's values up front in one call each
+            client_ids = self._rng.choices(SSH_CLIENT_IDS_ENC, k=attempts)
+            usernames = self._rng.choices(COMMON_USERNAMES, k=attempts)
+            passwords = self._rng.choices(COMMON_PASSWORDS, k=attempts)
+            
+            await asyncio.gather(*(
+                self._brute_force_attempt(pool, i, attempts, client_ids[i], usernames[i], passwords[i])
+                for i in range(attempts)
+            ))
+        finally:
+            await pool.close()
+    
+    async def _brute_force_attempt(self, pool, i, attempts, client_id, username, password):
+        """Run a single brute force attempt on a pooled connection."""
+        # Optional jitter so attempts look human-paced
+        if self.pacing:
+            await asyncio.sleep(self.pacing * self._rng.random())
+        
+        async with pool.borrow() as (reader, writer):
             if not reader or not writer:
-                continue
+                return
             
             try:
-                # Send client identification
-                client_id = random.choice(SSH_CLIENT_IDS)
-                writer.write(f"{client_id}\r\n".encode())
+                # Send client identification and the password in one write;
+                # the server reads them line by line, so no need to wait for
+                # the password prompt in between
+                writer.write(client_id + COMMON_PASSWORDS_ENC[password])
                 await writer.drain()
                 
-                # Wait for server response/password prompt
-                await asyncio.sleep(1)
-                
-                # Send username and password
-                username = random.choice(COMMON_USERNAMES)
-                password = random.choice(COMMON_PASSWORDS)
-                
-                # For simplicity, we're just sending the password when prompted
-                writer.write(f"{password}\r\n".encode())
-                await writer.drain()
-                
-                logger.info(f"Brute force attempt {i+1}/{attempts}: {username}:{password}")
-                
-                # Wait for response
-                await asyncio.sleep(1)
+                logger.info("Brute force attempt %d/%d: %s:%s", i + 1, attempts, username, password)
                 
                 # Log the response (this will usually be "Access Denied")
-                response = await reader.read(1024)
-                logger.info(f"Response: {response.decode()}")
-                
-                self.attack_count += 1
+                response = await self._read_response(reader, until=b"\n")
+                self._finish_attempt(writer, response)
             except Exception as e:
                 logger.error(f"Error during brute force attempt: {str(e)}")
-            finally:
                 writer.close()
-                await writer.wait_closed()
-            
-            # Add delay between attempts
-            await asyncio.sleep(random.uniform(0.5, 2.0))
     
     async def simulate_command_injection(self, attempts=3):
         """Simulate command injection attacks."""
         logger.info(f"Starting SSH command injection simulation ({attempts} attempts)")
         
-        for i in range(attempts):
-            reader, writer = await self.connect()
+        # The pool's connection limit also caps how many attempts run at once
+        pool = ConnectionPool(self.connect, max_connections=self.concurrency)
+        try:
+            # Draw every attempt's values up front in one call each
+            client_ids = self._rng.choices(SSH_CLIENT_IDS_ENC, k=attempts)
+            injections = self._rng.choices(COMMAND_INJECTION_PATTERNS, k=attempts)
+            
+            await asyncio.gather(*(
+                self._command_injection_attempt(pool, i, attempts, client_ids[i], injections[i])
+                for i in range(attempts)
+            ))
+        finally:
+            await pool.close()
+    
+    async def _command_injection_attempt(self, pool, i, attempts, client_id, injection):
+        """Run a single command injection attempt on a pooled connection."""
+        # Optional jitter so attempts look human-paced
+        if self.pacing:
+            await asyncio.sleep(self.pacing * self._rng.random())
+        
+        async with pool.borrow() as (reader, writer):
             if not reader or not writer:
-                continue
+                return
             
             try:
-                # Send client identification
-                client_id = random.choice(SSH_CLIENT_IDS)
-                writer.write(f"{client_id}\r\n".encode())
+                # Send client identification and the injection as password in
+                # one write
+                writer.write(client_id + COMMAND_INJECTION_ENC[injection])
                 await writer.drain()
                 
-                # Wait for server response/password prompt
-                await asyncio.sleep(1)
-                
-                # Send command injection as password
-                injection = random.choice(COMMAND_INJECTION_PATTERNS)
-                writer.write(f"{injection}\r\n".encode())
-                await writer.drain()
-                
-                logger.info(f"Command injection attempt {i+1}/{attempts}: {injection}")
-                
-                # Wait for response
-                await asyncio.sleep(1)
+                logger.info("Command injection attempt %d/%d: %s", i + 1, attempts, injection)
                 
                 # Log the response
-                response = await reader.read(1024)
-                logger.info(f"Response: {response.decode()}")
-                
-                self.attack_count += 1
+                response = await self._read_response(reader, until=b"\n")
+                self._finish_attempt(writer, response)
             except Exception as e:
                 logger.error(f"Error during command injection attempt: {str(e)}")
-            finally:
                 writer.close()
-                await writer.wait_closed()
-            
-            # Add delay between attempts
-            await asyncio.sleep(random.uniform(1.0, 3.0))
     
     async def simulate_unusual_client(self):
         """Simulate connection from unusual SSH client."""
@@ -185,7 +338,7 @@ class SSHAttackSimulator:
             await writer.drain()
             
             # Wait for server response/password prompt
-            await asyncio.sleep(1)
+            await self._read_response(reader)
             
             # Send some random data
             writer.write(b"\\x00\\x01\\x02\\x03\\x04\\x05HACKED\r\n")
@@ -193,11 +346,8 @@ class SSHAttackSimulator:
             
             logger.info(f"Unusual client simulation sent: {client_id}")
             
-            # Wait for response
-            await asyncio.sleep(1)
-            
             # Log the response
-            response = await reader.read(1024)
+            response = await self._read_response(reader)
             logger.info(f"Response: {response}")
             
             self.attack_count += 1
@@ -229,6 +379,8 @@ async def main():
                         help='Target IP address (default: 127.0.0.1)')
     parser.add_argument('--port', type=int, default=2222,
                         help='Target port (default: 2222)')
+    parser.add_argument('--pacing', type=float, default=0.0,
+                        help='Maximum random delay in seconds before each attempt (default: 0)')
     args = parser.parse_args()
     
     print("=" * 70)
@@ -238,7 +390,7 @@ async def main():
     print("This tool simulates various SSH attacks for testing honeypots")
     print("=" * 70)
     
-    simulator = SSHAttackSimulator(args.ip, args.port)
+    simulator = SSHAttackSimulator(args.ip, args.port, pacing=args.pacing)
     await simulator.run_all_simulations()
 
 if __name__ == "__main__":
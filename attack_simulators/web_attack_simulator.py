@@ -7,20 +7,38 @@ It tests SQL injection, XSS, path traversal, and other web-based attacks.
 """
 
 import asyncio
+import os
+import sys
 import random
 import argparse
-import logging
 import aiohttp
 import time
 from datetime import datetime
-from urllib.parse import urljoin
+from itertools import cycle
+from urllib.parse import quote_plus, urlencode
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger("web_attack_simulator")
+# Run as a script from attack_simulators/, so put the project root on the path
+# for the shared utils package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logging_config import setup_logger
+
+# Console logging through the shared background queue listener
+logger = setup_logger("web_attack_simulator", console_only=True)
+
+# Common username/password combinations for the login brute force
+CREDENTIALS = [
+    {"username": "admin", "password": "admin"},
+    {"username": "admin", "password": "password"},
+    {"username": "administrator", "password": "administrator"},
+    {"username": "root", "password": "toor"},
+    {"username": "user", "password": "password"},
+    {"username": "guest", "password": "guest"},
+    {"username": "test", "password": "test"},
+    {"username": "admin", "password": "123456"},
+    {"username": "admin", "password": "admin123"},
+    {"username": "administrator", "password": "password123"},
+]
 
 # Attack payloads for simulation
 SQL_INJECTION_PAYLOADS = [
@@ -91,18 +109,86 @@ USER_AGENTS = [
     "w3af/2.0.0 (http://w3af.org)",
 ]
 
+# Request headers for each user agent, built once and shared by all requests
+HEADER_VARIANTS = [{"User-Agent": ua, "Connection": "keep-alive"} for ua in USER_AGENTS]
+
+# The same headers for POSTs that send one of the pre-encoded form bodies below
+FORM_HEADER_VARIANTS = [
+    {**headers, "Content-Type": "application/x-www-form-urlencoded"}
+    for headers in HEADER_VARIANTS
+]
+
+# Form-urlencoded POST bodies, encoded once at import
+CRED_BODIES = tuple(urlencode(creds).encode() for creds in CREDENTIALS)
+SQLI_USERNAME_BODIES = tuple(
+    urlencode({"username": payload, "password": "anything"}).encode()
+    for payload in SQL_INJECTION_PAYLOADS
+)
+SQLI_PASSWORD_BODIES = tuple(
+    urlencode({"username": "admin", "password": payload}).encode()
+    for payload in SQL_INJECTION_PAYLOADS
+)
+XSS_BODIES = tuple(
+    urlencode({"username": payload, "password": "password"}).encode()
+    for payload in XSS_PAYLOADS
+)
+
 class WebAttackSimulator:
     """Simulate various web attacks against a honeypot."""
 
-    def __init__(self, target_url='http://127.0.0.1:8089'):
-        """Initialize the web attack simulator."""
+    def __init__(self, target_url='http://127.0.0.1:8089', concurrency=32, pacing=0.0, seed=None):
+        """
+        Initialize the web attack simulator.
+        
+        Args:
+            target_url (str): Base URL of the web honeypot
+            concurrency (int): Maximum number of requests in flight at once,
+                shared by all simulations
+            pacing (float): Maximum random delay in seconds before each attempt,
+                to look human-paced; 0 sends attempts as fast as possible
+            seed: Optional seed for this simulator's random generator, for
+                reproducible runs
+        """
         self.target_url = target_url
+        self.pacing = pacing
+        
+        # Resolve the URLs every simulation uses once, up front
+        self._base = target_url.rstrip('/')
+        self._login_url = self._url("/login")
+        self._path_traversal_urls = [self._url(path) for path in PATH_TRAVERSAL_PATHS]
+        self._rng = random.Random(seed)
+        
+        # (headers, form headers) pairs in a fixed random order, cycled through
+        # request by request
+        header_pairs = list(zip(HEADER_VARIANTS, FORM_HEADER_VARIANTS))
+        self._headers = cycle(self._rng.sample(header_pairs, len(header_pairs)))
         self.attack_count = 0
         self.session = None
+        self.concurrency = concurrency
+        self.semaphore = None
+    
+    def _url(self, path):
+        """Build the full URL for a path on the target."""
+        if path.startswith('/'):
+            return self._base + path
+        return self._base + '/' + path
     
     async def setup_session(self):
         """Set up the HTTP session for the attack."""
-        self.session = aiohttp.ClientSession()
+        # Keep connections to the honeypot open so attempts reuse them
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=32,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers={"Connection": "keep-alive"}
+        )
+        
+        # Created here, inside the running loop, and shared by all simulations
+        self.semaphore = asyncio.Semaphore(self.concurrency)
     
     async def close_session(self):
         """Close the HTTP session."""
@@ -112,164 +198,167 @@ class WebAttackSimulator:
     async def simulate_login_bruteforce(self, attempts=5):
         """Simulate brute force attempts against the login page."""
         logger.info(f"Starting login brute force simulation ({attempts} attempts)")
-        login_url = urljoin(self.target_url, "/login")
+        login_url = self._login_url
         
-        # Common username/password combinations
-        credentials = [
-            {"username": "admin", "password": "admin"},
-            {"username": "admin", "password": "password"},
-            {"username": "administrator", "password": "administrator"},
-            {"username": "root", "password": "toor"},
-            {"username": "user", "password": "password"},
-            {"username": "guest", "password": "guest"},
-            {"username": "test", "password": "test"},
-            {"username": "admin", "password": "123456"},
-            {"username": "admin", "password": "admin123"},
-            {"username": "administrator", "password": "password123"},
-        ]
-        
-        for i in range(min(attempts, len(credentials))):
-            creds = credentials[i]
-            user_agent = random.choice(USER_AGENTS)
-            headers = {"User-Agent": user_agent}
-            
-            try:
-                async with self.session.post(login_url, data=creds, headers=headers) as response:
-                    status = response.status
-                    text = await response.text()
-                    
-                    logger.info(f"Login attempt {i+1}/{attempts}: {creds['username']}:{creds['password']} - Status: {status}")
-                    self.attack_count += 1
-            except Exception as e:
-                logger.error(f"Error during login attempt: {str(e)}")
+        async def _one_attempt(i, creds, body):
+            # Optional jitter so attempts look human-paced
+            if self.pacing:
+                await asyncio.sleep(self.pacing * self._rng.random())
+            _, form_headers = next(self._headers)
             
-            # Add delay between attempts
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            async with self.semaphore:
+                try:
+                    async with self.session.post(login_url, data=body, headers=form_headers) as response:
+                        status = response.status
+                        # Drain the body undecoded so the connection goes back to the pool
+                        await response.read()
+                        
+                        logger.info("Login attempt %d/%d: %s:%s - Status: %d", i + 1, attempts, creds['username'], creds['password'], status)
+                        self.attack_count += 1
+                except Exception as e:
+                    logger.error(f"Error during login attempt: {str(e)}")
+        
+        targets = zip(CREDENTIALS[:attempts], CRED_BODIES)
+        await asyncio.gather(*(_one_attempt(i, c, b) for i, (c, b) in enumerate(targets)))
     
     async def simulate_sql_injection(self, attempts=5):
         """Simulate SQL injection attacks."""
         logger.info(f"Starting SQL injection simulation ({attempts} attempts)")
-        login_url = urljoin(self.target_url, "/login")
+        login_url = self._login_url
         
-        for i in range(min(attempts, len(SQL_INJECTION_PAYLOADS))):
-            payload = SQL_INJECTION_PAYLOADS[i]
-            user_agent = random.choice(USER_AGENTS)
-            headers = {"User-Agent": user_agent}
-            
-            # Try in username field
-            data = {"username": payload, "password": "anything"}
+        async def _one_attempt(i, payload, username_body, password_body):
+            # Optional jitter so attempts look human-paced
+            if self.pacing:
+                await asyncio.sleep(self.pacing * self._rng.random())
+            _, form_headers = next(self._headers)
             
-            try:
-                async with self.session.post(login_url, data=data, headers=headers) as response:
-                    status = response.status
-                    text = await response.text()
-                    
-                    logger.info(f"SQL injection attempt {i+1}/{attempts} (username field): {payload} - Status: {status}")
-                    self.attack_count += 1
-            except Exception as e:
-                logger.error(f"Error during SQL injection attempt: {str(e)}")
-            
-            # Try in password field
-            data = {"username": "admin", "password": payload}
-            
-            try:
-                async with self.session.post(login_url, data=data, headers=headers) as response:
-                    status = response.status
-                    text = await response.text()
-                    
-                    logger.info(f"SQL injection attempt {i+1}/{attempts} (password field): {payload} - Status: {status}")
-                    self.attack_count += 1
-            except Exception as e:
-                logger.error(f"Error during SQL injection attempt: {str(e)}")
-            
-            # Add delay between attempts
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            async with self.semaphore:
+                # Try in username field
+                try:
+                    async with self.session.post(login_url, data=username_body, headers=form_headers) as response:
+                        status = response.status
+                        # Drain the body undecoded so the connection goes back to the pool
+                        await response.read()
+                        
+                        logger.info("SQL injection attempt %d/%d (username field): %s - Status: %d", i + 1, attempts, payload, status)
+                        self.attack_count += 1
+                except Exception as e:
+                    logger.error(f"Error during SQL injection attempt: {str(e)}")
+                
+                # Try in password field
+                try:
+                    async with self.session.post(login_url, data=password_body, headers=form_headers) as response:
+                        status = response.status
+                        # Drain the body undecoded so the connection goes back to the pool
+                        await response.read()
+                        
+                        logger.info("SQL injection attempt %d/%d (password field): %s - Status: %d", i + 1, attempts, payload, status)
+                        self.attack_count += 1
+                except Exception as e:
+                    logger.error(f"Error during SQL injection attempt: {str(e)}")
+        
+        targets = zip(SQL_INJECTION_PAYLOADS[:attempts], SQLI_USERNAME_BODIES, SQLI_PASSWORD_BODIES)
+        await asyncio.gather(*(_one_attempt(i, *target) for i, target in enumerate(targets)))
     
     async def simulate_xss_attacks(self, attempts=5):
         """Simulate Cross-Site Scripting (XSS) attacks."""
         logger.info(f"Starting XSS attack simulation ({attempts} attempts)")
-        login_url = urljoin(self.target_url, "/login")
+        login_url = self._login_url
         
-        for i in range(min(attempts, len(XSS_PAYLOADS))):
-            payload = XSS_PAYLOADS[i]
-            user_agent = random.choice(USER_AGENTS)
-            headers = {"User-Agent": user_agent}
-            
-            # Try XSS in username field
-            data = {"username": payload, "password": "password"}
-            
-            try:
-                async with self.session.post(login_url, data=data, headers=headers) as response:
-                    status = response.status
-                    text = await response.text()
-                    
-                    logger.info(f"XSS attempt {i+1}/{attempts}: {payload} - Status: {status}")
-                    self.attack_count += 1
-            except Exception as e:
-                logger.error(f"Error during XSS attempt: {str(e)}")
-            
-            # Try as GET parameter
-            query_url = f"{login_url}?q={payload}"
-            
-            try:
-                async with self.session.get(query_url, headers=headers) as response:
-                    status = response.status
-                    text = await response.text()
-                    
-                    logger.info(f"XSS GET attempt {i+1}/{attempts}: {query_url} - Status: {status}")
-                    self.attack_count += 1
-            except Exception as e:
-                logger.error(f"Error during XSS GET attempt: {str(e)}")
+        # URL-encode the payloads for the GET variant once, before the fanout
+        payloads = XSS_PAYLOADS[:attempts]
+        query_urls = [f"{login_url}?q={quote_plus(payload)}" for payload in payloads]
+        
+        async def _one_attempt(i, payload, body, query_url):
+            # Optional jitter so attempts look human-paced
+            if self.pacing:
+                await asyncio.sleep(self.pacing * self._rng.random())
+            headers, form_headers = next(self._headers)
             
-            # Add delay between attempts
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            async with self.semaphore:
+                # Try XSS in username field
+                try:
+                    async with self.session.post(login_url, data=body, headers=form_headers) as response:
+                        status = response.status
+                        # Drain the body undecoded so the connection goes back to the pool
+                        await response.read()
+                        
+                        logger.info("XSS attempt %d/%d: %s - Status: %d", i + 1, attempts, payload, status)
+                        self.attack_count += 1
+                except Exception as e:
+                    logger.error(f"Error during XSS attempt: {str(e)}")
+                
+                # Try as GET parameter
+                try:
+                    async with self.session.get(query_url, headers=headers) as response:
+                        status = response.status
+                        # Drain the body undecoded so the connection goes back to the pool
+                        await response.read()
+                        
+                        logger.info("XSS GET attempt %d/%d: %s - Status: %d", i + 1, attempts, query_url, status)
+                        self.attack_count += 1
+                except Exception as e:
+                    logger.error(f"Error during XSS GET attempt: {str(e)}")
+        
+        targets = zip(payloads, XSS_BODIES, query_urls)
+        await asyncio.gather(*(_one_attempt(i, *target) for i, target in enumerate(targets)))
     
     async def simulate_path_traversal(self, attempts=5):
         """Simulate path traversal attacks."""
         logger.info(f"Starting path traversal simulation ({attempts} attempts)")
         
-        for i in range(min(attempts, len(PATH_TRAVERSAL_PATHS))):
-            path = PATH_TRAVERSAL_PATHS[i]
-            target_url = urljoin(self.target_url, path)
-            user_agent = random.choice(USER_AGENTS)
-            headers = {"User-Agent": user_agent}
-            
-            try:
-                async with self.session.get(target_url, headers=headers) as response:
-                    status = response.status
-                    text = await response.text()
-                    
-                    logger.info(f"Path traversal attempt {i+1}/{attempts}: {path} - Status: {status}")
-                    self.attack_count += 1
-            except Exception as e:
-                logger.error(f"Error during path traversal attempt: {str(e)}")
+        async def _one_attempt(i, path, target_url):
+            # Optional jitter so attempts look human-paced
+            if self.pacing:
+                await asyncio.sleep(self.pacing * self._rng.random())
+            headers, _ = next(self._headers)
             
-            # Add delay between attempts
-            await asyncio.sleep(random.uniform(0.5, 1.5))
+            async with self.semaphore:
+                try:
+                    async with self.session.get(target_url, headers=headers) as response:
+                        status = response.status
+                        # Drain the body undecoded so the connection goes back to the pool
+                        await response.read()
+                        
+                        logger.info("Path traversal attempt %d/%d: %s - Status: %d", i + 1, attempts, path, status)
+                        self.attack_count += 1
+                except Exception as e:
+                    logger.error(f"Error during path traversal attempt: {str(e)}")
+        
+        targets = zip(PATH_TRAVERSAL_PATHS[:attempts], self._path_traversal_urls)
+        await asyncio.gather(*(_one_attempt(i, p, u) for i, (p, u) in enumerate(targets)))
     
     async def simulate_vulnerability_scanning(self, attempts=10):
         """Simulate scanning for common vulnerable paths."""
         logger.info(f"Starting vulnerability scanning simulation ({attempts} attempts)")
         
-        paths = random.sample(COMMON_VULNERABLE_PATHS, min(attempts, len(COMMON_VULNERABLE_PATHS)))
+        # Pick the paths and resolve their URLs before the concurrent fanout
+        k = min(attempts, len(COMMON_VULNERABLE_PATHS))
+        targets = [(path, self._url(path)) for path in self._rng.sample(COMMON_VULNERABLE_PATHS, k)]
         
-        for i, path in enumerate(paths):
-            target_url = urljoin(self.target_url, path)
-            user_agent = random.choice(USER_AGENTS)
-            headers = {"User-Agent": user_agent}
-            
+        await asyncio.gather(*(
+            self._scan_one(i, len(targets), path, url) for i, (path, url) in enumerate(targets)
+        ))
+    
+    async def _scan_one(self, i, total, path, url):
+        """Request a single candidate path, returning the HTTP status (None on error)."""
+        # Optional jitter so attempts look human-paced
+        if self.pacing:
+            await asyncio.sleep(self.pacing * self._rng.random())
+        headers, _ = next(self._headers)
+        
+        async with self.semaphore:
             try:
-                async with self.session.get(target_url, headers=headers) as response:
-                    status = response.status
-                    text = await response.text()
+                async with self.session.get(url, headers=headers) as response:
+                    # Drain the body undecoded so the connection goes back to the pool
+                    await response.read()
                     
-                    logger.info(f"Vulnerability scan {i+1}/{len(paths)}: {path} - Status: {status}")
+                    logger.info("Vulnerability scan %d/%d: %s - Status: %d", i + 1, total, path, response.status)
                     self.attack_count += 1
+                    return response.status
             except Exception as e:
                 logger.error(f"Error during vulnerability scan: {str(e)}")
-            
-            # Add delay between attempts
-            await asyncio.sleep(random.uniform(0.2, 1.0))
+                return None
     
     async def run_all_simulations(self):
         """Run all web attack simulations."""
@@ -278,20 +367,15 @@ class WebAttackSimulator:
         await self.setup_session()
         
         try:
-            # Run login brute force simulation
-            await self.simulate_login_bruteforce(attempts=5)
-            
-            # Run SQL injection simulation
-            await self.simulate_sql_injection(attempts=5)
-            
-            # Run XSS attack simulation
-            await self.simulate_xss_attacks(attempts=5)
-            
-            # Run path traversal simulation
-            await self.simulate_path_traversal(attempts=5)
-            
-            # Run vulnerability scanning simulation
-            await self.simulate_vulnerability_scanning(attempts=10)
+            # The simulations hit independent endpoints, so run them all at
+            # once; the shared semaphore bounds the total requests in flight
+            await asyncio.gather(
+                self.simulate_login_bruteforce(attempts=5),
+                self.simulate_sql_injection(attempts=5),
+                self.simulate_xss_attacks(attempts=5),
+                self.simulate_path_traversal(attempts=5),
+                self.simulate_vulnerability_scanning(attempts=10)
+            )
             
             logger.info(f"Completed all web attack simulations. Total attacks: {self.attack_count}")
         finally:
@@ -302,6 +386,8 @@ async def main():
     parser = argparse.ArgumentParser(description='Web Honeypot Attack Simulator')
     parser.add_argument('--url', type=str, default='http://127.0.0.1:8089',
                         help='Target URL (default: http://127.0.0.1:8089)')
+    parser.add_argument('--pacing', type=float, default=0.0,
+                        help='Maximum random delay in seconds before each attempt (default: 0)')
     args = parser.parse_args()
     
     print("=" * 70)
@@ -311,7 +397,7 @@ async def main():
     print("This tool simulates various web attacks for testing honeypots")
     print("=" * 70)
     
-    simulator = WebAttackSimulator(args.url)
+    simulator = WebAttackSimulator(args.url, pacing=args.pacing)
     await simulator.run_all_simulations()
 
 if __name__ == "__main__":
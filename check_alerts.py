@@ -6,76 +6,106 @@ This utility checks if the alert system is working properly and helps diagnose i
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 import os
+import re
 import time
 import sys
+from collections import deque
 from datetime import datetime
+from utils.timestamps import now_iso
+
+# Shared session so successive checks reuse the same TCP connection
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_SESSION.headers["Connection"] = "keep-alive"
+
+# Matches any log line that could carry one of the indicators checked below
+_LOG_INDICATORS = re.compile(
+    rb"started|listening|activity recorded|starting honeypot server|alert",
+    re.IGNORECASE
+)
+
+def _write_lines(lines):
+    """Write a section's collected output lines to stdout in one call."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 def check_alert_api(base_url="http://localhost:8000"):
     """Check if the alerts API is accessible and returning data."""
+    lines = []
+    out = lines.append
+    
     try:
         print(f"Testing alert API at {base_url}/alerts...")
-        response = requests.get(f"{base_url}/alerts", timeout=5)
+        response = _SESSION.get(f"{base_url}/alerts", timeout=5)
         
         # Check status code
         if response.status_code == 200:
-            print(f"✅ Alert API is accessible. Status: {response.status_code}")
+            out(f"✅ Alert API is accessible. Status: {response.status_code}")
             
             # Try to parse the response as JSON
             try:
-                data = response.json()
-                print(f"✅ API returned valid JSON data")
+                data = orjson.loads(response.content)
+                out(f"✅ API returned valid JSON data")
                 
                 # Check if the data is an array (list)
                 if isinstance(data, list):
-                    print(f"✅ API returned an array with {len(data)} alerts")
+                    out(f"✅ API returned an array with {len(data)} alerts")
                     
                     # Log alert details if any exist
                     if len(data) > 0:
-                        print("\nMost recent alerts:")
+                        out("\nMost recent alerts:")
                         for i, alert in enumerate(data[-5:], 1):  # Show last 5 alerts
-                            print(f"  Alert {i}:")
-                            print(f"    Honeypot: {alert.get('honeypot_id', 'Unknown')}")
-                            print(f"    Timestamp: {alert.get('timestamp', 'Unknown')}")
-                            print(f"    Source IP: {alert.get('data', {}).get('source_ip', 'Unknown')}")
-                            print(f"    Attack Type: {alert.get('data', {}).get('attack_type', 'Unknown')}")
-                            print()
+                            out(f"  Alert {i}:")
+                            out(f"    Honeypot: {alert.get('honeypot_id', 'Unknown')}")
+                            out(f"    Timestamp: {alert.get('timestamp', 'Unknown')}")
+                            out(f"    Source IP: {alert.get('data', {}).get('source_ip', 'Unknown')}")
+                            out(f"    Attack Type: {alert.get('data', {}).get('attack_type', 'Unknown')}")
+                            out("")
                     else:
-                        print("⚠️ No alerts have been recorded yet")
+                        out("⚠️ No alerts have been recorded yet")
                 else:
-                    print(f"❌ API did not return an array as expected. Got: {type(data)}")
-            except json.JSONDecodeError:
-                print(f"❌ API response is not valid JSON")
-                print(f"Response: {response.text[:200]}...")
+                    out(f"❌ API did not return an array as expected. Got: {type(data)}")
+            except orjson.JSONDecodeError:
+                out(f"❌ API response is not valid JSON")
+                out(f"Response: {response.text[:200]}...")
         else:
-            print(f"❌ Alert API returned error status: {response.status_code}")
-            print(f"Response: {response.text[:200]}...")
+            out(f"❌ Alert API returned error status: {response.status_code}")
+            out(f"Response: {response.text[:200]}...")
     except requests.exceptions.ConnectionError:
-        print(f"❌ Could not connect to server at {base_url}")
-        print("   Make sure the server is running (python start.py)")
+        out(f"❌ Could not connect to server at {base_url}")
+        out("   Make sure the server is running (python start.py)")
     except requests.exceptions.Timeout:
-        print(f"❌ Request to {base_url} timed out")
-        print("   Server might be overloaded or unresponsive")
+        out(f"❌ Request to {base_url} timed out")
+        out("   Server might be overloaded or unresponsive")
     except Exception as e:
-        print(f"❌ Unexpected error: {str(e)}")
+        out(f"❌ Unexpected error: {str(e)}")
+    
+    _write_lines(lines)
 
 def check_log_files():
     """Check log files for relevant information about alerts and honeypots."""
     log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+    lines = []
+    out = lines.append
     
     if not os.path.exists(log_dir):
-        print(f"❌ Log directory not found at {log_dir}")
+        out(f"❌ Log directory not found at {log_dir}")
+        _write_lines(lines)
         return
     
-    print(f"\nChecking log files in {log_dir}...")
+    out(f"\nChecking log files in {log_dir}...")
     
     log_files = [f for f in os.listdir(log_dir) if f.endswith('.log')]
     if not log_files:
-        print("❌ No log files found")
+        out("❌ No log files found")
+        _write_lines(lines)
         return
     
-    print(f"✅ Found {len(log_files)} log files")
+    out(f"✅ Found {len(log_files)} log files")
     
     # Check for honeypot activity in logs
     honeypot_active = False
@@ -84,59 +114,87 @@ def check_log_files():
     
     for log_file in log_files:
         file_path = os.path.join(log_dir, log_file)
-        print(f"\nExamining {log_file}...")
+        out(f"\nExamining {log_file}...")
         
         try:
-            with open(file_path, 'r') as f:
-                log_content = f.read()
-                
-                # Check for key indicators in logs
-                if "honeypot" in log_file.lower():
-                    if "started" in log_content and "listening" in log_content:
-                        honeypot_active = True
-                        print(f"✅ Honeypot appears to be active")
-                    
-                    if "activity recorded" in log_content.lower():
-                        print(f"✅ Detected attack activity in logs")
+            saw_started = saw_listening = False
+            saw_activity = saw_alert_sent = False
+            saw_server_start = saw_alert_received = False
+            alert_lines = deque(maxlen=5)  # Last 5 alert-related log lines
+            
+            # Single pass over the raw bytes; only lines the prefilter matches
+            # are lowercased and checked for the individual indicators
+            with open(file_path, 'rb') as f:
+                for line in f:
+                    if not _LOG_INDICATORS.search(line):
+                        continue
                     
-                    if "alert sent to api" in log_content.lower():
-                        alert_records = True
-                        print(f"✅ Alerts are being sent to API")
+                    lower = line.lower()
+                    saw_started = saw_started or b"started" in line
+                    saw_listening = saw_listening or b"listening" in line
+                    saw_activity = saw_activity or b"activity recorded" in lower
+                    saw_alert_sent = saw_alert_sent or b"alert sent to api" in lower
+                    saw_server_start = saw_server_start or b"starting honeypot server" in lower
+                    saw_alert_received = saw_alert_received or b"new alert received" in lower
+                    if b"alert" in lower:
+                        alert_lines.append(line)
+            
+            # Check for key indicators in logs
+            if "honeypot" in log_file.lower():
+                if saw_started and saw_listening:
+                    honeypot_active = True
+                    out(f"✅ Honeypot appears to be active")
                 
-                if "server" in log_file.lower():
-                    if "starting honeypot server" in log_content.lower():
-                        server_active = True
-                        print(f"✅ Server has been started")
-                    
-                    if "new alert received" in log_content.lower():
-                        alert_records = True
-                        print(f"✅ Server is receiving alerts")
+                if saw_activity:
+                    out(f"✅ Detected attack activity in logs")
+                
+                if saw_alert_sent:
+                    alert_records = True
+                    out(f"✅ Alerts are being sent to API")
+            
+            if "server" in log_file.lower():
+                if saw_server_start:
+                    server_active = True
+                    out(f"✅ Server has been started")
                 
-                # Extract the last few lines with alert information
-                alert_lines = [line for line in log_content.splitlines() if "alert" in line.lower()]
-                if alert_lines:
-                    print(f"\nLast few alert-related log entries:")
-                    for line in alert_lines[-5:]:  # Show last 5 alert-related log lines
-                        print(f"  {line}")
+                if saw_alert_received:
+                    alert_records = True
+                    out(f"✅ Server is receiving alerts")
+            
+            # Show the last few lines with alert information
+            if alert_lines:
+                out(f"\nLast few alert-related log entries:")
+                for line in alert_lines:
+                    out(f"  {line.decode(errors='replace').rstrip()}")
         except Exception as e:
-            print(f"❌ Error reading log file {log_file}: {str(e)}")
+            out(f"❌ Error reading log file {log_file}: {str(e)}")
+        
+        # Emit each file's section as soon as it has been examined
+        _write_lines(lines)
+        lines.clear()
     
     if not honeypot_active:
-        print("\n⚠️ No evidence found that honeypots are active")
+        out("\n⚠️ No evidence found that honeypots are active")
     
     if not server_active:
-        print("\n⚠️ No evidence found that the server is running")
+        out("\n⚠️ No evidence found that the server is running")
     
     if not alert_records:
-        print("\n⚠️ No evidence found of alerts being processed")
+        out("\n⚠️ No evidence found of alerts being processed")
+    
+    _write_lines(lines)
 
 def simulate_test_alert():
     """Simulate a test alert to verify the alert system."""
     print("\nSimulating a test alert to verify the alert system...")
+    lines = []
+    out = lines.append
     
     try:
+        # One timestamp shared by both fields of the payload
+        timestamp = now_iso()
         test_alert = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
             "data": {
                 "source_ip": "127.0.0.1",
                 "attack_type": "Test Alert",
@@ -146,38 +204,43 @@ def simulate_test_alert():
                     "headers": {
                         "User-Agent": "Diagnostic-Tool/1.0"
                     },
-                    "time": datetime.now().isoformat()
+                    "time": timestamp
                 }
             }
         }
         
-        response = requests.post(
+        response = _SESSION.post(
             "http://localhost:8000/honeypot/test-honeypot-1/alert", 
-            json=test_alert,
+            data=orjson.dumps(test_alert),
+            headers={"Content-Type": "application/json"},
             timeout=5
         )
         
         if response.status_code == 200:
-            print(f"✅ Test alert was successfully sent to the server")
-            print(f"✅ Server responded with status code: {response.status_code}")
+            out(f"✅ Test alert was successfully sent to the server")
+            out(f"✅ Server responded with status code: {response.status_code}")
             try:
-                result = response.json()
-                print(f"✅ Server processed the alert and added analysis")
+                result = orjson.loads(response.content)
+                out(f"✅ Server processed the alert and added analysis")
                 if "analysis" in result:
-                    print(f"   Threat level: {result['analysis'].get('threat_level_label', 'Unknown')}")
+                    out(f"   Threat level: {result['analysis'].get('threat_level_label', 'Unknown')}")
             except:
-                print(f"⚠️ Server response could not be parsed as JSON")
+                out(f"⚠️ Server response could not be parsed as JSON")
         else:
-            print(f"❌ Failed to send test alert. Status code: {response.status_code}")
-            print(f"Response: {response.text[:200]}...")
+            out(f"❌ Failed to send test alert. Status code: {response.status_code}")
+            out(f"Response: {response.text[:200]}...")
     except Exception as e:
-        print(f"❌ Error simulating test alert: {str(e)}")
+        out(f"❌ Error simulating test alert: {str(e)}")
+    
+    _write_lines(lines)
 
 def main():
     """Main function to run diagnostic checks."""
-    print("=" * 70)
-    print(f"AI Honeypot Alert System Diagnostic - {datetime.now()}")
-    print("=" * 70)
+    _write_lines([
+        "=" * 70,
+        f"AI Honeypot Alert System Diagnostic - {datetime.now()}",
+        "=" * 70,
+    ])
     
     # Check if alert API is working
     check_alert_api()
@@ -188,14 +251,16 @@ def main():
     # Simulate a test alert
     simulate_test_alert()
     
-    print("\n" + "=" * 70)
-    print("Diagnostic Completed. If issues persist, check that:")
-    print("1. The honeypot backend server is running (python start.py)")
-    print("2. Both SSH and Web honeypots are properly configured")
-    print("3. Attack simulators are targeting the correct ports (SSH: 2222, Web: 8080)")
-    print("4. The frontend dashboard is connected to the correct API URL")
-    print("5. There are no network issues blocking connections to the server")
-    print("=" * 70)
+    _write_lines([
+        "\n" + "=" * 70,
+        "Diagnostic Completed. If issues persist, check that:",
+        "1. The honeypot backend server is running (python start.py)",
+        "2. Both SSH and Web honeypots are properly configured",
+        "3. Attack simulators are targeting the correct ports (SSH: 2222, Web: 8080)",
+        "4. The frontend dashboard is connected to the correct API URL",
+        "5. There are no network issues blocking connections to the server",
+        "=" * 70,
+    ])
 
 if __name__ == "__main__":
     main()
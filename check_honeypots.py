@@ -5,48 +5,103 @@ Honeypot Status Checker
 This utility checks if the honeypots are running and accessible.
 """
 
-import requests
-import socket
+import asyncio
+import aiohttp
 import sys
-import time
 
-def check_web_honeypot(host="localhost", port=8080):
+# How long to keep retrying a honeypot that isn't accepting connections yet
+STARTUP_TIMEOUT = 5
+RETRY_INTERVAL = 0.25
+
+async def _connect_with_retry(connect, deadline):
+    """
+    Call connect() until the target accepts the connection or the deadline passes.
+    
+    Only refused connections are retried (the honeypot may still be starting
+    up); any other error is raised straight away.
+    
+    Args:
+        connect: Coroutine function that opens the connection
+        deadline (float): Event loop time after which to stop retrying
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            return await connect()
+        except (ConnectionRefusedError, aiohttp.ClientConnectorError):
+            if loop.time() + RETRY_INTERVAL >= deadline:
+                raise
+            await asyncio.sleep(RETRY_INTERVAL)
+
+async def check_web_honeypot(session, deadline, host="localhost", port=8080):
     """Check if the web honeypot is running."""
+    url = f"http://{host}:{port}"
+    
+    async def fetch():
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+            return response.status, await response.read()
+    
     try:
         # Try to connect to the web honeypot
-        url = f"http://{host}:{port}"
-        response = requests.get(url, timeout=5)
+        status, body = await _connect_with_retry(fetch, deadline)
         
         # If we get here, the connection succeeded
-        print(f"✅ Web honeypot is running on {url}")
-        print(f"   Status code: {response.status_code}")
-        print(f"   Response size: {len(response.text)} bytes")
-        return True
-    except requests.RequestException as e:
-        print(f"❌ Web honeypot is not accessible on {url}")
-        print(f"   Error: {str(e)}")
-        return False
+        return True, [
+            f"✅ Web honeypot is running on {url}",
+            f"   Status code: {status}",
+            f"   Response size: {len(body)} bytes",
+        ]
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return False, [
+            f"❌ Web honeypot is not accessible on {url}",
+            f"   Error: {str(e) or type(e).__name__}",
+        ]
 
-def check_ssh_honeypot(host="localhost", port=2222):
+async def check_ssh_honeypot(deadline, host="localhost", port=2222):
     """Check if the SSH honeypot is running."""
+    async def read_banner():
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=5)
+        try:
+            return await asyncio.wait_for(reader.read(1024), timeout=5)
+        finally:
+            writer.close()
+    
     try:
-        # Try to connect to the SSH honeypot
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(5)
-        s.connect((host, port))
-        
-        # Wait for banner
-        banner = s.recv(1024).decode('utf-8', errors='ignore')
-        s.close()
+        # Try to connect to the SSH honeypot and wait for its banner
+        banner = (await _connect_with_retry(read_banner, deadline)).decode('utf-8', errors='ignore')
         
         # If we get here, the connection succeeded
-        print(f"✅ SSH honeypot is running on {host}:{port}")
-        print(f"   Banner: {banner.strip()}")
-        return True
-    except socket.error as e:
-        print(f"❌ SSH honeypot is not accessible on {host}:{port}")
-        print(f"   Error: {str(e)}")
-        return False
+        return True, [
+            f"✅ SSH honeypot is running on {host}:{port}",
+            f"   Banner: {banner.strip()}",
+        ]
+    except (OSError, asyncio.TimeoutError) as e:
+        return False, [
+            f"❌ SSH honeypot is not accessible on {host}:{port}",
+            f"   Error: {str(e) or type(e).__name__}",
+        ]
+
+async def run_checks():
+    """Check both honeypots concurrently and print their reports in order."""
+    # The honeypots may have just been launched, so give them until the
+    # deadline to start accepting connections instead of always sleeping
+    print(f"Waiting up to {STARTUP_TIMEOUT} seconds for honeypots to initialize...")
+    deadline = asyncio.get_running_loop().time() + STARTUP_TIMEOUT
+    
+    async with aiohttp.ClientSession() as session:
+        (ssh_status, ssh_report), (web_status, web_report) = await asyncio.gather(
+            check_ssh_honeypot(deadline),
+            check_web_honeypot(session, deadline)
+        )
+    
+    # SSH honeypot
+    print("\n".join(ssh_report))
+    print()
+    
+    # Web honeypot
+    print("\n".join(web_report))
+    
+    return ssh_status, web_status
 
 def main():
     """Main function to check honeypot status."""
@@ -54,16 +109,7 @@ def main():
     print("Honeypot Status Checker")
     print("=" * 60)
     
-    # Give the honeypots time to start if they were just launched
-    print("Waiting 5 seconds for honeypots to initialize...")
-    time.sleep(5)
-    
-    # Check SSH honeypot
-    ssh_status = check_ssh_honeypot()
-    print()
-    
-    # Check Web honeypot
-    web_status = check_web_honeypot()
+    ssh_status, web_status = asyncio.run(run_checks())
     
     print("\n" + "=" * 60)
     if ssh_status and web_status:
@@ -6,9 +6,14 @@ Debug version of the server that doesn't automatically start honeypots
 import logging
 import os
 import json
+import orjson
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
+from typing import Optional
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 
 from utils.logging_config import setup_logger
@@ -16,8 +21,8 @@ from utils.logging_config import setup_logger
 # Configure logging
 logger = setup_logger("honeypot.debug_server")
 
-# Initialize the FastAPI application
-app = FastAPI(title="AI HoneyPot System (Debug Mode)")
+# Initialize the FastAPI application; every endpoint serializes with orjson
+app = FastAPI(title="AI HoneyPot System (Debug Mode)", default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -28,8 +33,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Maximum number of alerts kept in memory; the oldest are dropped first
+MAX_ALERTS = 10000
+
+@dataclass
+class Alert:
+    """A stored alert. __slots__ keeps thousands of them from each carrying a __dict__."""
+    __slots__ = ("honeypot_id", "timestamp", "data", "analysis")
+    
+    honeypot_id: str
+    timestamp: Optional[str]
+    data: dict
+    analysis: dict
+
 # Global variable to store alerts
-alerts = []
+alerts = deque(maxlen=MAX_ALERTS)
 
 @app.get("/")
 async def root():
@@ -78,32 +96,40 @@ async def get_honeypot(honeypot_id: str):
     raise HTTPException(status_code=404, detail=f"Honeypot {honeypot_id} not found")
 
 @app.get("/alerts")
-async def get_alerts():
-    """Get all alerts."""
-    logger.debug(f"Returning {len(alerts)} alerts")
-    return alerts
+async def get_alerts(limit: Optional[int] = None, offset: int = 0):
+    """
+    Get stored alerts, oldest first. orjson serializes the Alert dataclasses
+    directly, without converting them to dicts first.
+    
+    Args:
+        limit: Maximum number of alerts to return (all of them by default)
+        offset: Number of alerts to skip from the oldest one
+    """
+    stop = None if limit is None else offset + max(limit, 0)
+    page = list(islice(alerts, max(offset, 0), stop))
+    logger.debug(f"Returning {len(page)} of {len(alerts)} alerts")
+    return ORJSONResponse(page)
 
 @app.post("/honeypots/{honeypot_id}/alerts")
 async def create_alert(honeypot_id: str, request: Request):
     """Create a new alert."""
     try:
-        alert_data = await request.json()
+        # Parse the raw body with orjson rather than starlette's stdlib json
+        alert_data = orjson.loads(await request.body())
         logger.debug(f"Received alert from {honeypot_id}: {alert_data}")
         
-        # Create alert object
-        alert = {
-            "honeypot_id": honeypot_id,
-            "timestamp": alert_data.get("timestamp"),
-            "data": alert_data.get("data", {})
-        }
-        
-        # Add AI analysis 
-        alert["analysis"] = {
-            "threat_level": "medium",
-            "classification": "reconnaissance",
-            "confidence": 0.75,
-            "details": "Simulated attack detected"
-        }
+        # Create alert object with its (simulated) AI analysis
+        alert = Alert(
+            honeypot_id=honeypot_id,
+            timestamp=alert_data.get("timestamp"),
+            data=alert_data.get("data", {}),
+            analysis={
+                "threat_level": "medium",
+                "classification": "reconnaissance",
+                "confidence": 0.75,
+                "details": "Simulated attack detected"
+            }
+        )
         
         # Store the alert
         alerts.append(alert)
@@ -133,5 +159,15 @@ if __name__ == "__main__":
     logger.info("Starting FastAPI debug server on http://0.0.0.0:8000")
     logger.info("This is a debug version that doesn't start actual honeypots")
     
-    # Run the server
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="debug")
+    # Run the server; loop/http "auto" use uvloop and httptools when installed.
+    # The access log is off since simulators can post hundreds of alerts a
+    # second and create_alert already logs each one
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        log_level="debug",
+        loop="auto",
+        http="auto",
+        access_log=False
+    )
@@ -8,12 +8,84 @@ to demonstrate the alert display functionality.
 
 import requests
 import json
-import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import random
 import os
 import sys
 
+# Number of alerts sent at once
+MAX_WORKERS = 8
+
+# Shared session so the sends reuse a few keep-alive connections. Refused
+# connections and 429/5xx replies are retried with backoff; the last reply
+# is returned as-is so a persistent failure is still reported
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_WORKERS,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False
+    )
+))
+
+# Builders for each attack type's details
+def _build_ssh_details():
+    return {
+        "username": random.choice(["root", "admin", "user", "guest"]),
+        "password": random.choice(["password123", "admin", "123456", "qwerty"]),
+        "client_id": f"SSH-2.0-{random.choice(['OpenSSH', 'PuTTY', 'Metasploit'])}"
+    }
+
+def _build_sql_details():
+    return {
+        "url": "/login",
+        "parameter": "username",
+        "payload": random.choice(["' OR 1=1 --", "admin' --", "'; DROP TABLE users; --"])
+    }
+
+def _build_xss_details():
+    return {
+        "url": "/search",
+        "parameter": "q",
+        "payload": random.choice(["<script>alert('XSS')</script>", "<img src=x onerror=alert('XSS')>"])
+    }
+
+def _build_path_details():
+    return {
+        "url": "/download",
+        "parameter": "file",
+        "payload": random.choice(["../../../etc/passwd", "../../../../etc/shadow"])
+    }
+
+def _build_generic_details():
+    return {
+        "method": random.choice(["GET", "POST"]),
+        "path": random.choice(["/admin", "/login", "/config", "/wp-admin"]),
+        "headers": {
+            "User-Agent": random.choice([
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124",
+                "sqlmap/1.4.7",
+                "Nikto/2.1.6"
+            ])
+        }
+    }
+
+# Attack types without an entry here get the generic details
+DETAIL_BUILDERS = {
+    "SSH_BRUTE_FORCE": _build_ssh_details,
+    "SQL_INJECTION": _build_sql_details,
+    "XSS_ATTACK": _build_xss_details,
+    "PATH_TRAVERSAL": _build_path_details
+}
+
 # Generate some interesting random test alerts
 def generate_alerts(count=10):
     alerts = []
@@ -32,63 +104,38 @@ def generate_alerts(count=10):
     
     threat_levels = ["Low", "Medium", "High", "Critical"]
     
+    # Read the clock once; each alert's timestamp is an offset from it
+    now = datetime.now()
+    base_time = now.replace(microsecond=0)
+    analysis_timestamp = now.isoformat()
+    
+    # Draw the per-alert fields for the whole batch up front
+    picked_honeypot_ids = random.choices(honeypot_ids, k=count)
+    picked_attack_types = random.choices(attack_types, k=count)
+    picked_source_ips = random.choices(source_ips, k=count)
+    picked_threat_levels = random.choices(range(4), k=count)  # 0-3
+    
     for i in range(count):
-        honeypot_id = random.choice(honeypot_ids)
-        attack_type = random.choice(attack_types)
-        source_ip = random.choice(source_ips)
-        threat_level = random.choice(range(4))  # 0-3
+        honeypot_id = picked_honeypot_ids[i]
+        attack_type = picked_attack_types[i]
+        source_ip = picked_source_ips[i]
+        threat_level = picked_threat_levels[i]
         threat_level_label = threat_levels[threat_level]
         
         # Create details based on attack type
-        if "SSH" in attack_type:
-            details = {
-                "username": random.choice(["root", "admin", "user", "guest"]),
-                "password": random.choice(["password123", "admin", "123456", "qwerty"]),
-                "client_id": f"SSH-2.0-{random.choice(['OpenSSH', 'PuTTY', 'Metasploit'])}"
-            }
-        elif "SQL" in attack_type:
-            details = {
-                "url": "/login",
-                "parameter": "username",
-                "payload": random.choice(["' OR 1=1 --", "admin' --", "'; DROP TABLE users; --"])
-            }
-        elif "XSS" in attack_type:
-            details = {
-                "url": "/search",
-                "parameter": "q",
-                "payload": random.choice(["<script>alert('XSS')</script>", "<img src=x onerror=alert('XSS')>"])
-            }
-        elif "PATH" in attack_type:
-            details = {
-                "url": "/download",
-                "parameter": "file",
-                "payload": random.choice(["../../../etc/passwd", "../../../../etc/shadow"])
-            }
-        else:
-            details = {
-                "method": random.choice(["GET", "POST"]),
-                "path": random.choice(["/admin", "/login", "/config", "/wp-admin"]),
-                "headers": {
-                    "User-Agent": random.choice([
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/91.0.4472.124",
-                        "sqlmap/1.4.7",
-                        "Nikto/2.1.6"
-                    ])
-                }
-            }
+        details = DETAIL_BUILDERS.get(attack_type, _build_generic_details)()
         
         # Create alert
         alert = {
             "honeypot_id": honeypot_id,
-            "timestamp": (datetime.now().replace(microsecond=0) - 
-                         datetime.timedelta(minutes=random.randint(0, 60))).isoformat(),
+            "timestamp": (base_time - timedelta(minutes=random.randint(0, 60))).isoformat(),
             "data": {
                 "source_ip": source_ip,
                 "attack_type": attack_type,
                 "details": details
             },
             "analysis": {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": analysis_timestamp,
                 "source_ip": source_ip,
                 "honeypot_id": honeypot_id,
                 "attack_type": attack_type,
@@ -110,12 +157,12 @@ def generate_alerts(count=10):
     return alerts
 
 # Try to send the alert to the API
-def send_alert_to_api(alert):
+def send_alert_to_api(session, alert):
     """Try to send an alert to the API endpoint."""
     honeypot_id = alert["honeypot_id"]
     
     try:
-        response = requests.post(
+        response = session.post(
             f"http://localhost:8000/honeypot/{honeypot_id}/alert",
             json=alert,
             timeout=5
@@ -145,15 +192,11 @@ def main():
     print(f"Generating {alert_count} test alerts...")
     alerts = generate_alerts(alert_count)
     
-    # Send alerts
-    print(f"Sending alerts to backend API...")
-    success_count = 0
-    
-    for i, alert in enumerate(alerts):
-        print(f"Sending alert {i+1}/{len(alerts)}...")
-        if send_alert_to_api(alert):
-            success_count += 1
-        time.sleep(0.5)  # Short delay between alerts
+    # Send alerts concurrently over the shared session
+    print(f"Sending {len(alerts)} alerts to backend API...")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = list(executor.map(partial(send_alert_to_api, SESSION), alerts))
+    success_count = sum(results)
     
     # Summary
     print("="*80)
@@ -8,13 +8,16 @@ demonstrations when the honeypot services aren't running.
 """
 
 import asyncio
+import argparse
 import logging
 import random
 import json
-import time
 import aiohttp
+import orjson
 from datetime import datetime
 from urllib.parse import urljoin
+from utils.circuit_breaker import CircuitBreaker
+from utils.timestamps import now_iso
 
 # Configure logging
 logging.basicConfig(
@@ -27,32 +30,138 @@ logger = logging.getLogger("direct_web_attack_simulator")
 API_URL = "http://localhost:8000/honeypots/web-honeypot-1/alerts"
 
 # Common headers for web requests
-USER_AGENTS = [
+USER_AGENTS = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.107 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:90.0) Gecko/20100101 Firefox/90.0"
-]
+)
 
 # Random source IPs for simulating different attackers
-SOURCE_IPS = [
+SOURCE_IPS = (
     "192.168.1.100", "10.0.0.25", "172.16.0.50", "192.168.0.10",
     "45.33.21.18", "89.105.194.89", "66.249.66.1", "77.88.55.60",
     "138.197.138.255", "104.236.213.118", "113.12.83.45"
-]
+)
+
+# Login brute force credentials
+LOGIN_USERNAMES = ("admin", "administrator", "root", "user", "guest")
+LOGIN_PASSWORDS = ("admin", "password", "123456", "qwerty", "letmein", "welcome", "admin123", "pass123")
+
+# SQL injection payloads, target pages and parameters
+SQLI_PAYLOADS = (
+    "' OR 1=1 --",
+    "' OR '1'='1",
+    "'; DROP TABLE users; --",
+    "1' OR '1' = '1'",
+    "' UNION SELECT username, password FROM users --",
+    "admin' --",
+    "' OR 1=1 LIMIT 1; --",
+    "' OR '1'='1' LIMIT 1; --",
+    "' OR \'1\'=\'1\'",
+    "' OR ''='"
+)
+SQLI_URLS = ("/login", "/search", "/products", "/users", "/admin")
+SQLI_PARAMETERS = ("username", "search", "id", "query", "user_id")
+
+# XSS payloads, target pages and parameters
+XSS_PAYLOADS = (
+    "<script>alert('XSS')</script>",
+    "<img src=x onerror=alert('XSS')>",
+    "<svg onload=alert('XSS')>",
+    "javascript:alert('XSS')",
+    "<iframe src=\"javascript:alert('XSS')\">",
+    "<body onload=alert('XSS')>",
+    "<svg/onload=alert('XSS')>",
+    "\"><script>alert('XSS')</script>",
+    "<img src=\"x\" onerror=\"alert('XSS')\">"
+)
+XSS_URLS = ("/search", "/comments", "/profile", "/feedback", "/message")
+XSS_PARAMETERS = ("q", "comment", "message", "input", "search")
+
+# Path traversal payloads, target pages and parameters
+PATH_TRAVERSAL_PAYLOADS = (
+    "../../../etc/passwd",
+    "..\\..\\..\\windows\\system32\\config\\SAM",
+    "../../../../etc/shadow",
+    "../../../var/www/html/config.php",
+    "..\\..\\..\\boot.ini",
+    "../../../../proc/self/environ",
+    "../../../var/log/auth.log"
+)
+PATH_TRAVERSAL_URLS = ("/download", "/file", "/image", "/document", "/resource")
+PATH_TRAVERSAL_PARAMETERS = ("file", "path", "document", "image", "resource")
+
+# Paths probed by the vulnerability scan
+SCAN_TARGETS = (
+    "/.env",
+    "/api/v1/admin",
+    "/admin",
+    "/api/v1/users",
+    "/backup",
+    "/admin.php",
+    "/console",
+    "/config",
+    "/.git",
+    "/wp-admin",
+    "/phpinfo.php",
+    "/test.php",
+    "/server-status",
+    "/.htaccess",
+    "/web.config"
+)
+
+# Retries for alerts that hit a transient server or network error
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.1
+
+# Consecutive failed sends that open the circuit, and how long it stays open
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 10
+
+# Module-level generator so the simulators don't share the global one
+_RAND = random.Random()
 
 class DirectWebAttackSimulator:
     """Simulate web attacks by sending alerts directly to the API."""
     
-    def __init__(self, api_url=API_URL):
-        """Initialize the direct web attack simulator."""
+    def __init__(self, api_url=API_URL, spread=0.0):
+        """
+        Initialize the direct web attack simulator.
+        
+        Args:
+            api_url (str): Alerts endpoint to post to
+            spread (float): Average seconds between a simulation's attempts;
+                attempts are scheduled at random offsets across the
+                simulation instead of being sent back to back. 0 sends
+                them all at once
+        """
         self.api_url = api_url
+        self.spread = spread
         self.session = None
+        self._sem = None
         self.attack_count = 0
+        
+        # Skips sends for a while once too many have failed in a row
+        self._circuit = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
     
     async def setup(self):
         """Set up the simulator."""
-        self.session = aiohttp.ClientSession()
+        # Every alert goes to the same API host, so keep a handful of
+        # connections to it open and reuse them across sends
+        self._connector = aiohttp.TCPConnector(
+            limit_per_host=32,
+            keepalive_timeout=30,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=self._connector,
+            timeout=aiohttp.ClientTimeout(total=5),
+            headers={"Connection": "keep-alive", "Content-Type": "application/json"}
+        )
+        
+        # Bounds in-flight alerts to what the connector keeps open per host
+        self._sem = asyncio.Semaphore(32)
     
     async def cleanup(self):
         """Clean up resources."""
@@ -61,45 +170,123 @@ class DirectWebAttackSimulator:
     
     async def send_alert(self, attack_type, attack_details, source_ip=None):
         """Send an alert directly to the API."""
+        # Fail fast while the circuit is open instead of waiting on a dead API
+        if self._circuit.is_open():
+            return False
+        
         if not source_ip:
-            source_ip = random.choice(SOURCE_IPS)
+            source_ip = _RAND.choice(SOURCE_IPS)
         
-        alert = {
-            "timestamp": datetime.now().isoformat(),
+        # Serialize straight to bytes; the session already sends the JSON
+        # Content-Type, so aiohttp posts the body as-is
+        body = orjson.dumps({
+            "timestamp": now_iso(),
             "data": {
                 "source_ip": source_ip,
                 "attack_type": attack_type,
                 "attack_details": attack_details
             }
-        }
+        })
         
         logger.info(f"Sending alert for {attack_type} attack from {source_ip}")
         
         try:
-            async with self.session.post(self.api_url, json=alert) as response:
-                if response.status == 200:
-                    self.attack_count += 1
-                    logger.info(f"Alert sent successfully: {await response.text()}")
-                    return True
-                else:
-                    logger.error(f"Failed to send alert: {response.status} - {await response.text()}")
-                    return False
+            status, text = await self._post_with_retry(body)
+            if status == 200:
+                self.attack_count += 1
+                self._circuit.record_success()
+                logger.info("Alert sent successfully")
+                return True
+            else:
+                if status >= 500:
+                    self._record_failure()
+                logger.error(f"Failed to send alert: {status} - {text}")
+                return False
         except Exception as e:
+            self._record_failure()
             logger.error(f"Error sending alert: {str(e)}")
             return False
     
+    def _record_failure(self):
+        """Count a failed send, opening the circuit after too many in a row."""
+        if self._circuit.record_failure():
+            logger.warning(f"API looks unavailable; skipping alerts for {CIRCUIT_RESET_TIMEOUT} seconds")
+    
+    async def _post_with_retry(self, body, attempts=RETRY_ATTEMPTS):
+        """
+        POST an alert body, retrying transient failures with jittered backoff.
+        
+        Only 5xx/429 responses, timeouts and refused connections are retried;
+        the last attempt's response or error is passed on to the caller.
+        
+        Args:
+            body (bytes): Serialized alert
+            attempts (int): Total number of tries
+            
+        Returns:
+            tuple: (status code, response text, or None on success)
+        """
+        delay = RETRY_BASE_DELAY
+        for attempt in range(1, attempts + 1):
+            try:
+                async with self.session.post(self.api_url, data=body) as response:
+                    if response.status == 200:
+                        # Only the status matters on success; drain the body
+                        # without decoding it so the connection can be reused
+                        await response.read()
+                        return response.status, None
+                    if attempt == attempts or (response.status < 500 and response.status != 429):
+                        return response.status, await self._error_text(response)
+                    # Drain the body so the connection goes back to the pool
+                    await response.read()
+            except (aiohttp.ClientConnectorError, asyncio.TimeoutError):
+                if attempt == attempts:
+                    raise
+            
+            await asyncio.sleep(delay + _RAND.random() * delay)
+            delay *= 2
+    
+    @staticmethod
+    async def _error_text(response, limit=200):
+        """Read the start of an error response's body, giving up after a second."""
+        try:
+            text = await asyncio.wait_for(response.text(), timeout=1.0)
+        except asyncio.TimeoutError:
+            return ""
+        return text[:limit]
+    
+    def _offsets(self, attempts):
+        """Return sorted random start offsets for a simulation's attempts."""
+        if not self.spread:
+            return [0.0] * attempts
+        return sorted(_RAND.uniform(0, attempts * self.spread) for _ in range(attempts))
+    
+    async def _delayed(self, offset, coro):
+        """Await coro once offset seconds have passed."""
+        if offset:
+            await asyncio.sleep(offset)
+        return await coro
+    
+    async def _send(self, *args):
+        """Send an alert once a concurrency slot is free."""
+        async with self._sem:
+            return await self.send_alert(*args)
+    
     async def simulate_login_brute_force(self, attempts=5):
         """Simulate login brute force attempts."""
         logger.info(f"Starting login brute force simulation ({attempts} attempts)")
         
-        usernames = ["admin", "administrator", "root", "user", "guest"]
-        passwords = ["admin", "password", "123456", "qwerty", "letmein", "welcome", "admin123", "pass123"]
+        source_ip = _RAND.choice(SOURCE_IPS)
         
-        source_ip = random.choice(SOURCE_IPS)
+        # Draw every attempt's values and start offsets up front
+        offsets = self._offsets(attempts)
+        picked_usernames = _RAND.choices(LOGIN_USERNAMES, k=attempts)
+        picked_passwords = _RAND.choices(LOGIN_PASSWORDS, k=attempts)
         
+        tasks = []
         for i in range(attempts):
-            username = random.choice(usernames)
-            password = random.choice(passwords)
+            username = picked_usernames[i]
+            password = picked_passwords[i]
             
             attack_details = {
                 "url": "/login",
@@ -110,165 +297,143 @@ class DirectWebAttackSimulator:
                 "total_attempts": attempts
             }
             
-            await self.send_alert("LOGIN_BRUTE_FORCE", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.5, 2.0))
+            tasks.append(asyncio.create_task(self._delayed(offsets[i], self._send("LOGIN_BRUTE_FORCE", attack_details, source_ip))))
+        
+        await asyncio.gather(*tasks)
     
     async def simulate_sql_injection(self, attempts=5):
         """Simulate SQL injection attacks."""
         logger.info(f"Starting SQL injection simulation ({attempts} attempts)")
         
-        payloads = [
-            "' OR 1=1 --",
-            "' OR '1'='1",
-            "'; DROP TABLE users; --",
-            "1' OR '1' = '1'",
-            "' UNION SELECT username, password FROM users --",
-            "admin' --",
-            "' OR 1=1 LIMIT 1; --",
-            "' OR '1'='1' LIMIT 1; --",
-            "' OR \'1\'=\'1\'",
-            "' OR ''='"
-        ]
-        
-        urls = ["/login", "/search", "/products", "/users", "/admin"]
+        source_ip = _RAND.choice(SOURCE_IPS)
         
-        source_ip = random.choice(SOURCE_IPS)
+        # Draw every attempt's values and start offsets up front
+        offsets = self._offsets(attempts)
+        picked_payloads = _RAND.choices(SQLI_PAYLOADS, k=attempts)
+        picked_urls = _RAND.choices(SQLI_URLS, k=attempts)
+        picked_methods = _RAND.choices(("GET", "POST"), k=attempts)
+        picked_params = _RAND.choices(SQLI_PARAMETERS, k=attempts)
         
+        tasks = []
         for i in range(attempts):
-            payload = random.choice(payloads)
-            url = random.choice(urls)
+            payload = picked_payloads[i]
+            url = picked_urls[i]
             
             attack_details = {
                 "url": url,
-                "method": "GET" if random.random() > 0.5 else "POST",
+                "method": picked_methods[i],
                 "payload": payload,
-                "parameter": random.choice(["username", "search", "id", "query", "user_id"]),
+                "parameter": picked_params[i],
                 "attempt": i+1,
                 "total_attempts": attempts
             }
             
-            await self.send_alert("SQL_INJECTION", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.5, 2.0))
+            tasks.append(asyncio.create_task(self._delayed(offsets[i], self._send("SQL_INJECTION", attack_details, source_ip))))
+        
+        await asyncio.gather(*tasks)
     
     async def simulate_xss_attacks(self, attempts=5):
         """Simulate XSS attacks."""
         logger.info(f"Starting XSS attack simulation ({attempts} attempts)")
         
-        payloads = [
-            "<script>alert('XSS')</script>",
-            "<img src=x onerror=alert('XSS')>",
-            "<svg onload=alert('XSS')>",
-            "javascript:alert('XSS')",
-            "<iframe src=\"javascript:alert('XSS')\">",
-            "<body onload=alert('XSS')>",
-            "<svg/onload=alert('XSS')>",
-            "\"><script>alert('XSS')</script>",
-            "<img src=\"x\" onerror=\"alert('XSS')\">"
-        ]
+        source_ip = _RAND.choice(SOURCE_IPS)
         
-        urls = ["/search", "/comments", "/profile", "/feedback", "/message"]
-        
-        source_ip = random.choice(SOURCE_IPS)
+        # Draw every attempt's values and start offsets up front
+        offsets = self._offsets(attempts)
+        picked_payloads = _RAND.choices(XSS_PAYLOADS, k=attempts)
+        picked_urls = _RAND.choices(XSS_URLS, k=attempts)
+        picked_methods = _RAND.choices(("GET", "POST"), k=attempts)
+        picked_params = _RAND.choices(XSS_PARAMETERS, k=attempts)
         
+        tasks = []
         for i in range(attempts):
-            payload = random.choice(payloads)
-            url = random.choice(urls)
+            payload = picked_payloads[i]
+            url = picked_urls[i]
             
             attack_details = {
                 "url": url,
-                "method": "GET" if random.random() > 0.5 else "POST",
+                "method": picked_methods[i],
                 "payload": payload,
-                "parameter": random.choice(["q", "comment", "message", "input", "search"]),
+                "parameter": picked_params[i],
                 "attempt": i+1,
                 "total_attempts": attempts
             }
             
-            await self.send_alert("XSS", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.5, 2.0))
+            tasks.append(asyncio.create_task(self._delayed(offsets[i], self._send("XSS", attack_details, source_ip))))
+        
+        await asyncio.gather(*tasks)
     
     async def simulate_path_traversal(self, attempts=5):
         """Simulate path traversal attacks."""
         logger.info(f"Starting path traversal simulation ({attempts} attempts)")
         
-        payloads = [
-            "../../../etc/passwd",
-            "..\\..\\..\\windows\\system32\\config\\SAM",
-            "../../../../etc/shadow",
-            "../../../var/www/html/config.php",
-            "..\\..\\..\\boot.ini",
-            "../../../../proc/self/environ",
-            "../../../var/log/auth.log"
-        ]
+        source_ip = _RAND.choice(SOURCE_IPS)
         
-        urls = ["/download", "/file", "/image", "/document", "/resource"]
-        
-        source_ip = random.choice(SOURCE_IPS)
+        # Draw every attempt's values and start offsets up front
+        offsets = self._offsets(attempts)
+        picked_payloads = _RAND.choices(PATH_TRAVERSAL_PAYLOADS, k=attempts)
+        picked_urls = _RAND.choices(PATH_TRAVERSAL_URLS, k=attempts)
+        picked_params = _RAND.choices(PATH_TRAVERSAL_PARAMETERS, k=attempts)
         
+        tasks = []
         for i in range(attempts):
-            payload = random.choice(payloads)
-            url = random.choice(urls)
+            payload = picked_payloads[i]
+            url = picked_urls[i]
             
             attack_details = {
                 "url": url,
                 "method": "GET",
                 "payload": payload,
-                "parameter": random.choice(["file", "path", "document", "image", "resource"]),
+                "parameter": picked_params[i],
                 "attempt": i+1,
                 "total_attempts": attempts
             }
             
-            await self.send_alert("PATH_TRAVERSAL", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.5, 2.0))
+            tasks.append(asyncio.create_task(self._delayed(offsets[i], self._send("PATH_TRAVERSAL", attack_details, source_ip))))
+        
+        await asyncio.gather(*tasks)
     
     async def simulate_vulnerability_scanning(self, attempts=10):
         """Simulate vulnerability scanning."""
         logger.info(f"Starting vulnerability scanning simulation ({attempts} attempts)")
         
-        targets = [
-            "/.env",
-            "/api/v1/admin",
-            "/admin",
-            "/api/v1/users",
-            "/backup",
-            "/admin.php",
-            "/console",
-            "/config",
-            "/.git",
-            "/wp-admin",
-            "/phpinfo.php",
-            "/test.php",
-            "/server-status",
-            "/.htaccess",
-            "/web.config"
-        ]
+        source_ip = _RAND.choice(SOURCE_IPS)
         
-        source_ip = random.choice(SOURCE_IPS)
+        # Draw every attempt's values and start offsets up front
+        offsets = self._offsets(attempts)
+        picked_targets = _RAND.choices(SCAN_TARGETS, k=attempts)
+        picked_user_agents = _RAND.choices(USER_AGENTS, k=attempts)
         
+        tasks = []
         for i in range(attempts):
-            target = random.choice(targets)
+            target = picked_targets[i]
             
             attack_details = {
                 "url": target,
                 "method": "GET",
-                "user_agent": random.choice(USER_AGENTS),
+                "user_agent": picked_user_agents[i],
                 "attempt": i+1,
                 "total_attempts": attempts
             }
             
-            await self.send_alert("VULNERABILITY_SCAN", attack_details, source_ip)
-            await asyncio.sleep(random.uniform(0.5, 2.0))
+            tasks.append(asyncio.create_task(self._delayed(offsets[i], self._send("VULNERABILITY_SCAN", attack_details, source_ip))))
+        
+        await asyncio.gather(*tasks)
     
     async def run_all_simulations(self):
         """Run all attack simulations."""
         await self.setup()
         
         try:
-            # Run simulations one after another
-            await self.simulate_login_brute_force(attempts=5)
-            await self.simulate_sql_injection(attempts=5)
-            await self.simulate_xss_attacks(attempts=5)
-            await self.simulate_path_traversal(attempts=5)
-            await self.simulate_vulnerability_scanning(attempts=10)
+            # Run all simulations at once; the semaphore bounds the total
+            # number of alerts in flight
+            await asyncio.gather(
+                self.simulate_login_brute_force(attempts=5),
+                self.simulate_sql_injection(attempts=5),
+                self.simulate_xss_attacks(attempts=5),
+                self.simulate_path_traversal(attempts=5),
+                self.simulate_vulnerability_scanning(attempts=10)
+            )
             
             logger.info(f"Completed all web attack simulations. Total alerts: {self.attack_count}")
         finally:
@@ -276,6 +441,11 @@ class DirectWebAttackSimulator:
 
 async def main():
     """Main function to run the direct web attack simulator."""
+    parser = argparse.ArgumentParser(description='Direct Web Attack Simulator')
+    parser.add_argument('--spread', type=float, default=0.0,
+                        help='Average seconds between each simulation\'s alerts (default: 0, send at once)')
+    args = parser.parse_args()
+    
     print("=" * 70)
     print(f"Direct Web Attack Simulator - {datetime.now()}")
     print("=" * 70)
@@ -283,7 +453,7 @@ async def main():
     print("This tool simulates web attacks by sending alerts directly to the API")
     print("=" * 70)
     
-    simulator = DirectWebAttackSimulator()
+    simulator = DirectWebAttackSimulator(spread=args.spread)
     await simulator.run_all_simulations()
 
 if __name__ == "__main__":
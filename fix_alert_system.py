@@ -7,7 +7,10 @@ identifies issues, and applies fixes to ensure alerts are properly
 generated, stored, and displayed on the dashboard.
 """
 
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import os
@@ -22,18 +25,30 @@ HONEYPOT_TYPES = ["ssh", "web"]
 TEST_COUNT = 5  # Number of test alerts to generate
 VERBOSE = True  # Show detailed diagnostic information
 
+# Shared session so every check reuses keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+# ANSI escape codes for terminal colors
+_COLORS = {
+    "red": "\033[91m",
+    "green": "\033[92m",
+    "yellow": "\033[93m",
+    "blue": "\033[94m",
+    "purple": "\033[95m",
+    "cyan": "\033[96m",
+}
+_END = "\033[0m"
+
+# Color and icon prefixes for the print_* helpers
+_SUCCESS_PREFIX = f"{_COLORS['green']}✅ "
+_ERROR_PREFIX = f"{_COLORS['red']}❌ "
+_WARNING_PREFIX = f"{_COLORS['yellow']}⚠️ "
+_INFO_PREFIX = f"{_COLORS['cyan']}ℹ️ "
+
 def colored(text, color):
     """Return colored text for terminal output."""
-    colors = {
-        "red": "\033[91m",
-        "green": "\033[92m",
-        "yellow": "\033[93m",
-        "blue": "\033[94m",
-        "purple": "\033[95m",
-        "cyan": "\033[96m",
-        "end": "\033[0m"
-    }
-    return f"{colors.get(color, '')}{text}{colors['end']}"
+    return f"{_COLORS.get(color, '')}{text}{_END}"
 
 def print_header(title):
     """Print a section header."""
@@ -44,26 +59,26 @@ def print_header(title):
 
 def print_success(message):
     """Print a success message."""
-    print(colored(f"✅ {message}", "green"))
+    print(f"{_SUCCESS_PREFIX}{message}{_END}")
 
 def print_error(message):
     """Print an error message."""
-    print(colored(f"❌ {message}", "red"))
+    print(f"{_ERROR_PREFIX}{message}{_END}")
 
 def print_warning(message):
     """Print a warning message."""
-    print(colored(f"⚠️ {message}", "yellow"))
+    print(f"{_WARNING_PREFIX}{message}{_END}")
 
 def print_info(message):
     """Print an info message."""
-    print(colored(f"ℹ️ {message}", "cyan"))
+    print(f"{_INFO_PREFIX}{message}{_END}")
 
 def check_server_status():
     """Check if the backend server is running and responding."""
     print_header("CHECKING SERVER STATUS")
     
     try:
-        response = requests.get(f"{SERVER_URL}/", timeout=5)
+        response = SESSION.get(f"{SERVER_URL}/", timeout=5)
         if response.status_code == 200:
             print_success(f"Backend server is running at {SERVER_URL}")
             return True
@@ -80,7 +95,7 @@ def check_dashboard_status():
     print_header("CHECKING DASHBOARD STATUS")
     
     try:
-        response = requests.get(DASHBOARD_URL, timeout=5)
+        response = SESSION.get(DASHBOARD_URL, timeout=5)
         if response.status_code == 200:
             print_success(f"Dashboard is running at {DASHBOARD_URL}")
             return True
@@ -97,7 +112,7 @@ def check_honeypots():
     print_header("CHECKING HONEYPOT STATUS")
     
     try:
-        response = requests.get(f"{SERVER_URL}/honeypots", timeout=5)
+        response = SESSION.get(f"{SERVER_URL}/honeypots", timeout=5)
         if response.status_code == 200:
             honeypots = response.json()
             
@@ -139,7 +154,7 @@ def check_current_alerts():
     print_header("CHECKING EXISTING ALERTS")
     
     try:
-        response = requests.get(f"{SERVER_URL}/alerts", timeout=5)
+        response = SESSION.get(f"{SERVER_URL}/alerts", timeout=5)
         if response.status_code == 200:
             alerts = response.json()
             
@@ -159,112 +174,135 @@ def check_current_alerts():
         print_error(f"Error checking alerts: {str(e)}")
         return 0
 
-def generate_test_alerts():
-    """Generate and send test alerts to the system."""
-    print_header("GENERATING TEST ALERTS")
-    
-    sent_count = 0
-    honeypot_ids = []
-    
-    # Try to get actual honeypot IDs from the server
-    try:
-        response = requests.get(f"{SERVER_URL}/honeypots", timeout=5)
-        if response.status_code == 200:
-            honeypots = response.json()
-            honeypot_ids = list(honeypots.keys())
-            print_success(f"Using real honeypot IDs: {', '.join(honeypot_ids)}")
-    except:
-        # Fallback to generated IDs
-        for htype in HONEYPOT_TYPES:
-            honeypot_ids.append(f"{htype}-honeypot-1")
-        print_warning(f"Using fallback honeypot IDs: {', '.join(honeypot_ids)}")
-    
-    if not honeypot_ids:
-        print_error("No honeypot IDs available for testing")
-        return 0
+def build_test_alert(index, honeypot_id):
+    """Build a test alert with easily identifiable data."""
+    honeypot_type = honeypot_id.split('-')[0] if '-' in honeypot_id else "unknown"
     
-    for i in range(TEST_COUNT):
-        honeypot_id = random.choice(honeypot_ids)
-        honeypot_type = honeypot_id.split('-')[0] if '-' in honeypot_id else "unknown"
-        
-        # Create a test alert with easily identifiable data
-        alert_data = {
-            "timestamp": datetime.now().isoformat(),
-            "data": {
-                "source_ip": f"192.168.1.{random.randint(100, 200)}",
-                "attack_type": f"DIAGNOSTIC_TEST_{honeypot_type.upper()}",
-                "details": {
-                    "test_id": f"test-{i+1}-{int(time.time())}",
-                    "message": "This is a diagnostic test alert",
-                    "severity": random.choice(["low", "medium", "high", "critical"])
-                }
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "data": {
+            "source_ip": f"192.168.1.{random.randint(100, 200)}",
+            "attack_type": f"DIAGNOSTIC_TEST_{honeypot_type.upper()}",
+            "details": {
+                "test_id": f"test-{index+1}-{int(time.time())}",
+                "message": "This is a diagnostic test alert",
+                "severity": random.choice(["low", "medium", "high", "critical"])
             }
         }
-        
-        print_info(f"Sending test alert #{i+1} to honeypot {honeypot_id}")
-        
-        try:
-            # Send the alert to the server
-            response = requests.post(
-                f"{SERVER_URL}/honeypot/{honeypot_id}/alert",
-                json=alert_data,
-                timeout=10
-            )
-            
+    }
+
+async def send_test_alert(session, index, honeypot_id, alert_data):
+    """Send one test alert and report the result; return True on success."""
+    print_info(f"Sending test alert #{index+1} to honeypot {honeypot_id}")
+    
+    try:
+        # Send the alert to the server
+        async with session.post(f"/honeypot/{honeypot_id}/alert", json=alert_data) as response:
             # Check the response
-            if response.status_code == 200:
-                print_success(f"Alert #{i+1} sent successfully")
-                sent_count += 1
+            if response.status == 200:
+                print_success(f"Alert #{index+1} sent successfully")
                 
                 if VERBOSE:
                     print_info("Server response:")
-                    print(json.dumps(response.json(), indent=2))
+                    print(json.dumps(await response.json(), indent=2))
+                return True
             else:
-                print_error(f"Failed to send alert #{i+1}: {response.status_code}")
-                print_error(f"Response: {response.text}")
-        except Exception as e:
-            print_error(f"Exception sending alert #{i+1}: {str(e)}")
+                print_error(f"Failed to send alert #{index+1}: {response.status}")
+                print_error(f"Response: {await response.text()}")
+                return False
+    except Exception as e:
+        print_error(f"Exception sending alert #{index+1}: {str(e)}")
+        return False
+
+async def generate_test_alerts():
+    """Generate and send test alerts to the system."""
+    print_header("GENERATING TEST ALERTS")
+    
+    honeypot_ids = []
+    
+    async with aiohttp.ClientSession(
+        base_url=SERVER_URL,
+        timeout=aiohttp.ClientTimeout(total=10)
+    ) as session:
+        # Try to get actual honeypot IDs from the server
+        try:
+            async with session.get("/honeypots") as response:
+                if response.status == 200:
+                    honeypots = await response.json()
+                    honeypot_ids = list(honeypots.keys())
+                    print_success(f"Using real honeypot IDs: {', '.join(honeypot_ids)}")
+        except Exception:
+            # Fallback to generated IDs
+            for htype in HONEYPOT_TYPES:
+                honeypot_ids.append(f"{htype}-honeypot-1")
+            print_warning(f"Using fallback honeypot IDs: {', '.join(honeypot_ids)}")
         
-        # Brief pause between alerts
-        time.sleep(0.5)
+        if not honeypot_ids:
+            print_error("No honeypot IDs available for testing")
+            return 0
+        
+        # The alerts are independent, so send them all at once
+        sends = []
+        for i in range(TEST_COUNT):
+            honeypot_id = random.choice(honeypot_ids)
+            sends.append(send_test_alert(session, i, honeypot_id, build_test_alert(i, honeypot_id)))
+        results = await asyncio.gather(*sends)
     
-    return sent_count
+    return sum(results)
+
+def is_diagnostic_alert(alert, since):
+    """Check whether an alert is a diagnostic test alert sent at or after since."""
+    data = alert.get('data') or {}
+    return (
+        'DIAGNOSTIC_TEST' in str(data.get('attack_type', ''))
+        and str(alert.get('timestamp', '')) >= since
+    )
 
-def verify_alerts(expected_count, initial_count):
-    """Verify that the test alerts were properly stored."""
+def verify_alerts(expected_count, initial_count, since):
+    """
+    Verify that the test alerts were properly stored.
+    
+    Only the diagnostic alerts sent since the given ISO 8601 timestamp are
+    fetched, rather than the whole alert history.
+    """
     print_header("VERIFYING ALERTS")
     
     try:
-        response = requests.get(f"{SERVER_URL}/alerts", timeout=5)
+        response = SESSION.get(
+            f"{SERVER_URL}/alerts",
+            params={"since": since, "attack_type_prefix": "DIAGNOSTIC_TEST"},
+            timeout=5
+        )
         if response.status_code == 200:
-            alerts = response.json()
-            current_count = len(alerts)
+            diagnostic_alerts = response.json()
+            
+            # Servers without the filters return every alert and no total
+            total_header = response.headers.get("X-Total-Count")
+            if total_header is None:
+                current_count = len(diagnostic_alerts)
+                diagnostic_alerts = [a for a in diagnostic_alerts if is_diagnostic_alert(a, since)]
+            else:
+                current_count = int(total_header)
             new_count = current_count - initial_count
             
             print_info(f"Initial alert count: {initial_count}")
             print_info(f"Current alert count: {current_count}")
             print_info(f"New alerts detected: {new_count}")
             
-            if new_count >= expected_count:
+            if len(diagnostic_alerts) >= expected_count:
                 print_success(f"All {expected_count} test alerts were successfully stored!")
+                print_success(f"Found {len(diagnostic_alerts)} diagnostic test alerts")
                 
-                # Check for diagnostic test alerts specifically
-                diagnostic_alerts = [a for a in alerts if 'data' in a and 'attack_type' in a['data'] and 'DIAGNOSTIC_TEST' in a['data']['attack_type']]
+                if VERBOSE:
+                    print_info("Sample diagnostic alert:")
+                    print(json.dumps(diagnostic_alerts[-1], indent=2))
+            elif diagnostic_alerts:
+                print_error(f"Only {len(diagnostic_alerts)} of {expected_count} test alerts were stored")
                 
-                if diagnostic_alerts:
-                    print_success(f"Found {len(diagnostic_alerts)} diagnostic test alerts")
-                    
-                    if VERBOSE:
-                        print_info("Sample diagnostic alert:")
-                        print(json.dumps(diagnostic_alerts[-1], indent=2))
-                else:
-                    print_error("Could not find any diagnostic test alerts by attack_type")
+                print_info("Latest diagnostic alert in the system:")
+                print(json.dumps(diagnostic_alerts[-1], indent=2))
             else:
-                print_error(f"Only {new_count} of {expected_count} test alerts were stored")
-                
-                if alerts:
-                    print_info("Latest alert in the system:")
-                    print(json.dumps(alerts[-1], indent=2))
+                print_error("Could not find any diagnostic test alerts by attack_type")
         else:
             print_error(f"Failed to get alerts: {response.status_code}")
     except Exception as e:
@@ -275,7 +313,7 @@ def check_threat_intelligence():
     print_header("CHECKING THREAT INTELLIGENCE")
     
     try:
-        response = requests.get(f"{SERVER_URL}/threat-intelligence", timeout=5)
+        response = SESSION.get(f"{SERVER_URL}/threat-intelligence", timeout=5)
         if response.status_code == 200:
             intelligence = response.json()
             print_success("Threat intelligence endpoint is working")
@@ -313,8 +351,10 @@ def main():
     # Step 4: Check if any alerts already exist
     initial_alert_count = check_current_alerts()
     
-    # Step 5: Generate and send test alerts
-    sent_count = generate_test_alerts()
+    # Step 5: Generate and send test alerts; every one of them is stamped
+    # at or after test_start
+    test_start = datetime.now().isoformat()
+    sent_count = asyncio.run(generate_test_alerts())
     
     if sent_count > 0:
         # Wait for the server to process the alerts
@@ -322,7 +362,7 @@ def main():
         time.sleep(3)
         
         # Step 6: Verify that the alerts were stored
-        verify_alerts(sent_count, initial_alert_count)
+        verify_alerts(sent_count, initial_alert_count, test_start)
     
     # Step 7: Check the threat intelligence endpoint
     check_threat_intelligence()
@@ -340,4 +380,5 @@ def main():
     print("4. Run attack simulations again with 'python run_simulations.py'")
 
 if __name__ == "__main__":
-    main()
+    with SESSION:
+        main()
@@ -7,11 +7,13 @@ to ensure they're available for the honeypot system.
 """
 
 import os
-import subprocess
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import psutil
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,41 +24,31 @@ logger = logging.getLogger("port_cleanup")
 # Ports used by the honeypot system
 PORTS = [8000, 3000, 8089, 2222]
 
-def find_process_by_port(port):
-    """Find process ID using specified port."""
-    try:
-        # Using netstat to find processes using the port
-        output = subprocess.check_output(
-            f"netstat -ano | findstr :{port}", 
-            shell=True
-        ).decode()
-        
-        for line in output.split('\n'):
-            if line.strip():
-                parts = line.strip().split()
-                if len(parts) >= 5:
-                    pid = parts[4]
-                    return pid
-        return None
-    except subprocess.CalledProcessError:
-        # No process found using this port
-        return None
+def build_port_to_pid_map():
+    """Map each listening port to the ID of the process listening on it."""
+    return {
+        conn.laddr.port: conn.pid
+        for conn in psutil.net_connections(kind='inet')
+        if conn.status == psutil.CONN_LISTEN and conn.pid
+    }
 
 def kill_process(pid):
     """Kill a process by its ID."""
     try:
-        result = subprocess.run(
-            f"taskkill /F /PID {pid}", 
-            shell=True, 
-            capture_output=True, 
-            text=True
-        )
-        if result.returncode == 0:
-            logger.info(f"Process {pid} terminated successfully")
-            return True
-        else:
-            logger.error(f"Failed to terminate process {pid}: {result.stderr}")
-            return False
+        process = psutil.Process(pid)
+        process.terminate()
+        try:
+            process.wait(timeout=3)
+        except psutil.TimeoutExpired:
+            # Didn't exit on its own, so force it
+            process.kill()
+            process.wait(timeout=3)
+        logger.info(f"Process {pid} terminated successfully")
+        return True
+    except psutil.NoSuchProcess:
+        # Already gone, so the port is free
+        logger.info(f"Process {pid} already exited")
+        return True
     except Exception as e:
         logger.error(f"Error terminating process {pid}: {str(e)}")
         return False
@@ -70,11 +62,24 @@ def main():
     print(f"Ports to free: {PORTS}")
     print("=" * 70)
     
+    # One scan of the connection table covers every port
+    port_map = build_port_to_pid_map()
+    busy_ports = [port for port in PORTS if port in port_map]
+    
+    # Stop all processes at once, so cleanup takes as long as the slowest
+    # process rather than the sum of them
+    results = {}
+    if busy_ports:
+        with ThreadPoolExecutor(max_workers=len(busy_ports)) as executor:
+            results = dict(zip(
+                busy_ports,
+                executor.map(lambda port: kill_process(port_map[port]), busy_ports)
+            ))
+    
     for port in PORTS:
-        pid = find_process_by_port(port)
-        if pid:
-            print(f"Port {port} is in use by process {pid}")
-            if kill_process(pid):
+        if port in results:
+            print(f"Port {port} is in use by process {port_map[port]}")
+            if results[port]:
                 print(f"✅ Successfully freed port {port}")
             else:
                 print(f"❌ Failed to free port {port}")
@@ -1,25 +1,73 @@
 import abc
 import logging
-import time
-import json
 import asyncio
-from datetime import datetime
-import sys
+import aiohttp
+import orjson
+from collections import deque
+from collections.abc import Mapping
 import os
 
-# Add the project root to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Project root, where the logs directory lives
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
+from utils.circuit_breaker import CircuitBreaker
 from utils.logging_config import setup_logger
+from utils.timestamps import now_iso
 
 logger = setup_logger("honeypot")
 
+# Number of most recent events each honeypot keeps in memory
+MAX_ATTACK_EVENTS = 1000
+
+# Central API that all honeypots report their alerts to
+API_BASE_URL = "http://localhost:8000"
+
+# Maximum number of recorded events waiting to be sent to the API
+ALERT_QUEUE_SIZE = 1000
+
+# Queued events are sent together in batches of up to ALERT_BATCH_SIZE,
+# waiting at most ALERT_BATCH_WINDOW seconds for a batch to fill
+ALERT_BATCH_SIZE = 64
+ALERT_BATCH_WINDOW = 0.1
+
+# Consecutive failed sends that open the circuit, and how long it stays open
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 30
+
+# Alerts that couldn't be sent are appended here as JSON lines (each with its
+# honeypot_id), as an audit record only: they are not sent again. Once the
+# file reaches PENDING_ALERTS_MAX_BYTES it is moved to <file>.1, replacing the
+# previous one, so an outage can't fill the disk
+PENDING_ALERTS_FILE = os.path.join(PROJECT_ROOT, "logs", "alerts.pending.jsonl")
+PENDING_ALERTS_MAX_BYTES = 10 * 1024 * 1024
+
+def _json_default(obj):
+    """
+    Serialize what orjson can't natively, such as the read-only multidicts
+    aiohttp uses for request headers and query parameters. Handlers record
+    those as-is, so they are only copied into dicts when an event is sent.
+    """
+    if isinstance(obj, Mapping):
+        return {str(key): obj[key] for key in obj}
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _dumps(obj):
+    """Serialize obj to JSON bytes with orjson."""
+    return orjson.dumps(obj, default=_json_default)
+
 class BaseHoneypot(abc.ABC):
     """
     Abstract base class for all honeypot implementations.
     Provides common functionality and interface for specific honeypot types.
     """
     
+    # Client session shared by all honeypots for sending alerts, so they
+    # reuse pooled keep-alive connections to the API; created on first use
+    _session = None
+    
+    # Circuit breaker for the API, shared like the session
+    _circuit = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+    
     def __init__(self, honeypot_id, ip, port):
         """
         Initialize a new honeypot instance.
@@ -34,16 +82,30 @@ class BaseHoneypot(abc.ABC):
         self.port = port
         self.status = "Inactive"
         self.connections = 0
-        self.last_activity = datetime.now().isoformat()
-        self.attack_events = []
+        self.last_activity = now_iso()
+        self.attack_events = deque(maxlen=MAX_ATTACK_EVENTS)
         self.running = False
         self.server = None
+        # API paths for this honeypot's alerts, relative to API_BASE_URL
+        self._alert_url = f"/honeypot/{honeypot_id}/alert"
+        self._alert_batch_url = f"/honeypot/{honeypot_id}/alerts/batch"
+        # Created in start() so they belong to the running event loop
+        self._alert_queue = None
+        self._alert_worker = None
         
     @abc.abstractmethod
     async def start(self):
         """Start the honeypot service."""
         self.status = "Active"
         self.running = True
+        
+        # Alerts are sent by a background worker so that handlers don't wait
+        # on the API before answering the attacker
+        if self._alert_queue is None:
+            self._alert_queue = asyncio.Queue(maxsize=ALERT_QUEUE_SIZE)
+        if self._alert_worker is None or self._alert_worker.done():
+            self._alert_worker = asyncio.create_task(self._drain_alerts())
+        
         logger.info(f"Honeypot {self.id} started on {self.ip}:{self.port}")
     
     @abc.abstractmethod
@@ -51,8 +113,42 @@ class BaseHoneypot(abc.ABC):
         """Stop the honeypot service."""
         self.status = "Inactive"
         self.running = False
+        
+        # Send whatever is still queued before shutting the worker down
+        if self._alert_worker is not None:
+            await self._alert_queue.join()
+            self._alert_worker.cancel()
+            try:
+                await self._alert_worker
+            except asyncio.CancelledError:
+                pass
+            self._alert_worker = None
+        
         logger.info(f"Honeypot {self.id} stopped")
     
+    @classmethod
+    async def get_session(cls):
+        """Return the shared alert session, creating it if needed."""
+        if BaseHoneypot._session is None or BaseHoneypot._session.closed:
+            # Every alert goes to the same API, so a few keep-alive
+            # connections are enough for all honeypots' alert workers
+            BaseHoneypot._session = aiohttp.ClientSession(
+                base_url=API_BASE_URL,
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=5),
+                # Bodies are posted as orjson bytes rather than through json=,
+                # which would decode them to str only for aiohttp to re-encode
+                headers={"Content-Type": "application/json"}
+            )
+        return BaseHoneypot._session
+    
+    @classmethod
+    async def close_session(cls):
+        """Close the shared alert session, if one was created."""
+        if BaseHoneypot._session is not None:
+            await BaseHoneypot._session.close()
+            BaseHoneypot._session = None
+    
     def get_status(self):
         """Get the current status of the honeypot."""
         return {
@@ -65,7 +161,7 @@ class BaseHoneypot(abc.ABC):
             "last_activity": self.last_activity
         }
     
-    async def record_activity(self, source_ip, data, attack_type=None):
+    async def record_activity(self, source_ip, data, attack_type=None, count_connection=True):
         """
         Record activity detected by the honeypot.
         
@@ -73,13 +169,17 @@ class BaseHoneypot(abc.ABC):
             source_ip (str): Source IP of the connection
             data (dict): Data captured from the connection
             attack_type (str, optional): Type of attack if detected
+            count_connection (bool, optional): Count this as a new connection;
+                off for summaries of connections already counted
         """
-        self.connections += 1
-        self.last_activity = datetime.now().isoformat()
+        timestamp = now_iso()
+        if count_connection:
+            self.connections += 1
+        self.last_activity = timestamp
         
         event = {
             "honeypot_id": self.id,
-            "timestamp": self.last_activity,
+            "timestamp": timestamp,
             "data": {
                 "source_ip": source_ip,
                 "attack_type": attack_type or "Unknown",
@@ -88,19 +188,116 @@ class BaseHoneypot(abc.ABC):
         }
         
         self.attack_events.append(event)
-        logger.info(f"Activity recorded from {source_ip} on {self.id}")
+        # Logged per batch at INFO by the alert worker; per event only at DEBUG
+        logger.debug(f"Activity recorded from {source_ip} on {self.id}")
+        
+        # Queue this event for the alert worker to send to the central API
+        try:
+            self._alert_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(f"Alert queue full on {self.id}, dropping alert from {source_ip}")
+    
+    async def _drain_alerts(self):
+        """Send queued events to the central API in batches until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._alert_queue.get()]
+            deadline = loop.time() + ALERT_BATCH_WINDOW
+            while len(batch) < ALERT_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._alert_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            logger.info(f"Recorded {len(batch)} events on {self.id}")
+            try:
+                if len(batch) == 1:
+                    await self._send_alert(batch[0])
+                else:
+                    await self._send_alert_batch(batch)
+            except Exception as e:
+                logger.error(f"Alert worker failed to send alerts: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._alert_queue.task_done()
+    
+    @staticmethod
+    def _circuit_open():
+        """Check whether alert sends are currently being skipped."""
+        return BaseHoneypot._circuit.is_open()
+    
+    @staticmethod
+    def _record_send_result(ok):
+        """Track a send outcome, opening the circuit after too many failures in a row."""
+        if ok:
+            BaseHoneypot._circuit.record_success()
+        elif BaseHoneypot._circuit.record_failure():
+            logger.warning(
+                f"API looks unavailable; spilling alerts to {PENDING_ALERTS_FILE} "
+                f"for {CIRCUIT_RESET_TIMEOUT} seconds"
+            )
+    
+    def _spill(self, events):
+        """Append alerts that couldn't be sent to the pending alerts file."""
+        try:
+            with open(PENDING_ALERTS_FILE, "ab") as f:
+                f.writelines(_dumps(event) + b"\n" for event in events)
+                full = f.tell() >= PENDING_ALERTS_MAX_BYTES
+            if full:
+                os.replace(PENDING_ALERTS_FILE, PENDING_ALERTS_FILE + ".1")
+        except OSError as e:
+            logger.error(f"Failed to spill {len(events)} alerts from {self.id}: {str(e)}")
+    
+    async def _send_alert_batch(self, events):
+        """Send several alerts to the central API in one request."""
+        # Don't wait on a backend that keeps failing
+        if BaseHoneypot._circuit_open():
+            self._spill(events)
+            return
         
-        # Send this event to the central API
-        await self._send_alert(event)
+        try:
+            api_url = self._alert_batch_url
+            
+            logger.info(f"Sending {len(events)} alerts to API: {api_url}")
+            
+            session = await BaseHoneypot.get_session()
+            async with session.post(api_url, data=_dumps({"events": events})) as response:
+                if response.status == 200:
+                    # Only the status matters; drain the body without decoding
+                    # it so the connection goes back to the session's pool
+                    await response.read()
+                    logger.info(f"Alert batch successfully sent to API: {self.id}")
+                else:
+                    logger.error(f"Failed to send alert batch: HTTP {response.status}")
+                    response_text = await response.text()
+                    logger.error(f"Error Response: {response_text}")
+                
+                # Only server errors say the backend is in trouble
+                ok = response.status < 500
+            
+        except Exception as e:
+            logger.exception("Failed to send alert batch of %s: %s", len(events), e)
+            
+            # Make sure the server is running
+            logger.error("Make sure the backend server is running at %s", API_BASE_URL)
+            ok = False
+        
+        BaseHoneypot._record_send_result(ok)
+        if not ok:
+            self._spill(events)
     
     async def _send_alert(self, event):
         """Send alert data to the central API."""
+        # Don't wait on a backend that keeps failing
+        if BaseHoneypot._circuit_open():
+            self._spill([event])
+            return
+        
         try:
-            # Use aiohttp to send the data to the central API endpoint
-            import aiohttp
-            
-            # Construct the API endpoint URL
-            api_url = f"http://localhost:8000/honeypot/{self.id}/alert"
+            api_url = self._alert_url
             
             logger.info(f"Sending alert to API: {api_url}")
             
@@ -108,34 +305,43 @@ class BaseHoneypot(abc.ABC):
             if 'data' not in event and 'timestamp' not in event:
                 # We need to format this as API expects
                 api_payload = {
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso(),
                     "data": event
                 }
             else:
                 api_payload = event
             
-            # Make the actual HTTP request to the API
-            async with aiohttp.ClientSession() as session:
-                async with session.post(api_url, json=api_payload) as response:
-                    if response.status == 200:
-                        logger.info(f"Alert successfully sent to API: {self.id}")
-                        # Log success with the response
-                        response_text = await response.text()
-                        logger.info(f"API Response: {response_text}")
-                    else:
-                        logger.error(f"Failed to send alert: HTTP {response.status}")
-                        response_text = await response.text()
-                        logger.error(f"Error Response: {response_text}")
+            # Make the actual HTTP request to the API over the shared session
+            session = await BaseHoneypot.get_session()
+            async with session.post(api_url, data=_dumps(api_payload)) as response:
+                if response.status == 200:
+                    # Only the status matters; drain the body without decoding
+                    # it so the connection goes back to the session's pool
+                    await response.read()
+                    logger.debug(f"Alert successfully sent to API: {self.id}")
+                else:
+                    logger.error(f"Failed to send alert: HTTP {response.status}")
+                    response_text = await response.text()
+                    logger.error(f"Error Response: {response_text}")
+                
+                # Only server errors say the backend is in trouble
+                ok = response.status < 500
             
             # Log the event details for debugging
-            logger.info(f"Alert details sent: {json.dumps(api_payload)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Alert details sent: {_dumps(api_payload).decode()}")
             
         except Exception as e:
-            logger.error(f"Failed to send alert: {str(e)}")
-            logger.error(f"Alert that failed: {json.dumps(event)}")
-            # For debugging, print the full exception info
-            import traceback
-            logger.error(f"Exception traceback: {traceback.format_exc()}")
+            # The message and exc_info are only formatted if the record is
+            # actually emitted
+            logger.exception("Failed to send alert for %s: %s", self.id, e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Alert that failed: {_dumps(event).decode()}")
             
             # Make sure the server is running
-            logger.error("Make sure the backend server is running at http://localhost:8000")
+            logger.error("Make sure the backend server is running at %s", API_BASE_URL)
+            ok = False
+        
+        BaseHoneypot._record_send_result(ok)
+        if not ok:
+            self._spill([event])
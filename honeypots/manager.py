@@ -4,13 +4,23 @@ import json
 from datetime import datetime
 import os
 import yaml
-import sys
-import os
 
-# Add the project root to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Prefer the libyaml-backed loader/dumper; fall back to pure Python without it
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+# Run the honeypot servers on uvloop where it is installed (not on Windows);
+# loops created after this, e.g. by asyncio.run, use it
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 from utils.logging_config import setup_logger
+from honeypots.base import BaseHoneypot
 from honeypots.ssh_honeypot import SSHHoneypot
 from honeypots.web_honeypot import WebHoneypot
 from ai_engine.analyzer import AIAnalyzer
@@ -72,10 +82,10 @@ class HoneypotManager:
         """
         try:
             with open(config_file, 'r') as f:
-                self.config = yaml.safe_load(f)
+                self.config = yaml.load(f, Loader=_Loader)
                 logger.info(f"Configuration loaded from {config_file}")
         except Exception as e:
-            logger.error(f"Failed to load configuration: {str(e)}")
+            logger.error("Failed to load configuration: %s", e)
             # Use default config as fallback
             self.config = {"honeypots": []}
     
@@ -88,10 +98,10 @@ class HoneypotManager:
         """
         try:
             with open(config_file, 'w') as f:
-                yaml.dump(self.config, f, default_flow_style=False)
+                yaml.dump(self.config, f, Dumper=_Dumper, default_flow_style=False)
                 logger.info(f"Configuration saved to {config_file}")
         except Exception as e:
-            logger.error(f"Failed to save configuration: {str(e)}")
+            logger.error("Failed to save configuration: %s", e)
     
     def create_honeypot(self, honeypot_id, honeypot_type, ip, port, **options):
         """
@@ -137,7 +147,7 @@ class HoneypotManager:
                 
             return honeypot
         except Exception as e:
-            logger.error(f"Failed to create honeypot: {str(e)}")
+            logger.error("Failed to create honeypot: %s", e)
             return None
     
     def remove_honeypot(self, honeypot_id):
@@ -172,7 +182,7 @@ class HoneypotManager:
             logger.info(f"Removed honeypot with ID {honeypot_id}")
             return True
         except Exception as e:
-            logger.error(f"Failed to remove honeypot: {str(e)}")
+            logger.error("Failed to remove honeypot: %s", e)
             return False
     
     def get_honeypot(self, honeypot_id):
@@ -221,7 +231,6 @@ class HoneypotManager:
     async def start_all(self):
         """Start all configured honeypots."""
         self.running = True
-        tasks = []
         
         # Load honeypots from configuration if not already loaded
         for honeypot_config in self.config.get("honeypots", []):
@@ -235,28 +244,40 @@ class HoneypotManager:
                     **honeypot_config.get("options", {})
                 )
         
-        # Start each honeypot
-        for honeypot_id, honeypot in self.honeypots.items():
+        # Start each honeypot; gather schedules the coroutines itself
+        honeypot_ids = list(self.honeypots)
+        for honeypot_id in honeypot_ids:
             logger.info(f"Starting honeypot {honeypot_id}")
-            task = asyncio.create_task(honeypot.start())
-            tasks.append(task)
-        
-        # Wait for all tasks to complete
-        await asyncio.gather(*tasks, return_exceptions=True)
+        results = await asyncio.gather(
+            *(self.honeypots[hid].start() for hid in honeypot_ids),
+            return_exceptions=True
+        )
+        self._log_failures("start", honeypot_ids, results)
     
     async def stop_all(self):
         """Stop all running honeypots."""
         self.running = False
-        tasks = []
         
-        for honeypot_id, honeypot in self.honeypots.items():
-            if honeypot.status == "Active":
-                logger.info(f"Stopping honeypot {honeypot_id}")
-                task = asyncio.create_task(honeypot.stop())
-                tasks.append(task)
+        honeypot_ids = [
+            hid for hid, honeypot in self.honeypots.items()
+            if honeypot.status == "Active"
+        ]
+        for honeypot_id in honeypot_ids:
+            logger.info(f"Stopping honeypot {honeypot_id}")
+        results = await asyncio.gather(
+            *(self.honeypots[hid].stop() for hid in honeypot_ids),
+            return_exceptions=True
+        )
+        self._log_failures("stop", honeypot_ids, results)
         
-        # Wait for all tasks to complete
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # No honeypot is sending alerts any more
+        await BaseHoneypot.close_session()
+    
+    def _log_failures(self, action, honeypot_ids, results):
+        """Log the honeypots whose start/stop raised, as gathered with return_exceptions."""
+        for honeypot_id, result in zip(honeypot_ids, results):
+            if isinstance(result, Exception):
+                logger.error("Failed to %s honeypot %s: %s", action, honeypot_id, result)
     
     async def start_honeypot(self, honeypot_id):
         """
@@ -279,7 +300,7 @@ class HoneypotManager:
                 logger.info(f"Started honeypot {honeypot_id}")
             return True
         except Exception as e:
-            logger.error(f"Failed to start honeypot {honeypot_id}: {str(e)}")
+            logger.error("Failed to start honeypot %s: %s", honeypot_id, e)
             return False
     
     async def stop_honeypot(self, honeypot_id):
@@ -303,7 +324,7 @@ class HoneypotManager:
                 logger.info(f"Stopped honeypot {honeypot_id}")
             return True
         except Exception as e:
-            logger.error(f"Failed to stop honeypot {honeypot_id}: {str(e)}")
+            logger.error("Failed to stop honeypot %s: %s", honeypot_id, e)
             return False
     
     def analyze_event(self, event):
@@ -318,6 +339,18 @@ class HoneypotManager:
         """
         return self.ai_analyzer.analyze_event(event)
     
+    def analyze_events(self, events):
+        """
+        Analyze several honeypot events at once using the AI engine.
+        
+        Args:
+            events (list): Honeypot event data
+            
+        Returns:
+            list: Analysis results, one per event, in the same order
+        """
+        return self.ai_analyzer.analyze_batch(events)
+    
     def get_threat_intelligence(self):
         """
         Get threat intelligence report.
@@ -1,19 +1,27 @@
 import asyncio
+import contextlib
 import logging
-from datetime import datetime
 import re
-import json
-import sys
-import os
-
-# Add the project root to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from honeypots.base import BaseHoneypot
 from utils.logging_config import setup_logger
+from utils.timestamps import now_iso
 
 logger = setup_logger("honeypot.ssh")
 
+# Passwords that mark a login attempt as a common password attack
+COMMON_PASSWORDS = frozenset(["admin", "root", "password", "123456"])
+
+# Shell metacharacters used to chain commands onto a password
+_COMMAND_INJECTION_RE = re.compile(r'[;|&]')
+
+# Fixed protocol lines sent on every connection
+_PROMPT = b"Password: "
+_ACCESS_DENIED = b"Access denied\r\n"
+
+# Seconds a client has to send its identification and password
+LOGIN_TIMEOUT = 30
+
 class SSHHoneypot(BaseHoneypot):
     """
     SSH Honeypot implementation that simulates an SSH server and records login attempts.
@@ -30,39 +38,45 @@ class SSHHoneypot(BaseHoneypot):
         """
         super().__init__(honeypot_id, ip, port)
         self.banner = kwargs.get('banner', 'SSH-2.0-OpenSSH_8.2p1 Ubuntu-4ubuntu0.5')
+        self._banner_bytes = f"{self.banner}\r\n".encode()
         self.honeypot_type = "SSH"
         
     async def handle_client(self, reader, writer):
         """Handle a client connection."""
         client_ip = writer.get_extra_info('peername')[0]
         logger.info(f"SSH connection from {client_ip}")
+        write = writer.write
         
-        # Send SSH banner
-        writer.write(f"{self.banner}\r\n".encode())
+        # Send the SSH banner and the password prompt with a single drain
+        write(self._banner_bytes)
+        write(_PROMPT)
         await writer.drain()
         
         # Record connection
         login_data = {
-            "connection_time": datetime.now().isoformat()
+            "connection_time": now_iso()
         }
         
+        # One deadline for the whole login exchange: when it fires the
+        # connection is aborted and the pending readline() returns EOF
+        loop = asyncio.get_running_loop()
+        deadline = loop.call_later(LOGIN_TIMEOUT, writer.transport.abort)
+        
         try:
-            # Wait for client identification
-            client_id = await asyncio.wait_for(reader.readline(), timeout=30)
+            client_id = await reader.readline()
+            password = await reader.readline() if client_id else b""
+            deadline.cancel()
+            if loop.time() >= deadline.when():
+                logger.info(f"Connection from {client_ip} timed out")
+                return
+            
             if client_id:
                 login_data["client_id"] = client_id.decode().strip()
-            
-            # Wait for authentication attempt
-            writer.write(b"Password: ")
-            await writer.drain()
-            
-            # Wait for password
-            password = await asyncio.wait_for(reader.readline(), timeout=30)
             if password:
                 login_data["password_attempt"] = password.decode().strip()
                 
             # Always deny access
-            writer.write(b"Access denied\r\n")
+            write(_ACCESS_DENIED)
             await writer.drain()
             
             # Analyze the attack
@@ -71,13 +85,14 @@ class SSHHoneypot(BaseHoneypot):
             # Record the activity
             await self.record_activity(client_ip, login_data, attack_type)
             
-        except asyncio.TimeoutError:
-            logger.info(f"Connection from {client_ip} timed out")
         except Exception as e:
-            logger.error(f"Error handling SSH connection: {str(e)}")
+            logger.error("Error handling SSH connection: %s", e)
         finally:
-            writer.close()
-            await writer.wait_closed()
+            deadline.cancel()
+            # Clients often drop the connection first; closing is best-effort
+            with contextlib.suppress(Exception):
+                writer.close()
+                await writer.wait_closed()
     
     def _analyze_attack(self, login_data):
         """
@@ -86,16 +101,15 @@ class SSHHoneypot(BaseHoneypot):
         In a real implementation, this would use the AI engine for 
         more sophisticated analysis.
         """
-        if "password_attempt" not in login_data:
+        password = login_data.get("password_attempt")
+        if password is None:
             return "Connection attempt"
         
-        password = login_data.get("password_attempt", "")
-        
         # Check for common attack patterns
-        if password.lower() in ["admin", "root", "password", "123456"]:
+        if password.lower() in COMMON_PASSWORDS:
             return "Common password attack"
         
-        if re.search(r'[;|&]', password):
+        if _COMMAND_INJECTION_RE.search(password):
             return "Command injection attempt"
             
         return "Brute force attempt"
@@ -114,7 +128,7 @@ class SSHHoneypot(BaseHoneypot):
             async with self.server:
                 await self.server.serve_forever()
         except Exception as e:
-            logger.error(f"Failed to start SSH honeypot: {str(e)}")
+            logger.error("Failed to start SSH honeypot: %s", e)
             self.status = "Error"
     
     async def stop(self):
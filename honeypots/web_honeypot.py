@@ -1,25 +1,158 @@
 import asyncio
 import logging
-from datetime import datetime
 import re
-import json
 from aiohttp import web
-import sys
-import os
-
-# Add the project root to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from honeypots.base import BaseHoneypot
 from utils.logging_config import setup_logger
+from utils.timestamps import now_iso
 
 logger = setup_logger("honeypot.web")
 
+# Usernames that mark a login attempt as a common admin credential attack
+COMMON_ADMIN_USERNAMES = frozenset(["admin", "root", "administrator"])
+
+# Any of these in a username or password marks a SQL injection attempt
+_SQL_INJECTION_RE = re.compile(
+    r"'|\"|--|#|\*|;|OR 1=1|OR '1'='1'|DROP|SELECT|UNION|INSERT|DELETE|UPDATE",
+    re.IGNORECASE
+)
+
+# Script extensions in the middle of a path, as probed by vulnerability scanners
+_SCRIPT_EXTENSION_RE = re.compile(r"\.(php|asp|jsp|cgi)\.", re.IGNORECASE)
+
+# Pages served by the honeypot, encoded once rather than on every request
+_ROOT_PAGE = """
+        <html>
+            <head><title>System Administration</title></head>
+            <body>
+                <h1>Company Internal Server</h1>
+                <p>Please <a href="/login">login</a> to access the system.</p>
+            </body>
+        </html>
+        """.encode()
+
+_LOGIN_PAGE = """
+        <html>
+            <head><title>Login</title></head>
+            <body>
+                <h1>Login</h1>
+                <form method="post" action="/login">
+                    <p>Username: <input type="text" name="username"></p>
+                    <p>Password: <input type="password" name="password"></p>
+                    <p><input type="submit" value="Login"></p>
+                </form>
+            </body>
+        </html>
+        """.encode()
+
+_LOGIN_FAILED_PAGE = """
+        <html>
+            <head><title>Login Failed</title></head>
+            <body>
+                <h1>Login Failed</h1>
+                <p>Invalid username or password.</p>
+                <p><a href="/login">Try again</a></p>
+            </body>
+        </html>
+        """.encode()
+
+_SERVER_ERROR_PAGE = """
+            <html>
+                <head><title>Error</title></head>
+                <body>
+                    <h1>Server Error</h1>
+                    <p>The server encountered an internal error and was unable to complete your request.</p>
+                </body>
+            </html>
+            """.encode()
+
+_NOT_FOUND_PAGE = """
+            <html>
+                <head><title>Not Found</title></head>
+                <body>
+                    <h1>404 Not Found</h1>
+                    <p>The requested URL was not found on this server.</p>
+                </body>
+            </html>
+            """.encode()
+
+# Repeated scans of the same non-vulnerable path from the same client are only
+# recorded at the 1st, 10th, 100th, ... request; the rest are summarized once
+# every SCAN_SUMMARY_INTERVAL seconds, or as soon as MAX_SCAN_KEYS different
+# (client, path) pairs are being counted
+SCAN_SUMMARY_INTERVAL = 30
+MAX_SCAN_KEYS = 10000
+
+def _is_sample_point(count):
+    """Check whether a repeated scan count is 1 or another power of 10."""
+    while count % 10 == 0:
+        count //= 10
+    return count == 1
+
+class WebHoneypotHub:
+    """
+    Serves every web honeypot from one aiohttp application and runner.
+    
+    Each honeypot gets its own TCPSite on the shared runner, so there is one
+    request pipeline however many ports are listening; requests are handed to
+    the honeypot that owns the port they arrived on, so each web honeypot
+    needs a port of its own.
+    """
+    
+    def __init__(self):
+        self.app = web.Application()
+        self.app.router.add_route('*', '/{tail:.*}', self._dispatch)
+        self.runner = None
+        # Listening port -> honeypot, and honeypot ID -> its site
+        self._honeypots = {}
+        self._sites = {}
+    
+    async def attach(self, honeypot):
+        """Start listening on a honeypot's address and route its requests to it."""
+        if self.runner is None:
+            self.runner = web.AppRunner(self.app)
+            await self.runner.setup()
+        
+        known_ports = {address[1] for address in self.runner.addresses}
+        site = web.TCPSite(self.runner, honeypot.ip, honeypot.port)
+        await site.start()
+        self._sites[honeypot.id] = site
+        
+        # The ports this site bound, which differ from honeypot.port if it is 0
+        for address in self.runner.addresses:
+            if address[1] not in known_ports:
+                self._honeypots[address[1]] = honeypot
+    
+    async def detach(self, honeypot):
+        """Stop listening for a honeypot, shutting the runner down after the last one."""
+        site = self._sites.pop(honeypot.id, None)
+        if site is not None:
+            await site.stop()
+        self._honeypots = {
+            port: hp for port, hp in self._honeypots.items() if hp is not honeypot
+        }
+        
+        if not self._sites and self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
+    
+    async def _dispatch(self, request):
+        """Hand a request to the honeypot listening on the port it arrived on."""
+        sockname = request.transport.get_extra_info('sockname') if request.transport else None
+        honeypot = self._honeypots.get(sockname[1]) if sockname else None
+        if honeypot is None:
+            return web.Response(body=_NOT_FOUND_PAGE, status=404, content_type='text/html', charset='utf-8')
+        return await honeypot.dispatch(request)
+
 class WebHoneypot(BaseHoneypot):
     """
     Web Honeypot implementation that simulates a vulnerable web server.
     """
     
+    # Hub shared by all web honeypots for serving requests; created on first use
+    _hub = None
+    
     def __init__(self, honeypot_id, ip="0.0.0.0", port=80, **kwargs):
         """
         Initialize a new Web honeypot.
@@ -34,9 +167,36 @@ class WebHoneypot(BaseHoneypot):
         self.vulnerable_paths = kwargs.get('vulnerable_paths', [
             '/admin', '/login', '/wp-admin', '/phpmyadmin', '/config'
         ])
+        # One anchored alternation matches a path against every vulnerable
+        # prefix in a single scan; with no prefixes it never matches. The
+        # bound match method is kept so handle_any does a single lookup
+        vulnerable_path_re = re.compile(
+            "|".join(re.escape(vp) for vp in self.vulnerable_paths)
+        ) if self.vulnerable_paths else re.compile(r"(?!)")
+        self._match_vulnerable_path = vulnerable_path_re.match
         self.honeypot_type = "Web"
+        # Set by stop() to end start(); created in start() on the running loop
+        self._stop_event = None
+        # (client IP, path) -> (requests since the last scan summary, how many
+        # of them were not recorded individually), and the task writing the
+        # summaries
+        self._scan_counts = {}
+        self._scan_summary_task = None
+        # Only this application's router is used; the shared hub serves it
         self.app = web.Application()
         self._setup_routes()
+    
+    @classmethod
+    def get_hub(cls):
+        """Return the shared web honeypot hub, creating it if needed."""
+        if WebHoneypot._hub is None:
+            WebHoneypot._hub = WebHoneypotHub()
+        return WebHoneypot._hub
+    
+    async def dispatch(self, request):
+        """Route a request through this honeypot's own routes."""
+        match_info = await self.app.router.resolve(request)
+        return await match_info.handler(request)
         
     def _setup_routes(self):
         """Set up the web routes for the honeypot."""
@@ -50,32 +210,12 @@ class WebHoneypot(BaseHoneypot):
     async def handle_root(self, request):
         """Handle requests to the root path."""
         await self._record_web_request(request)
-        return web.Response(text="""
-        <html>
-            <head><title>System Administration</title></head>
-            <body>
-                <h1>Company Internal Server</h1>
-                <p>Please <a href="/login">login</a> to access the system.</p>
-            </body>
-        </html>
-        """, content_type='text/html')
+        return web.Response(body=_ROOT_PAGE, content_type='text/html', charset='utf-8')
     
     async def handle_login(self, request):
         """Handle GET requests to the login path."""
         await self._record_web_request(request)
-        return web.Response(text="""
-        <html>
-            <head><title>Login</title></head>
-            <body>
-                <h1>Login</h1>
-                <form method="post" action="/login">
-                    <p>Username: <input type="text" name="username"></p>
-                    <p>Password: <input type="password" name="password"></p>
-                    <p><input type="submit" value="Login"></p>
-                </form>
-            </body>
-        </html>
-        """, content_type='text/html')
+        return web.Response(body=_LOGIN_PAGE, content_type='text/html', charset='utf-8')
     
     async def handle_login_post(self, request):
         """Handle POST requests to the login path."""
@@ -94,60 +234,51 @@ class WebHoneypot(BaseHoneypot):
         # Record the activity
         await self._record_web_request(request, attack_data, attack_type)
         
-        return web.Response(text="""
-        <html>
-            <head><title>Login Failed</title></head>
-            <body>
-                <h1>Login Failed</h1>
-                <p>Invalid username or password.</p>
-                <p><a href="/login">Try again</a></p>
-            </body>
-        </html>
-        """, content_type='text/html')
+        return web.Response(body=_LOGIN_FAILED_PAGE, content_type='text/html', charset='utf-8')
     
     async def handle_any(self, request):
         """Handle any other request path."""
         path = request.path
         
         # Check if this is a known vulnerable path
-        is_vulnerable = any(path.startswith(vp) for vp in self.vulnerable_paths)
-        attack_type = "Path scanning" if not is_vulnerable else "Known vulnerability probe"
+        is_vulnerable = self._match_vulnerable_path(path) is not None
         
-        await self._record_web_request(request, {"path": path}, attack_type)
+        if is_vulnerable:
+            await self._record_web_request(request, {"path": path}, "Known vulnerability probe")
+        else:
+            # Scanners hit the same paths over and over; only sampled repeats
+            # go through the full recording pipeline
+            key = (request.remote, path)
+            if key not in self._scan_counts and len(self._scan_counts) >= MAX_SCAN_KEYS:
+                await self._summarize_scans()
+            count, unrecorded = self._scan_counts.get(key, (0, 0))
+            count += 1
+            if _is_sample_point(count):
+                self._scan_counts[key] = (count, unrecorded)
+                await self._record_web_request(request, {"path": path}, "Path scanning")
+            else:
+                self._scan_counts[key] = (count, unrecorded + 1)
+                self.connections += 1
         
         if is_vulnerable:
             # If it's a known vulnerable path, return a fake error page
-            return web.Response(text="""
-            <html>
-                <head><title>Error</title></head>
-                <body>
-                    <h1>Server Error</h1>
-                    <p>The server encountered an internal error and was unable to complete your request.</p>
-                </body>
-            </html>
-            """, status=500, content_type='text/html')
+            return web.Response(body=_SERVER_ERROR_PAGE, status=500, content_type='text/html', charset='utf-8')
         else:
             # Otherwise return a normal 404
-            return web.Response(text="""
-            <html>
-                <head><title>Not Found</title></head>
-                <body>
-                    <h1>404 Not Found</h1>
-                    <p>The requested URL was not found on this server.</p>
-                </body>
-            </html>
-            """, status=404, content_type='text/html')
+            return web.Response(body=_NOT_FOUND_PAGE, status=404, content_type='text/html', charset='utf-8')
     
     async def _record_web_request(self, request, data=None, attack_type=None):
         """Record a web request."""
         client_ip = request.remote
         
+        # Headers and query are kept as aiohttp's read-only multidicts; they
+        # are copied into plain dicts only when the event is serialized
         request_data = {
             "method": request.method,
             "path": request.path,
-            "headers": dict(request.headers),
-            "query_string": dict(request.query),
-            "time": datetime.now().isoformat()
+            "headers": request.headers,
+            "query_string": request.query,
+            "time": now_iso()
         }
         
         if data:
@@ -163,31 +294,23 @@ class WebHoneypot(BaseHoneypot):
         In a real implementation, this would use the AI engine for
         more sophisticated analysis.
         """
-        if "username" in data and "password" in data:
-            username = data.get("username", "")
-            password = data.get("password", "")
-            
+        username = data.get("username")
+        password = data.get("password")
+        if username is not None and password is not None:
             # Check for SQL injection attempts
-            sql_patterns = [
-                r"'", r'"', r"--", r"#", r"\*", r";", r"OR 1=1", r"OR '1'='1'",
-                r"DROP", r"SELECT", r"UNION", r"INSERT", r"DELETE", r"UPDATE"
-            ]
-            
-            for pattern in sql_patterns:
-                if re.search(pattern, username, re.IGNORECASE) or re.search(pattern, password, re.IGNORECASE):
-                    return "SQL Injection attempt"
+            if _SQL_INJECTION_RE.search(username) or _SQL_INJECTION_RE.search(password):
+                return "SQL Injection attempt"
             
             # Check for common credentials
-            if username.lower() in ["admin", "root", "administrator"] and password:
+            if username.lower() in COMMON_ADMIN_USERNAMES and password:
                 return "Common admin credential attack"
                 
             return "Credential stuffing attempt"
             
-        if "path" in data:
-            path = data.get("path", "")
-            
+        path = data.get("path")
+        if path is not None:
             # Check for common web vulnerabilities in path
-            if re.search(r"\.(php|asp|jsp|cgi)\.", path, re.IGNORECASE):
+            if _SCRIPT_EXTENSION_RE.search(path):
                 return "Web vulnerability scan"
                 
             if "/wp-" in path or "/wordpress" in path:
@@ -198,33 +321,58 @@ class WebHoneypot(BaseHoneypot):
                 
         return "Unknown web attack"
     
+    async def _summarize_scans(self):
+        """
+        Record how many repeated scans of each path were not recorded
+        individually, then reset the counts.
+        
+        Those requests were already counted as connections when they came in.
+        """
+        scan_counts, self._scan_counts = self._scan_counts, {}
+        for (client_ip, path), (_, unrecorded) in scan_counts.items():
+            if unrecorded:
+                await self.record_activity(
+                    client_ip,
+                    {"path": path, "request_count": unrecorded, "time": now_iso()},
+                    "Path scanning",
+                    count_connection=False
+                )
+    
+    async def _run_scan_summaries(self):
+        """Write scan summaries every SCAN_SUMMARY_INTERVAL seconds until cancelled."""
+        while True:
+            await asyncio.sleep(SCAN_SUMMARY_INTERVAL)
+            await self._summarize_scans()
+    
     async def start(self):
         """Start the web honeypot server."""
         await super().start()
+        self._stop_event = asyncio.Event()
+        self._scan_summary_task = asyncio.create_task(self._run_scan_summaries())
         
         try:
-            self.runner = web.AppRunner(self.app)
-            await self.runner.setup()
-            
-            self.site = web.TCPSite(self.runner, self.ip, self.port)
-            await self.site.start()
+            await WebHoneypot.get_hub().attach(self)
             
             logger.info(f"Web honeypot {self.id} listening on {self.ip}:{self.port}")
             
-            # Keep the server running
-            while self.running:
-                await asyncio.sleep(1)
+            # Keep the server running until stop() is called
+            await self._stop_event.wait()
                 
         except Exception as e:
-            logger.error(f"Failed to start Web honeypot: {str(e)}")
+            logger.error("Failed to start Web honeypot: %s", e)
             self.status = "Error"
     
     async def stop(self):
         """Stop the web honeypot server."""
-        if hasattr(self, 'site'):
-            await self.site.stop()
-            
-        if hasattr(self, 'runner'):
-            await self.runner.cleanup()
+        if self._stop_event is not None:
+            self._stop_event.set()
+        
+        await WebHoneypot.get_hub().detach(self)
+        
+        # Summarize the remaining scans before the alert worker shuts down
+        if self._scan_summary_task is not None:
+            self._scan_summary_task.cancel()
+            self._scan_summary_task = None
+        await self._summarize_scans()
             
         await super().stop()
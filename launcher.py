@@ -0,0 +1,172 @@
+"""
+Service launcher shared by start.py and restart_services.py
+
+Starts the backend API server and the frontend dev server, waits for each
+to accept connections, and supervises them until one exits or the launcher
+is interrupted.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import webbrowser
+
+from utils.processes import (
+    cancel_on_sigterm, log_path, start_logged_process, stop_process, wait_any, wait_for_port
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+BACKEND_PORT = 8000
+FRONTEND_PORT = 3000
+
+# Set HONEYPOT_HEADLESS=1 on servers and in CI to run only the backend: no
+# frontend dev server and no browser. The backend serves a pre-built
+# dashboard at /dashboard instead, if there is one
+HEADLESS = os.environ.get("HONEYPOT_HEADLESS") == "1"
+
+# Open the dashboard in a browser once started; set HONEYPOT_OPEN_BROWSER=0 to
+# skip it. It is always skipped without a terminal (services, CI)
+OPEN_BROWSER = (
+    not HEADLESS and os.environ.get("HONEYPOT_OPEN_BROWSER", "1") == "1" and sys.stdout.isatty()
+)
+
+# Environment for the backend: this one with the project root put first on
+# PYTHONPATH
+BACKEND_ENV = {
+    **os.environ,
+    "PYTHONPATH": os.pathsep.join(
+        path for path in (PROJECT_ROOT, os.environ.get("PYTHONPATH")) if path
+    )
+}
+
+# The frontend's start script is "react-scripts start". Run it with node
+# directly rather than through PowerShell and npm.ps1, which adds two extra
+# processes (a PowerShell host and npm) in front of the dev server
+NODE_PATH = shutil.which("node") or r"C:\Program Files\nodejs\node.exe"
+FRONTEND_DIR = os.path.join(PROJECT_ROOT, "frontend")
+FRONTEND_COMMAND = [
+    NODE_PATH,
+    os.path.join(FRONTEND_DIR, "node_modules", "react-scripts", "bin", "react-scripts.js"),
+    "start"
+]
+
+# react-scripts opens its own browser tab unless BROWSER=none; the launchers
+# open the dashboard themselves once the servers are up
+FRONTEND_ENV = {**os.environ, "BROWSER": "none"}
+
+async def _wait_until_ready(process, name, label, port, ready_timeout):
+    """Wait for a started service to listen on its port; stop it if it doesn't."""
+    if await wait_for_port(port, timeout=ready_timeout, process=process):
+        print(f"[+] {label} started successfully")
+        return process
+    elif process.returncode is None:
+        print(f"[!] {label} started but is not responding on port {port}")
+        stop_process(process)
+        return None
+    else:
+        print(f"[!] Failed to start {label.lower()}")
+        print(f"Error: see {log_path(name)}")
+        return None
+
+async def launch_backend(ready_timeout=30.0):
+    """
+    Start the backend server and wait for it to accept connections.
+    
+    Args:
+        ready_timeout (float): Seconds to wait for the server to listen
+    
+    Returns:
+        asyncio.subprocess.Process: The server process, or None if it failed to start
+    """
+    print("[+] Starting AI HoneyPot backend server...")
+    
+    # Output goes to logs/backend.log. In its own session (POSIX only), Ctrl+C
+    # in the terminal only reaches the launcher, which then stops the server
+    process = await start_logged_process(
+        "backend", sys.executable, "server.py",
+        env=BACKEND_ENV, cwd=PROJECT_ROOT, start_new_session=True
+    )
+    return await _wait_until_ready(process, "backend", "Backend server", BACKEND_PORT, ready_timeout)
+
+async def launch_frontend(ready_timeout=60.0):
+    """
+    Start the frontend development server and wait for it to accept connections.
+    
+    Args:
+        ready_timeout (float): Seconds to wait for the dev server to listen
+    
+    Returns:
+        asyncio.subprocess.Process: The dev server process, or None if it failed to start
+    """
+    print("[+] Starting AI HoneyPot frontend...")
+    
+    # Output goes to logs/frontend.log; own session as for the backend
+    process = await start_logged_process(
+        "frontend", *FRONTEND_COMMAND,
+        env=FRONTEND_ENV, cwd=FRONTEND_DIR, start_new_session=True
+    )
+    return await _wait_until_ready(process, "frontend", "Frontend server", FRONTEND_PORT, ready_timeout)
+
+async def supervise(processes):
+    """
+    Wait until one of the services exits and report which one.
+    
+    Args:
+        processes (dict): Service label -> process
+    """
+    exited = await wait_any(list(processes.values()))
+    for label, process in processes.items():
+        if process is exited:
+            print(f"[!] {label} process has terminated")
+
+async def run_system():
+    """Start the backend and frontend and keep them running until one exits."""
+    cancel_on_sigterm()
+    processes = {}
+    try:
+        # Start the backend server
+        backend_process = await launch_backend()
+        if not backend_process:
+            return
+        processes["Backend server"] = backend_process
+        
+        # Start the frontend server
+        if not HEADLESS:
+            frontend_process = await launch_frontend()
+            if not frontend_process:
+                return
+            processes["Frontend server"] = frontend_process
+        
+        # Open the browser
+        if OPEN_BROWSER:
+            print("[+] Opening dashboard in browser...")
+            webbrowser.open(f"http://localhost:{FRONTEND_PORT}")
+        
+        print("\n[+] AI HoneyPot System is running")
+        print(f"[+] Backend API: http://localhost:{BACKEND_PORT}")
+        if HEADLESS:
+            print(f"[+] Dashboard (if built): http://localhost:{BACKEND_PORT}/dashboard")
+        else:
+            print(f"[+] Frontend Dashboard: http://localhost:{FRONTEND_PORT}")
+        print("[+] Press Ctrl+C to stop all services")
+        
+        # Keep running until Ctrl+C or until either process exits
+        await supervise(processes)
+    except asyncio.CancelledError:
+        # Ctrl+C or SIGTERM interrupted the event loop
+        print("\n[+] Stopping AI HoneyPot System...")
+    finally:
+        # Stop the processes
+        for process in processes.values():
+            stop_process(process)
+        
+        print("[+] All services stopped")
+
+def run():
+    """Run the system until a service exits or the user presses Ctrl+C."""
+    try:
+        asyncio.run(run_system())
+    except KeyboardInterrupt:
+        pass
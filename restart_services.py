@@ -3,44 +3,72 @@
 Restart honeypot services by ensuring ports are available
 """
 
+import errno
 import os
 import sys
-import subprocess
 import time
 import socket
 from datetime import datetime
 
+import psutil
+
+import launcher
+from launcher import BACKEND_PORT, FRONTEND_PORT, PROJECT_ROOT
+
+# Attempts and first delay (seconds, doubled per attempt) when waiting for a
+# freed port to become bindable
+PORT_RELEASE_ATTEMPTS = 6
+PORT_RELEASE_DELAY = 0.05
+
 def check_port_in_use(port):
     """Check if a port is in use."""
+    # Binding is the authoritative check: it succeeds only if the service
+    # could listen on the port
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(('localhost', port)) == 0
+        # On Windows SO_REUSEADDR would let the bind steal a listening port
+        if sys.platform != "win32":
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            s.bind(('0.0.0.0', port))
+            s.listen(1)
+            return False
+        except OSError as e:
+            if e.errno in (errno.EADDRINUSE, getattr(errno, 'WSAEADDRINUSE', None)):
+                return True
+    
+    # The bind failed for another reason (e.g. permissions); fall back to
+    # checking whether anything accepts connections on the port
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.1)
+        return s.connect_ex(('127.0.0.1', port)) == 0
 
 def kill_process_on_port(port):
     """Kill any process using the specified port."""
-    try:
-        # Use netstat to find the process ID using the port
-        output = subprocess.check_output(
-            f"netstat -ano | findstr :{port}", 
-            shell=True
-        ).decode()
-        
-        # Extract the PID from the output
-        for line in output.split('\n'):
-            if f":{port}" in line:
-                parts = line.strip().split()
-                if len(parts) >= 5:
-                    pid = parts[4]
-                    print(f"Found process {pid} using port {port}")
-                    
-                    # Kill the process
-                    subprocess.run(f"taskkill /F /PID {pid}", shell=True)
-                    print(f"Killed process {pid}")
-                    return True
-        
-        return False
-    except subprocess.CalledProcessError:
-        # No process found
-        return False
+    for conn in psutil.net_connections(kind='inet'):
+        if conn.laddr and conn.laddr.port == port and conn.pid and conn.status in (
+            psutil.CONN_LISTEN, psutil.CONN_ESTABLISHED
+        ):
+            print(f"Found process {conn.pid} using port {port}")
+            
+            # Kill the process, forcing it if it doesn't exit on its own
+            try:
+                process = psutil.Process(conn.pid)
+                process.terminate()
+                try:
+                    process.wait(timeout=2)
+                except psutil.TimeoutExpired:
+                    process.kill()
+            except psutil.NoSuchProcess:
+                pass
+            except psutil.Error as e:
+                print(f"Failed to kill process {conn.pid}: {e}")
+                return False
+            
+            print(f"Killed process {conn.pid}")
+            return True
+    
+    # No process found
+    return False
 
 def ensure_port_available(port):
     """Ensure the specified port is available."""
@@ -52,90 +80,19 @@ def ensure_port_available(port):
             print(f"Failed to free port {port}")
             return False
         
-        # Double-check the port is now available
-        time.sleep(2)
-        if check_port_in_use(port):
-            print(f"Port {port} is still in use. Cannot proceed.")
-            return False
+        # Wait for the port to be released, backing off between checks
+        delay = PORT_RELEASE_DELAY
+        attempts = 1
+        while check_port_in_use(port):
+            if attempts == PORT_RELEASE_ATTEMPTS:
+                print(f"Port {port} is still in use. Cannot proceed.")
+                return False
+            time.sleep(delay)
+            delay *= 2
+            attempts += 1
     
     return True
 
-def start_backend():
-    """Start the backend server."""
-    print("[+] Starting AI HoneyPot backend server...")
-    
-    # Create a modified environment that includes the project root in PYTHONPATH
-    env = os.environ.copy()
-    project_root = os.path.dirname(os.path.abspath(__file__))
-    
-    # On Windows, use a semicolon as the path separator
-    if 'PYTHONPATH' in env:
-        env['PYTHONPATH'] = f"{project_root};{env['PYTHONPATH']}"
-    else:
-        env['PYTHONPATH'] = project_root
-    
-    # Start the server as a background process
-    backend_process = subprocess.Popen(
-        [sys.executable, "server.py"], 
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        env=env
-    )
-    
-    # Give the server time to start
-    time.sleep(5)
-    
-    # Check if the process is still running
-    if backend_process.poll() is None:
-        # Check if the server is responding
-        if check_port_in_use(8000):
-            print("[+] Backend server started successfully")
-            return backend_process
-        else:
-            print("[!] Backend server started but is not responding on port 8000")
-            backend_process.terminate()
-            return None
-    else:
-        stdout, stderr = backend_process.communicate()
-        print("[!] Failed to start backend server")
-        print(f"Error: {stderr.decode('utf-8')}")
-        return None
-
-def start_frontend():
-    """Start the frontend development server."""
-    print("[+] Starting AI HoneyPot frontend...")
-    os.chdir("frontend")
-    
-    # Use the full path to npm.ps1 as specified in the memory
-    npm_path = r"C:\Program Files\nodejs\npm.ps1"
-    
-    # Use PowerShell to execute the npm.ps1 script with execution policy bypass
-    frontend_process = subprocess.Popen(
-        ["powershell", "-ExecutionPolicy", "Bypass", "-File", npm_path, "start"], 
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
-    )
-    
-    os.chdir("..")
-    
-    # Give the server time to start
-    time.sleep(15)
-    
-    # Check if the process is still running
-    if frontend_process.poll() is None:
-        # Check if the server is responding
-        if check_port_in_use(3000):
-            print("[+] Frontend server started successfully")
-            return frontend_process
-        else:
-            print("[!] Frontend server started but is not responding on port 3000")
-            return None
-    else:
-        stdout, stderr = frontend_process.communicate()
-        print("[!] Failed to start frontend server")
-        print(f"Error: {stderr.decode('utf-8')}")
-        return None
-
 def main():
     """Main function to restart services."""
     print("=" * 70)
@@ -143,17 +100,13 @@ def main():
     print("=" * 70)
     
     # Ensure logs directory exists
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-        print("[+] Created logs directory")
+    os.makedirs(os.path.join(PROJECT_ROOT, 'logs'), exist_ok=True)
     
     # Check and free required ports
-    backend_port = 8000
-    frontend_port = 3000
     ssh_honeypot_port = 2222
     web_honeypot_port = 8089
     
-    ports_to_check = [backend_port, frontend_port, ssh_honeypot_port, web_honeypot_port]
+    ports_to_check = [BACKEND_PORT, FRONTEND_PORT, ssh_honeypot_port, web_honeypot_port]
     print("Checking if required ports are available...")
     
     all_ports_available = True
@@ -167,52 +120,7 @@ def main():
     
     print("All required ports are available. Starting services...")
     
-    # Start the backend server
-    backend_process = start_backend()
-    if not backend_process:
-        return
-    
-    # Start the frontend server
-    frontend_process = start_frontend()
-    if not frontend_process:
-        backend_process.terminate()
-        return
-    
-    # Open the browser
-    print("[+] Opening dashboard in browser...")
-    import webbrowser
-    webbrowser.open("http://localhost:3000")
-    
-    print("\n[+] AI HoneyPot System is running")
-    print("[+] Backend API: http://localhost:8000")
-    print("[+] Frontend Dashboard: http://localhost:3000")
-    print("[+] Press Ctrl+C to stop all services")
-    
-    try:
-        # Keep the script running until Ctrl+C
-        while True:
-            time.sleep(1)
-            
-            # Check if processes are still running
-            if backend_process.poll() is not None:
-                print("[!] Backend server process has terminated")
-                break
-                
-            if frontend_process.poll() is not None:
-                print("[!] Frontend server process has terminated")
-                break
-                
-    except KeyboardInterrupt:
-        print("\n[+] Stopping AI HoneyPot System...")
-    finally:
-        # Stop the processes
-        if 'frontend_process' in locals() and frontend_process:
-            frontend_process.terminate()
-            
-        if 'backend_process' in locals() and backend_process:
-            backend_process.terminate()
-            
-        print("[+] All services stopped")
+    launcher.run()
 
 if __name__ == "__main__":
     main()
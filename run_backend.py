@@ -16,6 +16,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger("backend_runner")
 
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
 def main():
     """Run the backend server with debugging."""
     print("=" * 70)
@@ -23,27 +25,29 @@ def main():
     print("=" * 70)
     
     # Ensure the logs directory exists
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-        print(f"Created logs directory")
+    os.makedirs('logs', exist_ok=True)
     
     # Add the project root to the Python path
-    project_root = os.path.dirname(os.path.abspath(__file__))
-    if project_root not in sys.path:
-        sys.path.insert(0, project_root)
-        print(f"Added {project_root} to Python path")
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+        print(f"Added {PROJECT_ROOT} to Python path")
     
     print("Starting FastAPI server...")
     print("The server will keep running until you press Ctrl+C")
     print("Access the API at http://localhost:8000")
     print("=" * 70)
     
-    # Run the server directly with uvicorn
+    # Run the server directly with uvicorn; loop/http "auto" use uvloop and
+    # httptools when installed. Per-request debug and access logging would
+    # dominate the cost of handling an alert
     uvicorn.run(
         "server:app", 
         host="0.0.0.0", 
         port=8000, 
-        log_level="debug",
+        log_level="info",
+        loop="auto",
+        http="auto",
+        access_log=False,
         reload=False
     )
 
@@ -5,44 +5,67 @@ Honeypot Attack Simulation Runner
 This script runs both SSH and Web attack simulations against the honeypots.
 """
 
-import subprocess
-import time
+import asyncio
 import sys
 import os
 from datetime import datetime
 
-def main():
-    """Run the honeypot attack simulations."""
-    print("=" * 70)
-    print(f"Honeypot Attack Simulation Runner - {datetime.now()}")
-    print("=" * 70)
+from utils.processes import start_logged_process, stop_process, wait_for_port
+
+# Seconds a simulator may run before it is stopped
+SIMULATION_TIMEOUT = 120
+
+async def run_simulator(name, *args):
+    """
+    Run an attack simulator until it exits, stopping it after SIMULATION_TIMEOUT.
     
+    Its output goes to logs/<name>.log.
+    
+    Returns:
+        int: The simulator's exit code (negative if it was stopped by a signal)
+    """
+    process = await start_logged_process(name, sys.executable, *args)
+    try:
+        return await asyncio.wait_for(process.wait(), timeout=SIMULATION_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"{name} did not finish within {SIMULATION_TIMEOUT} seconds, stopping it")
+        stop_process(process)
+        return await process.wait()
+
+async def run_simulations():
+    """Run the SSH and Web attack simulators one after the other."""
     print("First, make sure the honeypot system is running (python start.py)")
-    print("Waiting 10 seconds for honeypots to fully initialize...")
-    time.sleep(10)
+    print("Waiting for the honeypots to accept connections...")
+    for port in (2222, 8089):
+        if not await wait_for_port(port, timeout=30):
+            print(f"Honeypot on port {port} is not responding. Is the system running?")
+            return
     
+    # Simulator output goes to logs/ssh_simulator.log and logs/web_simulator.log
     print("\nRunning SSH Attack Simulation:")
-    ssh_simulator = subprocess.Popen(
-        [sys.executable, "attack_simulators/ssh_attack_simulator.py", "--ip", "127.0.0.1", "--port", "2222"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
+    returncode = await run_simulator(
+        "ssh_simulator",
+        "attack_simulators/ssh_attack_simulator.py", "--ip", "127.0.0.1", "--port", "2222"
     )
-    
-    # Let it run for a bit
-    time.sleep(30)
+    print(f"SSH attack simulation exited with code {returncode}")
     
     print("\nRunning Web Attack Simulation:")
-    web_simulator = subprocess.Popen(
-        [sys.executable, "attack_simulators/web_attack_simulator.py", "--url", "http://127.0.0.1:8089"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
+    returncode = await run_simulator(
+        "web_simulator",
+        "attack_simulators/web_attack_simulator.py", "--url", "http://127.0.0.1:8089"
     )
-    
-    # Let it run for a bit
-    time.sleep(30)
+    print(f"Web attack simulation exited with code {returncode}")
     
     print("\nSimulations completed! Check the dashboard for alerts.")
     print("If no alerts appear, check logs in the 'logs' directory.")
+
+def main():
+    """Run the honeypot attack simulations."""
+    print("=" * 70)
+    print(f"Honeypot Attack Simulation Runner - {datetime.now()}")
+    print("=" * 70)
+    
+    asyncio.run(run_simulations())
     
 if __name__ == "__main__":
     main()
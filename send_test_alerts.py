@@ -6,12 +6,14 @@ This script sends test alerts directly to the backend API
 to verify that the alert system is working properly.
 """
 
+import argparse
+import asyncio
 import json
-import time
-import requests
 import logging
 from datetime import datetime
 
+import aiohttp
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,11 +24,10 @@ logger = logging.getLogger("test_alerts")
 # API endpoint
 API_URL = "http://localhost:8000/honeypot/{honeypot_id}/alert"
 
-# Test alerts
+# Test alerts; each one is timestamped when it is sent
 TEST_ALERTS = [
     {
         "honeypot_id": "ssh-honeypot-1",
-        "timestamp": datetime.now().isoformat(),
         "data": {
             "source_ip": "192.168.1.100",
             "attack_type": "SSH_BRUTE_FORCE",
@@ -39,7 +40,6 @@ TEST_ALERTS = [
     },
     {
         "honeypot_id": "ssh-honeypot-1",
-        "timestamp": datetime.now().isoformat(),
         "data": {
             "source_ip": "192.168.1.101",
             "attack_type": "COMMAND_INJECTION",
@@ -51,7 +51,6 @@ TEST_ALERTS = [
     },
     {
         "honeypot_id": "web-honeypot-1",
-        "timestamp": datetime.now().isoformat(),
         "data": {
             "source_ip": "192.168.1.102",
             "attack_type": "SQL_INJECTION",
@@ -64,7 +63,6 @@ TEST_ALERTS = [
     },
     {
         "honeypot_id": "web-honeypot-1",
-        "timestamp": datetime.now().isoformat(),
         "data": {
             "source_ip": "192.168.1.103",
             "attack_type": "XSS",
@@ -77,7 +75,6 @@ TEST_ALERTS = [
     },
     {
         "honeypot_id": "web-honeypot-1",
-        "timestamp": datetime.now().isoformat(),
         "data": {
             "source_ip": "192.168.1.104",
             "attack_type": "PATH_TRAVERSAL",
@@ -90,29 +87,64 @@ TEST_ALERTS = [
     }
 ]
 
-def send_alert(alert):
+async def send_alert(session, alert):
     """Send a test alert to the API."""
-    honeypot_id = alert.pop("honeypot_id")
+    honeypot_id = alert["honeypot_id"]
     url = API_URL.format(honeypot_id=honeypot_id)
+    payload = {"timestamp": datetime.now().isoformat(), "data": alert["data"]}
     
     try:
-        logger.info(f"Sending test alert to {url}")
-        response = requests.post(url, json=alert)
-        
-        if response.status_code == 200:
-            logger.info(f"✅ Alert successfully sent to API: {honeypot_id}")
-            logger.info(f"Response: {response.json()}")
-            return True
-        else:
-            logger.error(f"❌ Failed to send alert: {response.status_code}")
-            logger.error(f"Response: {response.text}")
-            return False
+        logger.info("Sending test alert to %s", url)
+        async with session.post(url, json=payload) as response:
+            if response.status == 200:
+                logger.info("✅ Alert successfully sent to API: %s", honeypot_id)
+                logger.info("Response: %s", await response.json())
+                return True
+            else:
+                logger.error("❌ Failed to send alert: %s", response.status)
+                logger.error("Response: %s", await response.text())
+                return False
     except Exception as e:
-        logger.error(f"❌ Error sending alert: {str(e)}")
+        logger.error("❌ Error sending alert: %s", e)
         return False
 
+def print_alert(i, alert):
+    """Print which test alert is being sent."""
+    print(f"\nSending Alert {i}/{len(TEST_ALERTS)}:")
+    print(f"Honeypot: {alert['honeypot_id']}")
+    print(f"Attack Type: {alert['data']['attack_type']}")
+
+async def send_all(serial=False):
+    """Send every test alert over one keep-alive session; return the success count."""
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=10),
+        timeout=aiohttp.ClientTimeout(total=5)
+    ) as session:
+        if serial:
+            # One at a time with a pause, for following the server logs
+            success_count = 0
+            for i, alert in enumerate(TEST_ALERTS, 1):
+                print_alert(i, alert)
+                if await send_alert(session, alert):
+                    success_count += 1
+                if i < len(TEST_ALERTS):
+                    await asyncio.sleep(1)
+            return success_count
+        
+        for i, alert in enumerate(TEST_ALERTS, 1):
+            print_alert(i, alert)
+        results = await asyncio.gather(
+            *(send_alert(session, alert) for alert in TEST_ALERTS)
+        )
+        return sum(results)
+
 def main():
     """Main function to send test alerts."""
+    parser = argparse.ArgumentParser(description='Test Alert Generator')
+    parser.add_argument('--serial', action='store_true',
+                        help='send alerts one at a time, one second apart')
+    args = parser.parse_args()
+    
     print("=" * 70)
     print(f"Test Alert Generator - {datetime.now()}")
     print("=" * 70)
@@ -120,19 +152,7 @@ def main():
     print(f"API URL: {API_URL}")
     print("=" * 70)
     
-    success_count = 0
-    
-    for i, alert in enumerate(TEST_ALERTS, 1):
-        print(f"\nSending Alert {i}/{len(TEST_ALERTS)}:")
-        print(f"Honeypot: {alert['honeypot_id']}")
-        print(f"Attack Type: {alert['data']['attack_type']}")
-        
-        if send_alert(alert.copy()):
-            success_count += 1
-        
-        # Wait between alerts
-        if i < len(TEST_ALERTS):
-            time.sleep(1)
+    success_count = asyncio.run(send_all(args.serial))
     
     print("\n" + "=" * 70)
     print(f"Completed sending test alerts")
@@ -2,16 +2,19 @@ import asyncio
 import logging
 import os
 import signal
-import json
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import orjson
 from fastapi import FastAPI, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 import uvicorn
 
 from honeypots.manager import HoneypotManager
 from utils.logging_config import setup_logger
+from utils.timestamps import now_iso
 
 # Configure logging
 logger = setup_logger("honeypot.server")
@@ -20,7 +23,8 @@ logger = setup_logger("honeypot.server")
 honeypot_manager = HoneypotManager()
 
 # Initialize the FastAPI application
-app = FastAPI(title="AI HoneyPot System")
+# Responses are serialized with orjson rather than the stdlib json module
+app = FastAPI(title="AI HoneyPot System", default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -31,13 +35,92 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Maximum number of alerts kept in memory; the oldest are dropped first
+MAX_ALERTS = 10000
+
+# Every stored alert is also appended here as one JSON line, so a restart
+# can reload the most recent ones
+ALERTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "alerts.jsonl")
+
+# Once ALERTS_FILE holds this many lines it is cut back to the last
+# MAX_ALERTS, so the file and the startup reload stay bounded
+ALERTS_FILE_MAX_LINES = 2 * MAX_ALERTS
+
+# Number of lines in ALERTS_FILE, kept up to date by the alert worker
+_alerts_file_lines = 0
+
+def _compact_alerts_file(lines):
+    """Replace the contents of ALERTS_FILE with the given lines."""
+    temp_file = ALERTS_FILE + ".tmp"
+    with open(temp_file, "wb") as f:
+        f.writelines(lines)
+    os.replace(temp_file, ALERTS_FILE)
+
+def _load_alerts():
+    """
+    Load the last MAX_ALERTS alerts from ALERTS_FILE, skipping unreadable lines.
+    
+    Older lines are dropped from the file, since they would never be loaded.
+    """
+    global _alerts_file_lines
+    loaded = deque(maxlen=MAX_ALERTS)
+    try:
+        with open(ALERTS_FILE, "rb") as f:
+            lines = deque(f, maxlen=MAX_ALERTS)
+            file_size = f.tell()
+    except FileNotFoundError:
+        return loaded
+    
+    _alerts_file_lines = len(lines)
+    if file_size > sum(map(len, lines)):
+        try:
+            _compact_alerts_file(lines)
+        except OSError as e:
+            logger.error("Failed to compact %s: %s", ALERTS_FILE, e)
+    
+    for line in lines:
+        try:
+            loaded.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            continue
+    return loaded
+
+def _persist_alerts(new_alerts):
+    """Append alerts to ALERTS_FILE; storage keeps working if the file can't be written."""
+    global _alerts_file_lines
+    try:
+        os.makedirs(os.path.dirname(ALERTS_FILE), exist_ok=True)
+        with open(ALERTS_FILE, "ab") as f:
+            f.write(b"".join(orjson.dumps(alert) + b"\n" for alert in new_alerts))
+        _alerts_file_lines += len(new_alerts)
+        
+        # Cut the file back to the alerts a restart would reload
+        if _alerts_file_lines > ALERTS_FILE_MAX_LINES:
+            with open(ALERTS_FILE, "rb") as f:
+                lines = deque(f, maxlen=MAX_ALERTS)
+            _compact_alerts_file(lines)
+            _alerts_file_lines = len(lines)
+    except (OSError, TypeError) as e:
+        logger.error("Failed to persist %s alerts: %s", len(new_alerts), e)
+
 # Global variable to store alerts
-alerts = []
+alerts = _load_alerts()
+
+async def _run_in_alert_worker(func, *args):
+    """Run func(*args) on the alert worker thread and wait for its result."""
+    return await asyncio.get_running_loop().run_in_executor(app.state.alert_executor, func, *args)
 
 @app.on_event("startup")
 async def startup_event():
     """Start honeypots when the server starts."""
     logger.info("Starting honeypot server")
+    
+    # AI analysis and alert file writes run on this thread so they don't block
+    # the event loop. A single worker keeps the analyzer's attacker state
+    # consistent and the alert file in arrival order. It is created per
+    # lifespan, since the shutdown event shuts it down for good
+    app.state.alert_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-worker")
+    
     try:
         # Start the honeypots in a separate task
         # Use asyncio.create_task to run it in the background
@@ -46,9 +129,9 @@ async def startup_event():
         
         # Log the configured honeypots
         for hid, honeypot in honeypot_manager.honeypots.items():
-            logger.info(f"Honeypot {hid}: type={honeypot.honeypot_type}, ip={honeypot.ip}, port={honeypot.port}")
+            logger.info("Honeypot %s: type=%s, ip=%s, port=%s", hid, honeypot.honeypot_type, honeypot.ip, honeypot.port)
     except Exception as e:
-        logger.error(f"Error during startup: {str(e)}")
+        logger.error("Error during startup: %s", e)
         # Don't raise the exception - let the server continue running
 
 @app.on_event("shutdown")
@@ -59,8 +142,11 @@ async def shutdown_event():
         await honeypot_manager.stop_all()
         logger.info("All honeypots stopped successfully")
     except Exception as e:
-        logger.error(f"Error during shutdown: {str(e)}")
+        logger.error("Error during shutdown: %s", e)
         # Continue with shutdown even if there are errors
+    
+    # Let queued analyses and alert file writes finish
+    app.state.alert_executor.shutdown(wait=True)
 
 @app.get("/")
 async def root():
@@ -123,64 +209,140 @@ async def delete_honeypot(honeypot_id: str):
     return {"message": f"Honeypot {honeypot_id} deleted"}
 
 @app.get("/alerts")
-async def get_alerts():
-    """Get all recorded alerts."""
-    logger.info(f"GET /alerts - Returning {len(alerts)} alerts")
-    return alerts
+async def get_alerts(
+    response: Response,
+    since: Optional[str] = None,
+    attack_type_prefix: Optional[str] = None,
+    limit: Optional[int] = None
+):
+    """
+    Get recorded alerts, optionally only the matching ones.
+    
+    Args:
+        since: Only return alerts with an ISO 8601 timestamp at or after this one
+        attack_type_prefix: Only return alerts whose attack_type starts with this
+        limit: Only return the newest this many matching alerts
+    
+    Alerts are returned oldest first. The X-Total-Count header always holds
+    the number of stored alerts, so callers can filter without losing track
+    of the overall count.
+    """
+    response.headers["X-Total-Count"] = str(len(alerts))
+    if since is None and attack_type_prefix is None and limit is None:
+        logger.info("GET /alerts - Returning %s alerts", len(alerts))
+        return list(alerts)
+    
+    # Walk from the newest alert so a limit stops the scan early
+    matching = []
+    for alert in reversed(alerts):
+        if limit is not None and len(matching) >= limit:
+            break
+        if (since is None or str(alert["timestamp"]) >= since) and (
+            attack_type_prefix is None
+            or str(alert["data"].get("attack_type", "")).startswith(attack_type_prefix)
+        ):
+            matching.append(alert)
+    matching.reverse()
+    logger.info("GET /alerts - Returning %s of %s alerts", len(matching), len(alerts))
+    return matching
+
+def _build_alert(honeypot_id, alert_data):
+    """Build an alert, not yet analyzed, from the data a honeypot posted."""
+    alert = {
+        "honeypot_id": honeypot_id,
+        "timestamp": alert_data["timestamp"] if "timestamp" in alert_data else now_iso(),
+        "data": alert_data.get("data", alert_data)  # Fallback to using the entire payload as data
+    }
+    
+    # Ensure data has source_ip and attack_type fields
+    if "source_ip" not in alert["data"] and alert["data"].get("details", {}).get("source_ip"):
+        alert["data"]["source_ip"] = alert["data"]["details"]["source_ip"]
+        
+    if "attack_type" not in alert["data"]:
+        alert["data"]["attack_type"] = "Unknown Attack"
+    
+    return alert
 
 @app.post("/honeypot/{honeypot_id}/alert")
 async def create_alert(honeypot_id: str, alert_data: dict):
     """Create a new alert and analyze it with AI."""
-    logger.info(f"POST /honeypot/{honeypot_id}/alert - Received alert data: {json.dumps(alert_data)}")
+    logger.info("POST /honeypot/%s/alert - Received alert data: %s", honeypot_id, alert_data)
     
     try:
-        # Create the basic alert
-        alert = {
-            "honeypot_id": honeypot_id,
-            "timestamp": alert_data.get("timestamp", datetime.now().isoformat()),
-            "data": alert_data.get("data", alert_data)  # Fallback to using the entire payload as data
-        }
-        
-        # Ensure data has source_ip and attack_type fields
-        if "source_ip" not in alert["data"] and alert["data"].get("details", {}).get("source_ip"):
-            alert["data"]["source_ip"] = alert["data"]["details"]["source_ip"]
-            
-        if "attack_type" not in alert["data"]:
-            alert["data"]["attack_type"] = "Unknown Attack"
-        
-        # Use AI to analyze the alert
-        logger.info(f"Analyzing alert with AI engine...")
-        analysis = honeypot_manager.analyze_event(alert)
-        
-        # Combine alert with analysis
-        alert["analysis"] = analysis
+        logger.info("Analyzing alert with AI engine...")
+        alert = _build_alert(honeypot_id, alert_data)
+        alert["analysis"] = await _run_in_alert_worker(honeypot_manager.analyze_event, alert)
         
         # Store the alert
         alerts.append(alert)
-        logger.info(f"Alert stored successfully. Total alerts: {len(alerts)}")
-        logger.info(f"New alert details: {json.dumps(alert)}")
+        await _run_in_alert_worker(_persist_alerts, [alert])
+        logger.info("Alert stored successfully. Total alerts: %s", len(alerts))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("New alert details: %s", orjson.dumps(alert).decode())
         
         return alert
     except Exception as e:
-        logger.error(f"Error processing alert: {str(e)}")
-        import traceback
-        logger.error(f"Exception traceback: {traceback.format_exc()}")
+        logger.exception("Error processing alert: %s", e)
         raise HTTPException(status_code=500, detail=f"Error processing alert: {str(e)}")
 
+@app.post("/honeypot/{honeypot_id}/alerts/batch")
+async def create_alert_batch(honeypot_id: str, batch_data: dict):
+    """Create several alerts at once, as sent by a honeypot's alert worker."""
+    events = batch_data.get("events")
+    if not isinstance(events, list):
+        raise HTTPException(status_code=400, detail="Batch must contain an 'events' list")
+    
+    logger.info("POST /honeypot/%s/alerts/batch - Received %s alerts", honeypot_id, len(events))
+    
+    try:
+        new_alerts = [_build_alert(honeypot_id, event) for event in events]
+        
+        # Analyze the whole batch in one call to the AI engine
+        analyses = await _run_in_alert_worker(honeypot_manager.analyze_events, new_alerts)
+        for alert, analysis in zip(new_alerts, analyses):
+            alert["analysis"] = analysis
+        
+        # Store all alerts of the batch in one step
+        alerts.extend(new_alerts)
+        await _run_in_alert_worker(_persist_alerts, new_alerts)
+        logger.info("Alert batch stored successfully. Total alerts: %s", len(alerts))
+        
+        return {"received": len(new_alerts)}
+    except Exception as e:
+        logger.exception("Error processing alert batch: %s", e)
+        raise HTTPException(status_code=500, detail=f"Error processing alert batch: {str(e)}")
+
 @app.get("/threat-intelligence")
 async def get_threat_intelligence():
     """Get threat intelligence report."""
-    return honeypot_manager.get_threat_intelligence()
+    # Read on the alert worker so the analyzer's state isn't changing underneath
+    return await _run_in_alert_worker(honeypot_manager.get_threat_intelligence)
+
+# Serve a pre-built dashboard at /dashboard if there is one, so headless runs
+# (HONEYPOT_HEADLESS=1) don't need the frontend dev server. Build it with
+# PUBLIC_URL=/dashboard npm run build in the frontend directory
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "build")
+if os.path.isdir(DASHBOARD_DIR):
+    app.mount("/dashboard", StaticFiles(directory=DASHBOARD_DIR, html=True), name="dashboard")
 
 if __name__ == "__main__":
     # Run the server
     logger.info("Starting FastAPI server on http://0.0.0.0:8000")
     logger.info("Honeypot Manager and AI Analyzer initialized")
-    logger.info(f"Server has {len(honeypot_manager.honeypots)} honeypots configured")
+    logger.info("Server has %s honeypots configured", len(honeypot_manager.honeypots))
     
     # Print troubleshooting info
     for hid, honeypot in honeypot_manager.honeypots.items():
-        logger.info(f"Honeypot {hid}: type={honeypot.honeypot_type}, ip={honeypot.ip}, port={honeypot.port}")
+        logger.info("Honeypot %s: type=%s, ip=%s, port=%s", hid, honeypot.honeypot_type, honeypot.ip, honeypot.port)
     
-    # Run the server
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # Run the server; loop/http "auto" use uvloop and httptools when installed.
+    # The access log is off since create_alert already logs each alert
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        log_level="info",
+        loop="auto",
+        http="auto",
+        access_log=False
+    )
@@ -8,12 +8,18 @@ including the backend API server, honeypots, and frontend dashboard.
 
 import os
 import sys
-import time
+import select
 import signal
+import socket
 import subprocess
+import threading
 import logging
+import webbrowser
 from datetime import datetime
 
+from launcher import FRONTEND_COMMAND, FRONTEND_ENV, HEADLESS, OPEN_BROWSER
+from utils.processes import log_path, terminate, wait_for_port_blocking
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +33,9 @@ FRONTEND_PORT = 3000
 SSH_HONEYPOT_PORT = 2222
 WEB_HONEYPOT_PORT = 8089  # Changed from 8080 to avoid conflicts
 
+# How much of a failed server's log to show
+LOG_TAIL_BYTES = 4096
+
 class HoneypotSystem:
     """Manages the entire honeypot system."""
     
@@ -34,20 +43,77 @@ class HoneypotSystem:
         """Initialize the honeypot system."""
         self.backend_process = None
         self.frontend_process = None
+        # Log files the servers write their output to
+        self.backend_log = None
+        self.frontend_log = None
         self.running = False
+        # Termination signal received while running, if any
+        self.stop_signal = None
         
         # Get project root directory
         self.project_root = os.path.dirname(os.path.abspath(__file__))
         
+        # Self-pipe that wakes up run(): Python writes to it as soon as a
+        # signal arrives, and watcher threads write to it when a process
+        # exits. A socket pair, since Windows can only select() on sockets
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+        self._wakeup_writer.setblocking(False)
+        signal.set_wakeup_fd(self._wakeup_writer.fileno())
+        
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
     
     def signal_handler(self, sig, frame):
-        """Handle termination signals."""
-        logger.info(f"Received signal {sig}, shutting down...")
-        self.stop()
-        sys.exit(0)
+        """
+        Handle termination signals.
+        
+        Only records the signal while running; run() is woken up through the
+        wakeup socket and shuts down from the main loop. During startup it
+        interrupts like Ctrl+C does.
+        """
+        if not self.running:
+            raise KeyboardInterrupt
+        self.stop_signal = sig
+    
+    def _wake_up(self):
+        """Wake up run() from another thread."""
+        try:
+            self._wakeup_writer.send(b"\0")
+        except OSError:
+            # Buffer full: run() has a wakeup pending already
+            pass
+    
+    def _wait_for_wakeup(self, timeout=None):
+        """Sleep until a signal arrives or a watched process exits, or the timeout passes."""
+        readable, _, _ = select.select([self._wakeup_reader], [], [], timeout)
+        if readable:
+            try:
+                while self._wakeup_reader.recv(4096):
+                    pass
+            except OSError:
+                # Drained
+                pass
+    
+    def _watch(self, process):
+        """Wait for a process in a background thread and wake up run() when it exits."""
+        def wait():
+            process.wait()
+            self._wake_up()
+        threading.Thread(target=wait, daemon=True).start()
+    
+    def _open_log(self, name):
+        """Open logs/<name>.log for a server to append its output to."""
+        os.makedirs(os.path.dirname(log_path(name)), exist_ok=True)
+        return open(log_path(name), "ab", buffering=0)
+    
+    def _log_tail(self, name):
+        """Read the end of logs/<name>.log, to report why a server failed."""
+        with open(log_path(name), "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(f.tell() - LOG_TAIL_BYTES, 0))
+            return f.read().decode("utf-8", errors="replace")
     
     def start_backend(self):
         """Start the backend server."""
@@ -57,26 +123,36 @@ class HoneypotSystem:
         env = os.environ.copy()
         env['PYTHONPATH'] = self.project_root
         
-        # Start the backend server
+        # Start the backend server; its output goes straight to logs/backend.log.
+        # loop/http "auto" use uvloop and httptools when they are installed.
+        # It stays a single worker: each worker would start its own honeypots
+        # on the same ports and keep its own copy of the alerts
+        self.backend_log = self._open_log("backend")
         self.backend_process = subprocess.Popen(
             [sys.executable, "-m", "uvicorn", "server:app", "--host", "0.0.0.0", 
-             "--port", str(BACKEND_PORT), "--log-level", "info"],
+             "--port", str(BACKEND_PORT), "--log-level", "info",
+             "--loop", "auto", "--http", "auto", "--no-access-log"],
             cwd=self.project_root,
             env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT
+            stdout=self.backend_log,
+            stderr=subprocess.STDOUT,
+            # Own session (POSIX only): Ctrl+C in the terminal only reaches
+            # this process, and stop() shuts the server down once
+            start_new_session=True
         )
         
-        # Give it a moment to start
-        time.sleep(3)
-        
-        # Check if process is still running
-        if self.backend_process.poll() is not None:
-            stdout, _ = self.backend_process.communicate()
-            logger.error(f"Backend server failed to start: {stdout.decode('utf-8')}")
+        # Wait for it to accept connections
+        if not wait_for_port_blocking(BACKEND_PORT, 30, self.backend_process):
+            # Check if process is still running
+            if self.backend_process.poll() is not None:
+                logger.error(f"Backend server failed to start: {self._log_tail('backend')}")
+            else:
+                logger.error(f"Backend server is not responding on port {BACKEND_PORT}")
+                terminate(self.backend_process)
             return False
         
         logger.info(f"Backend server started on http://localhost:{BACKEND_PORT}")
+        self._watch(self.backend_process)
         return True
     
     def start_frontend(self):
@@ -89,28 +165,33 @@ class HoneypotSystem:
             logger.error(f"Frontend directory not found at {frontend_dir}")
             return False
         
-        # Use the full path to npm.ps1 as specified in the memory
-        npm_path = r"C:\Program Files\nodejs\npm.ps1"
-        
-        # Start the frontend server
+        # Start the frontend server with node directly (no PowerShell/npm);
+        # its output goes straight to logs/frontend.log
+        self.frontend_log = self._open_log("frontend")
         self.frontend_process = subprocess.Popen(
-            ["powershell", "-ExecutionPolicy", "Bypass", "-File", npm_path, "start"],
+            FRONTEND_COMMAND,
             cwd=frontend_dir,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT
+            env=FRONTEND_ENV,
+            stdout=self.frontend_log,
+            stderr=subprocess.STDOUT,
+            # Own session (POSIX only): Ctrl+C in the terminal only reaches
+            # this process, and stop() shuts the server down once
+            start_new_session=True
         )
         
         # Wait for frontend to start
-        logger.info("Waiting for frontend to initialize (15 seconds)...")
-        time.sleep(15)
-        
-        # Check if process is still running
-        if self.frontend_process.poll() is not None:
-            stdout, _ = self.frontend_process.communicate()
-            logger.error(f"Frontend server failed to start: {stdout.decode('utf-8')}")
+        logger.info("Waiting for frontend to initialize...")
+        if not wait_for_port_blocking(FRONTEND_PORT, 60, self.frontend_process):
+            # Check if process is still running
+            if self.frontend_process.poll() is not None:
+                logger.error(f"Frontend server failed to start: {self._log_tail('frontend')}")
+            else:
+                logger.error(f"Frontend server is not responding on port {FRONTEND_PORT}")
+                terminate(self.frontend_process)
             return False
         
         logger.info(f"Frontend server started on http://localhost:{FRONTEND_PORT}")
+        self._watch(self.frontend_process)
         return True
     
     def start(self):
@@ -120,35 +201,38 @@ class HoneypotSystem:
         print("=" * 70)
         
         # Make sure logs directory exists
-        logs_dir = os.path.join(self.project_root, "logs")
-        if not os.path.exists(logs_dir):
-            os.makedirs(logs_dir)
-            logger.info(f"Created logs directory at {logs_dir}")
+        os.makedirs(os.path.join(self.project_root, "logs"), exist_ok=True)
         
         # Start backend
         if not self.start_backend():
             logger.error("Failed to start backend server")
             return False
         
-        # Start frontend
-        if not self.start_frontend():
-            logger.warning("Failed to start frontend server")
-            # Continue anyway - the backend is more important
+        # Start frontend, unless running headless (HONEYPOT_HEADLESS=1)
+        frontend_started = False
+        if not HEADLESS:
+            frontend_started = self.start_frontend()
+            if not frontend_started:
+                logger.warning("Failed to start frontend server")
+                # Continue anyway - the backend is more important
         
-        # Open browser
-        logger.info("Opening dashboard in browser...")
-        try:
-            import webbrowser
-            webbrowser.open(f"http://localhost:{FRONTEND_PORT}")
-        except Exception as e:
-            logger.warning(f"Failed to open browser: {e}")
+        # Open browser once the dashboard is being served
+        if OPEN_BROWSER and frontend_started:
+            logger.info("Opening dashboard in browser...")
+            try:
+                webbrowser.open(f"http://localhost:{FRONTEND_PORT}")
+            except Exception as e:
+                logger.warning(f"Failed to open browser: {e}")
         
         self.running = True
         
         print("\n" + "=" * 70)
         print(f"AI HoneyPot System is running")
         print(f"Backend API: http://localhost:{BACKEND_PORT}")
-        print(f"Frontend Dashboard: http://localhost:{FRONTEND_PORT}")
+        if HEADLESS:
+            print(f"Dashboard (if built): http://localhost:{BACKEND_PORT}/dashboard")
+        else:
+            print(f"Frontend Dashboard: http://localhost:{FRONTEND_PORT}")
         print(f"SSH Honeypot: localhost:{SSH_HONEYPOT_PORT}")
         print(f"Web Honeypot: http://localhost:{WEB_HONEYPOT_PORT}")
         print("=" * 70)
@@ -165,7 +249,7 @@ class HoneypotSystem:
         if self.frontend_process:
             logger.info("Stopping frontend server...")
             try:
-                self.frontend_process.terminate()
+                terminate(self.frontend_process)
                 self.frontend_process.wait(timeout=5)
             except Exception as e:
                 logger.warning(f"Error stopping frontend: {e}")
@@ -178,7 +262,7 @@ class HoneypotSystem:
         if self.backend_process:
             logger.info("Stopping backend server...")
             try:
-                self.backend_process.terminate()
+                terminate(self.backend_process)
                 self.backend_process.wait(timeout=5)
             except Exception as e:
                 logger.warning(f"Error stopping backend: {e}")
@@ -187,28 +271,41 @@ class HoneypotSystem:
                 except:
                     pass
         
+        # Close the servers' log files
+        for log_file in (self.frontend_log, self.backend_log):
+            if log_file:
+                log_file.close()
+        self.frontend_log = self.backend_log = None
+        
         self.running = False
         print("All services stopped")
         print("=" * 70)
     
     def run(self):
         """Run the honeypot system and keep it running."""
-        if not self.start():
-            logger.error("Failed to start honeypot system")
-            return False
+        frontend_reported = False
         
         try:
-            # Keep the script running until Ctrl+C
+            if not self.start():
+                logger.error("Failed to start honeypot system")
+                return False
+            
+            # Keep the script running until Ctrl+C. Block until a signal
+            # arrives or a process exits instead of polling
             while self.running:
-                time.sleep(1)
+                self._wait_for_wakeup()
+                if self.stop_signal is not None:
+                    logger.info(f"Received signal {self.stop_signal}, shutting down...")
+                    break
                 
-                # Check if processes are still running
+                # Check which process has exited
                 if self.backend_process and self.backend_process.poll() is not None:
                     logger.error("Backend server has terminated unexpectedly")
                     break
                 
-                if self.frontend_process and self.frontend_process.poll() is not None:
+                if self.frontend_process and self.frontend_process.poll() is not None and not frontend_reported:
                     logger.warning("Frontend server has terminated")
+                    frontend_reported = True
                     # Don't exit, the backend is more important
         
         except KeyboardInterrupt:
@@ -6,11 +6,23 @@ This utility tests the alert flow from honeypots to the server and dashboard.
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 import time
 import sys
 from datetime import datetime
 
+# Connect by address rather than "localhost" so requests skip the name lookup
+# (and a failed IPv6 attempt first on some systems)
+SERVER_URL = "http://127.0.0.1:8000"
+
+# Connect and read timeouts in seconds, shared by all requests
+TIMEOUT = (1.0, 5.0)
+
+# Shared session so every request reuses keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 def test_create_alert():
     """Test creating a test alert directly via the API."""
     print("\nTesting alert creation API...")
@@ -34,17 +46,17 @@ def test_create_alert():
     try:
         print("Sending test alert to server...")
         # Use the test honeypot ID for this test
-        response = requests.post(
-            "http://localhost:8000/honeypot/test-honeypot-1/alert",
+        response = SESSION.post(
+            f"{SERVER_URL}/honeypot/test-honeypot-1/alert",
             json=test_alert,
-            timeout=5
+            timeout=TIMEOUT
         )
         
         if response.status_code == 200:
             print(f"✅ Test alert successfully created (status {response.status_code})")
             try:
-                alert_response = response.json()
-                print(f"✅ Received valid response: {json.dumps(alert_response, indent=2)}")
+                alert_response = orjson.loads(response.content)
+                print(f"✅ Received valid response: {orjson.dumps(alert_response, option=orjson.OPT_INDENT_2).decode()}")
                 print("\nAnalysis details:")
                 if "analysis" in alert_response:
                     analysis = alert_response["analysis"]
@@ -54,13 +66,13 @@ def test_create_alert():
                         print(f"  Recommendations: {analysis['recommendations']}")
                 else:
                     print("  No analysis data in response")
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 print(f"❌ Invalid JSON response: {response.text[:200]}")
         else:
             print(f"❌ Failed to create alert. Status: {response.status_code}")
             print(f"Response: {response.text}")
     except requests.exceptions.ConnectionError:
-        print(f"❌ Could not connect to server at http://localhost:8000")
+        print(f"❌ Could not connect to server at {SERVER_URL}")
         print("  Make sure the server is running (python start.py)")
     except Exception as e:
         print(f"❌ Error: {str(e)}")
@@ -70,12 +82,12 @@ def test_get_alerts():
     print("\nTesting get alerts API...")
     
     try:
-        response = requests.get("http://localhost:8000/alerts", timeout=5)
+        response = SESSION.get(f"{SERVER_URL}/alerts", timeout=TIMEOUT)
         
         if response.status_code == 200:
             print(f"✅ Successfully retrieved alerts (status {response.status_code})")
             try:
-                alerts = response.json()
+                alerts = orjson.loads(response.content)
                 if isinstance(alerts, list):
                     print(f"✅ Received {len(alerts)} alerts")
                     if alerts:
@@ -89,32 +101,43 @@ def test_get_alerts():
                         print("❌ No alerts found - this is the likely cause of your empty dashboard")
                 else:
                     print(f"❌ Expected a list but got {type(alerts)}")
-                    print(f"Response: {json.dumps(alerts)[:200]}")
-            except json.JSONDecodeError:
+                    print(f"Response: {orjson.dumps(alerts).decode()[:200]}")
+            except orjson.JSONDecodeError:
                 print(f"❌ Invalid JSON response: {response.text[:200]}")
         else:
             print(f"❌ Failed to get alerts. Status: {response.status_code}")
             print(f"Response: {response.text}")
     except requests.exceptions.ConnectionError:
-        print(f"❌ Could not connect to server at http://localhost:8000")
+        print(f"❌ Could not connect to server at {SERVER_URL}")
         print("  Make sure the server is running (python start.py)")
     except Exception as e:
         print(f"❌ Error: {str(e)}")
 
+def alert_count(response, alerts):
+    """
+    Get the total number of stored alerts from a GET /alerts response.
+    
+    Servers without the alert filters ignore them, return every alert and
+    send no X-Total-Count header; the length of the list is the count then.
+    """
+    total = response.headers.get("X-Total-Count")
+    return int(total) if total is not None else len(alerts)
+
 def test_alert_flow():
     """Perform an end-to-end test of the alert flow."""
     print("\n" + "="*70)
     print("TESTING ALERT FLOW FROM CREATION TO RETRIEVAL")
     print("="*70)
     
-    # First, get the current alert count
+    # First, get the current alert count. limit=0 asks for no alerts at all;
+    # the count comes from the X-Total-Count header
     try:
-        before_response = requests.get("http://localhost:8000/alerts", timeout=5)
+        before_response = SESSION.get(f"{SERVER_URL}/alerts", params={"limit": 0}, timeout=TIMEOUT)
         before_count = 0
         if before_response.status_code == 200:
-            before_alerts = before_response.json()
+            before_alerts = orjson.loads(before_response.content)
             if isinstance(before_alerts, list):
-                before_count = len(before_alerts)
+                before_count = alert_count(before_response, before_alerts)
                 print(f"Current alert count: {before_count}")
     except Exception:
         print("Failed to get current alert count, continuing with test...")
@@ -136,10 +159,10 @@ def test_alert_flow():
     
     print(f"\nCreating test alert with ID: {test_id}")
     try:
-        create_response = requests.post(
-            "http://localhost:8000/honeypot/flow-test-honeypot/alert",
+        create_response = SESSION.post(
+            f"{SERVER_URL}/honeypot/flow-test-honeypot/alert",
             json=test_alert,
-            timeout=5
+            timeout=TIMEOUT
         )
         
         if create_response.status_code != 200:
@@ -148,22 +171,24 @@ def test_alert_flow():
         
         print("✅ Test alert created successfully")
         
-        # Give the server a moment to process
-        print("Waiting 2 seconds for server processing...")
-        time.sleep(2)
-        
-        # Now check if our alert appears in the list
-        after_response = requests.get("http://localhost:8000/alerts", timeout=5)
+        # Now check if our alert appears in the list. The server only responds
+        # once the alert is stored, so there is no need to wait first. Only
+        # fetch alerts from this test instead of the whole history
+        after_response = SESSION.get(
+            f"{SERVER_URL}/alerts",
+            params={"since": test_alert["timestamp"], "attack_type_prefix": f"Flow Test {test_id}"},
+            timeout=TIMEOUT
+        )
         if after_response.status_code != 200:
             print(f"❌ Failed to retrieve alerts. Status: {after_response.status_code}")
             return
         
-        after_alerts = after_response.json()
+        after_alerts = orjson.loads(after_response.content)
         if not isinstance(after_alerts, list):
             print(f"❌ Expected a list of alerts but got {type(after_alerts)}")
             return
         
-        after_count = len(after_alerts)
+        after_count = alert_count(after_response, after_alerts)
         print(f"Updated alert count: {after_count}")
         
         if after_count <= before_count:
@@ -181,7 +206,7 @@ def test_alert_flow():
                 print("\nAlert details:")
                 print(f"  Honeypot: {alert.get('honeypot_id')}")
                 print(f"  Timestamp: {alert.get('timestamp')}")
-                print(f"  Analysis: {json.dumps(alert.get('analysis', {}), indent=2)[:200]}...")
+                print(f"  Analysis: {orjson.dumps(alert.get('analysis', {}), option=orjson.OPT_INDENT_2).decode()[:200]}...")
                 break
         
         if not found:
@@ -222,4 +247,5 @@ def main():
     print("=" * 70)
 
 if __name__ == "__main__":
-    main()
+    with SESSION:
+        main()
@@ -7,13 +7,24 @@ to diagnose issues with the alert system.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 from datetime import datetime
 
 # Configuration
-SERVER_URL = "http://localhost:8000"
+# Connect by address rather than "localhost" so requests skip the name lookup
+# (and a failed IPv6 attempt first on some systems)
+SERVER_URL = "http://127.0.0.1:8000"
 HONEYPOT_ID = "test-honeypot-1"
+ALERT_URL = f"{SERVER_URL}/honeypot/{HONEYPOT_ID}/alert"
+
+# Connect and read timeouts in seconds, shared by all requests
+TIMEOUT = (1.0, 5.0)
+
+# Shared session so every request reuses keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
 def send_direct_alert():
     """Send a direct alert to the server API endpoint."""
@@ -32,16 +43,20 @@ def send_direct_alert():
         }
     }
     
+    # Serialize once: the same body is printed and sent
+    body = json.dumps(alert_data, indent=2)
+    
     # Print what we're about to send
-    print(f"\nSending direct test alert to: {SERVER_URL}/honeypot/{HONEYPOT_ID}/alert")
-    print(f"Alert data: {json.dumps(alert_data, indent=2)}")
+    print(f"\nSending direct test alert to: {ALERT_URL}")
+    print(f"Alert data: {body}")
     
     try:
         # Send the alert to the server
-        response = requests.post(
-            f"{SERVER_URL}/honeypot/{HONEYPOT_ID}/alert",
-            json=alert_data,
-            timeout=10
+        response = SESSION.post(
+            ALERT_URL,
+            data=body.encode(),
+            headers={"Content-Type": "application/json"},
+            timeout=TIMEOUT
         )
         
         # Check the response
@@ -63,7 +78,7 @@ def check_alerts():
     print(f"\nChecking alerts at: {SERVER_URL}/alerts")
     
     try:
-        response = requests.get(f"{SERVER_URL}/alerts", timeout=10)
+        response = SESSION.get(f"{SERVER_URL}/alerts", timeout=TIMEOUT)
         
         if response.status_code == 200:
             alerts = response.json()
@@ -117,4 +132,5 @@ def main():
     print("=" * 80)
 
 if __name__ == "__main__":
-    main()
+    with SESSION:
+        main()
@@ -0,0 +1,45 @@
+import time
+
+class CircuitBreaker:
+    """
+    Skip calls to a service that keeps failing.
+
+    After failure_threshold failures in a row the circuit opens, and is_open()
+    is true for reset_timeout seconds; callers skip the service meanwhile
+    instead of waiting on it. A success resets the failure count.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        """
+        Initialize the circuit breaker, closed.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds the circuit stays open
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._fail_count = 0
+        self._circuit_open_until = 0.0
+
+    def is_open(self):
+        """Check whether calls are currently being skipped."""
+        return time.monotonic() < self._circuit_open_until
+
+    def record_success(self):
+        """Reset the count of consecutive failures."""
+        self._fail_count = 0
+
+    def record_failure(self):
+        """
+        Count a failure, opening the circuit after too many in a row.
+
+        Returns:
+            bool: True if this failure opened the circuit
+        """
+        self._fail_count += 1
+        if self._fail_count < self.failure_threshold:
+            return False
+        self._circuit_open_until = time.monotonic() + self.reset_timeout
+        self._fail_count = 0
+        return True
@@ -1,9 +1,40 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
 import sys
 
-def setup_logger(name, log_file=None, level=logging.INFO):
+# Project root directory and its logs directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGS_DIR = os.path.join(PROJECT_ROOT, 'logs')
+
+# Date in the default log file names, fixed when the process starts so all of
+# its loggers write to files of the same day
+_LOG_DATE = datetime.now().strftime('%Y%m%d')
+
+# Log files are rotated at this size, keeping this many old files
+LOG_MAX_BYTES = 50 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Formatter and console handler shared by all loggers
+_FORMATTER = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_CONSOLE_HANDLER = logging.StreamHandler()
+_CONSOLE_HANDLER.setFormatter(_FORMATTER)
+
+# Background listeners that write each logger's records, by logger name
+_listeners = {}
+
+def _stop_listeners():
+    """Write out the records still queued and stop all listener threads."""
+    for listener in _listeners.values():
+        listener.stop()
+    _listeners.clear()
+
+atexit.register(_stop_listeners)
+
+def setup_logger(name, log_file=None, level=logging.INFO, console_only=False):
     """
     Set up a logger with the specified configuration.
     
@@ -11,21 +42,20 @@ def setup_logger(name, log_file=None, level=logging.INFO):
         name (str): Logger name
         log_file (str, optional): Log file path
         level (int, optional): Logging level
+        console_only (bool, optional): Only log to the console, not to a file
         
     Returns:
         logging.Logger: Configured logger
     """
-    # Get the project root directory
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    logs_dir = os.path.join(project_root, 'logs')
+    # If no log file specified, use default based on name
+    if console_only:
+        log_file = None
+    elif not log_file and name:
+        log_file = os.path.join(LOGS_DIR, f"{name}_{_LOG_DATE}.log")
     
     # Create logs directory if it doesn't exist
-    if log_file and not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
-    
-    # If no log file specified, use default based on name
-    if not log_file and name:
-        log_file = os.path.join(logs_dir, f"{name}_{datetime.now().strftime('%Y%m%d')}.log")
+    if log_file:
+        os.makedirs(LOGS_DIR, exist_ok=True)
     
     # Create logger
     logger = logging.getLogger(name)
@@ -34,21 +64,26 @@ def setup_logger(name, log_file=None, level=logging.INFO):
     # Remove existing handlers to prevent duplicates
     if logger.hasHandlers():
         logger.handlers.clear()
+    if name in _listeners:
+        _listeners.pop(name).stop()
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    # Add console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    # Console handler
+    handlers = [_CONSOLE_HANDLER]
     
-    # Add file handler if log file specified
+    # File handler if log file specified
     if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True
+        )
+        file_handler.setFormatter(_FORMATTER)
+        handlers.append(file_handler)
+    
+    # The logger only puts records on a queue; a background thread does the
+    # console and file writes, so logging never blocks the caller on I/O
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
     
     return logger
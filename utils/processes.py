@@ -0,0 +1,154 @@
+import asyncio
+import os
+import signal
+import socket
+import time
+
+# Child process output is written to <project root>/logs/<name>.log
+LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+
+def log_path(name):
+    """Get the path of the log file for a child process started as name."""
+    return os.path.join(LOGS_DIR, f"{name}.log")
+
+async def start_logged_process(name, *args, **kwargs):
+    """
+    Start a subprocess whose stdout and stderr go to logs/<name>.log.
+
+    The child writes straight to the log file, so it can never block on a
+    full pipe and nothing in this process has to copy its output.
+
+    Args:
+        name (str): Name of the log file, without extension
+        *args: Program and arguments, as for asyncio.create_subprocess_exec
+        **kwargs: Other create_subprocess_exec options (env, cwd, ...)
+
+    Returns:
+        asyncio.subprocess.Process: The started process
+    """
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    # The child gets its own copy of the file descriptor, so ours can be
+    # closed as soon as it has started
+    with open(log_path(name), "ab", buffering=0) as log_file:
+        return await asyncio.create_subprocess_exec(
+            *args,
+            stdout=log_file,
+            stderr=asyncio.subprocess.STDOUT,
+            **kwargs
+        )
+
+def cancel_on_sigterm():
+    """
+    Make SIGTERM cancel the current task, like Ctrl+C does.
+
+    Lets a supervisor stopped by a service manager or `kill` run its cleanup
+    and stop its children instead of leaving them orphaned. Does nothing on
+    Windows, where the event loop cannot handle signals.
+    """
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass
+
+def terminate(process):
+    """
+    Terminate a process, along with its own children if it leads a session.
+
+    A process started with start_new_session=True no longer gets Ctrl+C from
+    the terminal, so its whole process group is sent SIGTERM; otherwise a
+    wrapper like react-scripts would exit and leave its dev server running.
+    Other processes, and all processes on Windows, are just terminated.
+
+    Args:
+        process: subprocess.Popen or asyncio.subprocess.Process
+    """
+    if hasattr(os, "killpg") and os.getpgid(process.pid) == process.pid:
+        os.killpg(process.pid, signal.SIGTERM)
+    else:
+        process.terminate()
+
+def stop_process(process):
+    """Terminate a process started with start_logged_process if it is still running."""
+    if process.returncode is None:
+        try:
+            terminate(process)
+        except ProcessLookupError:
+            # Exited after the returncode check
+            pass
+
+async def wait_any(processes):
+    """
+    Wait until one of the given subprocesses exits.
+
+    Args:
+        processes (list): asyncio.subprocess.Process objects to watch
+
+    Returns:
+        asyncio.subprocess.Process: The process that exited
+    """
+    waiters = {asyncio.ensure_future(process.wait()): process for process in processes}
+    done, pending = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    for waiter in pending:
+        waiter.cancel()
+    return waiters[done.pop()]
+
+async def wait_for_port(port, timeout=30.0, process=None):
+    """
+    Wait until something accepts TCP connections on a local port.
+
+    Retries with a growing delay (50 ms up to 500 ms) instead of sleeping for
+    a fixed time, so it returns as soon as the service is up.
+
+    Args:
+        port (int): Port to connect to on 127.0.0.1
+        timeout (float): Seconds to wait before giving up
+        process (asyncio.subprocess.Process, optional): Stop waiting early if it exits
+
+    Returns:
+        bool: True if the port accepted a connection in time
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 0.05
+    while True:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout=0.2)
+            writer.close()
+            return True
+        except (OSError, asyncio.TimeoutError):
+            pass
+        if process is not None and process.returncode is not None:
+            return False
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 1.5, 0.5)
+
+def wait_for_port_blocking(port, timeout=30.0, process=None):
+    """
+    Blocking version of wait_for_port, for scripts that don't use asyncio.
+
+    Args:
+        port (int): Port to connect to on 127.0.0.1
+        timeout (float): Seconds to wait before giving up
+        process (subprocess.Popen, optional): Stop waiting early if it exits
+
+    Returns:
+        bool: True if the port accepted a connection in time
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return True
+        except OSError:
+            pass
+        if process is not None and process.poll() is not None:
+            return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 1.5, 0.5)
@@ -0,0 +1,25 @@
+import time
+from datetime import datetime
+
+# (epoch second, formatted date/time for that second)
+_second_cache = (None, "")
+
+def now_iso():
+    """
+    Get the current local time as an ISO 8601 string with microseconds.
+
+    Matches datetime.now().isoformat(), except that it always includes the
+    microseconds (isoformat() omits them when they are zero). The date and
+    time-of-day part is only formatted once per second; calls within the same
+    second just append the microseconds.
+
+    Returns:
+        str: Timestamp such as "2024-01-01T12:00:00.123456"
+    """
+    global _second_cache
+    second, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_second, prefix = _second_cache
+    if cached_second != second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _second_cache = (second, prefix)
+    return f"{prefix}.{micros:06d}"